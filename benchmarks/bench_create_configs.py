@@ -0,0 +1,66 @@
+"""Measure the per-create overhead of building container configs.
+
+Builds the configs of 10k creates through the paths used by
+Client.create_container and Client.create_container_from_template, with a
+stub returning the CreateRequest instead of sending it, so only the
+client side is measured.
+
+usage, with isula installed or from the top of the repository:
+    PYTHONPATH=. python benchmarks/bench_create_configs.py [creates]
+"""
+import sys
+import timeit
+
+from isula.isulad import container
+
+
+FIELDS = {'Binds': ['/data:/data'], 'Memory': 1 << 30, 'CPUShares': 512,
+          'PidsLimit': 1024, 'Privileged': False, 'Labels': {'app': 'web'},
+          'Annotations': {'team': 'infra'}, 'name': 'web'}
+
+
+class _RequestStub(object):
+    """A stub returning the request instead of sending it"""
+    def Create(self, request, metadata=None):
+        return request
+
+
+def bench(name, fn, creates, repeat=5):
+    elapsed = min(timeit.repeat(fn, number=1, repeat=repeat))
+    print('%-36s %7.1f ms per %d creates, %5.1f us per create'
+          % (name, elapsed * 1e3, creates, elapsed / creates * 1e6))
+
+
+def main(creates=10000):
+    wrapper = container.Container(_RequestStub())
+    template = container.ContainerTemplate('busybox', **FIELDS)
+    ids = ['%064x' % i for i in range(creates)]
+
+    def configs():
+        for _ in ids:
+            container.build_create_configs(FIELDS)
+
+    def create_requests():
+        for container_id in ids:
+            hostconfig, customconfig = container.build_create_configs(FIELDS)
+            wrapper.create(container_id, 'busybox', None, 'lcr', hostconfig,
+                           customconfig)
+
+    def template_requests():
+        for container_id in ids:
+            wrapper.create_from_request(template.request(container_id))
+
+    def template_overrides():
+        for container_id in ids:
+            wrapper.create_from_request(template.request(
+                container_id, name=container_id[:12],
+                labels={'id': container_id}))
+
+    bench('build_create_configs', configs, creates)
+    bench('create_container request', create_requests, creates)
+    bench('template request', template_requests, creates)
+    bench('template request, name and labels', template_overrides, creates)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,53 @@
+"""Time `import isula; isula.init_isulad_client()` in fresh interpreters.
+
+Each run starts a new Python process, so nothing is cached in sys.modules,
+and measures the import and the creation of the client inside it. The
+client does not connect until its first call, so no daemon is needed.
+
+usage, with isula installed or from the top of the repository:
+    PYTHONPATH=. python benchmarks/bench_import.py [runs]
+"""
+import statistics
+import subprocess
+import sys
+
+
+SNIPPET = '''
+import time
+started = time.perf_counter()
+import isula
+client = isula.init_isulad_client('unix:///tmp/bench-import.sock')
+elapsed = time.perf_counter() - started
+import sys
+print(elapsed, len(sys.modules),
+      ','.join(m for m in WATCHED if m in sys.modules) or '-')
+'''
+# Modules the sync client should not need. asyncio is still loaded by grpc
+# itself, whose package imports grpc.aio.
+WATCHED = ('asyncio', 'isula.aio_utils', 'isula.isulad.aio')
+
+
+def run_once():
+    snippet = 'WATCHED = %r\n%s' % (WATCHED, SNIPPET)
+    output = subprocess.check_output([sys.executable, '-c', snippet])
+    elapsed, modules, watched = output.decode().split()
+    return float(elapsed), int(modules), watched
+
+
+def main(runs=20):
+    # The first run warms the bytecode cache up.
+    run_once()
+    timings = []
+    modules = 0
+    for _ in range(runs):
+        elapsed, modules, watched = run_once()
+        timings.append(elapsed)
+    print('import isula; init_isulad_client(): median %.1f ms, min %.1f ms '
+          'over %d runs, %d modules loaded'
+          % (statistics.median(timings) * 1e3, min(timings) * 1e3, runs,
+             modules))
+    print('loaded among %s: %s' % (', '.join(WATCHED), watched))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
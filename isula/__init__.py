@@ -1,2 +1,3 @@
 from .client import init_builder_client
 from .client import init_isulad_client
+from .client import init_isulad_aio_client
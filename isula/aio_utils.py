@@ -0,0 +1,60 @@
+"""The asyncio helpers of the clients of isula.isulad.aio and isula.builder.aio.
+
+They live apart from isula.utils, so the sync clients do not import them.
+"""
+import asyncio
+
+import grpc
+
+from isula import utils
+
+
+class lazy_aio_channel(object):
+    """The grpc.aio channel of a client, opened on first use.
+
+    A grpc.aio channel belongs to the event loop running when it is
+    created. Opening it on the first call, from a coroutine, lets the client
+    be built before the loop is started, like before asyncio.run(). The
+    client is then bound to that loop and can not be used from another one.
+    The channel is opened on the `_channel_target` and `_channel_options`
+    attributes of the client.
+    """
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            raise RuntimeError("An asyncio client must be used from a "
+                               "coroutine running in its event loop")
+        channel = grpc.aio.insecure_channel(instance._channel_target,
+                                            options=instance._channel_options)
+        instance.__dict__[self.name] = channel
+        return channel
+
+
+async def close_aio_channel(client, grace=None):
+    """Close the channel of a client opened by lazy_aio_channel, if any"""
+    channel = client.__dict__.get('_channel')
+    if channel is not None:
+        await channel.close(grace)
+
+
+async def run_batch_async(fn, items,
+                          max_workers=utils.DEFAULT_BATCH_WORKERS):
+    """Await the coroutine function fn on every item, see isula.utils.run_batch"""
+    items = list(dict.fromkeys(items))
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def call(item):
+        async with semaphore:
+            try:
+                return await fn(item)
+            except Exception as e:
+                return e
+
+    outcomes = await asyncio.gather(*[call(item) for item in items])
+    return dict(zip(items, outcomes))
@@ -0,0 +1,262 @@
+"""asyncio flavour of the isula-builder client.
+
+Every method of isula.builder.client.Client is available here with the same
+parameters. The unary RPCs are coroutines, while the RPCs which report their
+progress (build, push, pull, remove, load, import, save and manifest push) are
+async generators yielding the progress messages as they arrive, so a single
+event loop can run many builds concurrently without a thread per build.
+
+example:
+    import asyncio
+    from isula.builder import aio
+
+    async def main():
+        async with aio.Client() as client:
+            async for log in client.build_image(*arg, **args):
+                print(log)
+
+    asyncio.run(main())
+"""
+import base64
+import json
+import os
+import uuid
+
+from isula.builder import client as builder_client
+from isula.builder import image
+from isula.builder_grpc import control_pb2
+from isula import aio_utils
+from isula import utils
+
+
+class Client(object):
+    """The asyncio isula-builder client.
+
+    The client can be built outside of the event loop, its channel is only
+    opened by the first call, in the running loop, which the client then
+    belongs to. See isula.aio_utils.lazy_aio_channel.
+    """
+    # grpc.aio channels are bound to the running event loop, so they are
+    # owned by the client instead of being shared through isula.channel.
+    _channel = aio_utils.lazy_aio_channel()
+    # The wrappers return the call object of the stub, which is awaitable
+    # (unary) or async iterable (streaming) on a grpc.aio channel.
+    __client = utils.lazy_service(
+        None, 'isula.builder_grpc.control_pb2_grpc:ControlStub')
+    __image = utils.lazy_service(
+        'isula.builder.image:Image',
+        'isula.builder_grpc.control_pb2_grpc:ControlStub')
+    __manifest = utils.lazy_service(
+        'isula.builder.manifest:Manifest',
+        'isula.builder_grpc.control_pb2_grpc:ControlStub')
+    __system = utils.lazy_service(
+        'isula.builder.system:System',
+        'isula.builder_grpc.control_pb2_grpc:ControlStub')
+
+    def __init__(self, channel_target=None, public_key_path=None,
+                 channel_options=None, response_mode=utils.RESPONSE_DICT):
+        if not channel_target:
+            channel_target = 'unix:///run/isula_build.sock'
+        self.response_mode = utils.check_response_mode(response_mode)
+        self._public_key_path = public_key_path
+        self._public_key = None
+        self._channel_target = channel_target
+        self._channel_options = channel_options
+
+    @property
+    def public_key(self):
+        if self._public_key is None:
+            self._public_key = builder_client.load_public_key(
+                self._public_key_path)
+        return self._public_key
+
+    @public_key.setter
+    def public_key(self, public_key):
+        self._public_key = public_key
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self, grace=None):
+        """Close the channel, cancelling the in-flight calls after grace seconds.
+
+        :param grace(float): seconds to wait for in-flight calls, default cancels them at once.
+        """
+        await aio_utils.close_aio_channel(self, grace)
+
+    @utils.async_response2dict
+    async def server_version(self):
+        """Get the version of isula-builder."""
+        return await self.__system.version()
+
+    @utils.async_response2dict
+    async def server_healthcheck(self):
+        """Get the status of isula-builder."""
+        return await self.__system.healthCheck()
+
+    @utils.async_response2dict
+    async def server_info(self, verbose=False):
+        """Get the detail information of isula-builder."""
+        return await self.__system.info(verbose)
+
+    @utils.async_response2dict
+    async def login(self, server, username, password):
+        """Login image registry, see isula.builder.client.Client.login."""
+        encrypted_password = builder_client.encrypt_password(self.public_key,
+                                                             password)
+        return await self.__system.login(server, username, encrypted_password)
+
+    @utils.async_response2dict
+    async def logout(self, server, is_all=False):
+        """Logout image registry."""
+        return await self.__system.logout(server, is_all)
+
+    @utils.async_response2dict
+    async def create_manifest(self, manifestList, manifests):
+        """Create manifest list."""
+        return await self.__manifest.manifestCreate(manifestList, manifests)
+
+    async def annotate_manifest(self, manifestList, target_manifest, arch='',
+                                operation_system='', osFeatures=None,
+                                variant=''):
+        """Update manifest list, see isula.builder.client.Client.annotate_manifest."""
+        osFeatures = [] if not osFeatures else osFeatures
+        await self.__manifest.manifestAnnotate(manifestList, target_manifest,
+                                               arch, operation_system,
+                                               osFeatures, variant)
+
+    async def inspect_manifest(self, manifestList):
+        """Get manifest list information."""
+        encoded_response = await self.__manifest.manifestInspect(manifestList)
+        return json.loads(base64.b64decode(utils.message_to_dict(encoded_response)['data']))
+
+    async def push_manifest(self, manifestList, dest, timeout=60):
+        """Upload manifest list to the specified registry.
+
+        :param manifestList(string): the manifest list name.
+        :param dest(string): the image registry location.
+        :param timeout(int/second): timeout. Default is 60 seconds.
+        :returns: AsyncIterable -- the push process log.
+        """
+        response = self.__manifest.manifestPush(manifestList, dest, timeout)
+        async for message in response:
+            yield message
+
+    @utils.async_response2dict
+    async def list_images(self, image_name=''):
+        """List all images in isula-builder."""
+        return await self.__image.list(image_name)
+
+    async def build_image(self, dockerfile, output, image_format, context_dir,
+                          iidfile='', additional_tag='', build_time=None,
+                          build_args=None, cap_list=None, proxy=False,
+                          encrypted=False):
+        """Build a new image, see isula.builder.client.Client.build_image.
+
+        :returns: AsyncIterable -- the build process log.
+
+        Example:
+
+        async for log in builder_client.build_image(*arg, **args):
+            print(log)
+        """
+        fileContent, output, build_time, entityID, context_dir = builder_client.prepare_build(
+            dockerfile, output, image_format, context_dir, build_time)
+        buildID = uuid.uuid4().hex[:12]
+        # TODO(wxy): buildType is hard-code by iSulad. Move it to a more common place.
+        buildType = 'ctr-img'
+        build_args = [] if not build_args else build_args
+        cap_list = [] if not cap_list else cap_list
+
+        request = image.build_request(
+            buildID, buildType, context_dir, fileContent, output, build_args,
+            proxy, iidfile, build_time, additional_tag, cap_list, entityID,
+            encrypted, image_format)
+        # The Build call runs on the event loop while the log is streamed
+        # back by Status, which is what the sync client needs a thread for.
+        build = self.__client.Build(request)
+        try:
+            status = self.__client.Status(
+                control_pb2.StatusRequest(buildID=buildID))
+            async for message in status:
+                yield message.content
+            await build
+        finally:
+            if not build.done():
+                build.cancel()
+
+    async def push_image(self, image_name, image_format):
+        """Push image to remote repository.
+
+        :returns: AsyncIterable -- the push process log.
+        """
+        if image_format not in ['docker', 'oci']:
+            raise Exception("image format should be either docker or oci.")
+        pushID = uuid.uuid4().hex[:12]
+
+        async for message in self.__image.push(pushID, image_name,
+                                               image_format):
+            yield message
+
+    async def pull_image(self, image_name):
+        """Pull image from remote repository.
+
+        :returns: AsyncIterable -- the pull process log.
+        """
+        pullID = uuid.uuid4().hex[:12]
+        async for message in self.__image.pull(pullID, image_name):
+            yield message
+
+    async def remove_images(self, image_ids=None, is_all=False, prune=False):
+        """Remove the specified images, see isula.builder.client.Client.remove_images.
+
+        :returns: AsyncIterable -- the removal process log.
+        """
+        if (image_ids and is_all) or (image_ids and prune) or (is_all and prune):
+            raise Exception("You should only pass only one parameter "
+                            "from [imageIDs, is_all, prune]")
+        if not image_ids and not is_all and not prune:
+            raise Exception("You must pass one parameter from "
+                            "[imageIDs, is_all, prune]")
+
+        async for message in self.__image.remove(image_ids, is_all, prune):
+            yield message
+
+    async def load_image(self, path):
+        """Load an image tar.
+
+        :returns: AsyncIterable -- the load process log.
+        """
+        path = os.path.abspath(path)
+        async for message in self.__image.load(path):
+            yield message
+
+    async def import_image(self, source, reference):
+        """Import a new image.
+
+        :returns: AsyncIterable -- the import process log.
+        """
+        importID = uuid.uuid4().hex[:12]
+        source = os.path.abspath(source)
+        async for message in self.__image.import_(importID, source, reference):
+            yield message
+
+    async def tag_image(self, image_id, tag):
+        """Tag an image."""
+        await self.__image.tag(image_id, tag)
+
+    async def save_image(self, images, path, image_format):
+        """Save the image to tarball.
+
+        :returns: AsyncIterable -- the save process log.
+        """
+        if image_format not in ['docker', 'oci']:
+            raise Exception("image format should be either docker or oci.")
+        saveID = uuid.uuid4().hex[:12]
+        path = os.path.abspath(path)
+        async for message in self.__image.save(saveID, images, path,
+                                               image_format):
+            yield message
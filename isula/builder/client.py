@@ -6,38 +6,32 @@ import os
 from datetime import datetime
 import uuid
 
-from cryptography.hazmat import backends
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import padding
-from google.protobuf.json_format import MessageToDict
-import grpc
-
 from isula.builder import image
 from isula.builder import manifest
 from isula.builder import system
 from isula.builder_grpc import control_pb2_grpc
+from isula import channel
 from isula import utils
 
 
 class Client(object):
-    def __init__(self, channel_target, public_key_path):
+    def __init__(self, channel_target, public_key_path, channel_options=None,
+                 response_mode=utils.RESPONSE_DICT):
         if not channel_target:
             channel_target = 'unix:///run/isula_build.sock'
-        if not public_key_path:
-            public_key_path = '/etc/isula-build/isula-build.pub'
-            with open(public_key_path, "r") as key_file:
-                # isula-build public key file is PKCS#1 format by default. we should decode it to get der info first.
-                derdata = base64.b64decode('\n'.join(key_file.read().splitlines()[1:-1]))
-                self.public_key = serialization.load_der_public_key(
-                    derdata, backend=backends.default_backend())
-        else:
-            with open(public_key_path, "rb") as key_file:
-                self.public_key = serialization.load_pem_public_key(
-                    key_file.read(), backend=backends.default_backend())
-
-        channel = grpc.insecure_channel(channel_target)
-        client = control_pb2_grpc.ControlStub(channel)
+        # How responses are returned, see isula.utils.convert_response. Each
+        # method also accepts a `response_mode` keyword to override it.
+        self.response_mode = utils.check_response_mode(response_mode)
+        # The public key is only needed to login, so it is loaded, and the
+        # cryptography backend imported, on first use.
+        self._public_key_path = public_key_path
+        self._public_key = None
+
+        # Channels are shared with the other clients of the same target, see
+        # isula.channel.ChannelPool.
+        self._channel = channel.acquire_channel(channel_target,
+                                                channel_options)
+        client = control_pb2_grpc.ControlStub(self._channel)
 
         self.__image = image.Image(client)
         # manifest API is experimental and disabled by default in isula-build, so if you want to use these APIs,
@@ -45,6 +39,32 @@ class Client(object):
         self.__manifest = manifest.Manifest(client)
         self.__system = system.System(client)
 
+    @property
+    def public_key(self):
+        if self._public_key is None:
+            self._public_key = load_public_key(self._public_key_path)
+        return self._public_key
+
+    @public_key.setter
+    def public_key(self, public_key):
+        self._public_key = public_key
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Release the connection to isula-builder.
+
+        The underlying channel is closed once no other client uses it and it
+        has been idle for a while. The client can not be used after closing.
+        """
+        if self._channel is not None:
+            channel.release_channel(self._channel)
+            self._channel = None
+
     @utils.response2dict
     def server_version(self):
         """Get the version of isula-builder.
@@ -79,16 +99,7 @@ class Client(object):
         :param password(string): user password for login
         :returns: dict -- Login result
         """
-        # isula-build accept password as hexadecimal encoding string which encrypted by RSA-SHA512
-        encrypted_password_byte = self.public_key.encrypt(
-            password.encode('utf-8'),
-            padding.OAEP(
-                mgf=padding.MGF1(algorithm=hashes.SHA512()),
-                algorithm=hashes.SHA512(),
-                label=None,
-            )
-        )
-        encrypted_password = codecs.encode(encrypted_password_byte, 'hex_codec')
+        encrypted_password = encrypt_password(self.public_key, password)
 
         return self.__system.login(server, username, encrypted_password)
 
@@ -135,7 +146,7 @@ class Client(object):
         :returns: dict -- the detail infomation of the specifed manifest list.
         """
         encoded_response = self.__manifest.manifestInspect(manifestList)
-        return json.loads(base64.b64decode(MessageToDict(encoded_response)['data']))
+        return json.loads(base64.b64decode(utils.message_to_dict(encoded_response)['data']))
 
     def push_manifest(self, manifestList, dest, timeout=60):
         """Upload manifest list to the specified registry.
@@ -190,38 +201,13 @@ class Client(object):
             print log
         """
 
-        transport, location = output.split(':', 1)
-        if transport not in ['docker', 'docker-archive', 'docker-daemon',
-            'oci', 'oci-archive', 'isulad', 'manifest']:
-            raise Exception("the output format is not correct.")
-        if transport in ['docker-archive', 'oci-archive']:
-            location = os.path.abspath(location)
-            output = ':'.join([transport, location])
-        if image_format not in ['docker', 'oci']:
-            raise Exception("image format should be either docker or oci.")
-
-        with open(dockerfile, 'rb') as content:
-            fileContent = content.read()
-            hasher = hashlib.sha256()
-            hasher.update(fileContent)
-            digest = hasher.hexdigest()
-
-        if build_time:
-            try:
-                entityID = '%s:%s' % (digest, build_time)
-                build_time = datetime.strptime(build_time, "%Y-%m-%d %H:%M:%S")
-            except ValueError:
-                raise Exception("build time should be in %Y-%m-%d %H:%M:%S format")
-        else:
-            current = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            entityID = '%s:%s' % (digest, current)
-
+        fileContent, output, build_time, entityID, context_dir = prepare_build(
+            dockerfile, output, image_format, context_dir, build_time)
         buildID = uuid.uuid4().hex[:12]
         # TODO(wxy): buildType is hard-code by iSulad. Move it to a more common place.
         buildType = 'ctr-img'
         build_args = [] if not build_args else build_args
         cap_list = [] if not cap_list else cap_list
-        context_dir = os.path.abspath(context_dir)
 
         return self.__image.build(
             buildID, buildType, context_dir, fileContent, output, build_args,
@@ -315,3 +301,77 @@ class Client(object):
         path = os.path.abspath(path)
         response = self.__image.save(saveID, images, path, image_format)
         return list(response)
+
+
+def load_public_key(public_key_path=None):
+    """Load the isula-builder public key used to encrypt sensitive data.
+
+    :param public_key_path(string): the location of the public key in pem format. The PKCS#1
+        key of isula-builder in /etc/isula-build is used by default.
+    :returns: the public key object.
+    """
+    from cryptography.hazmat import backends
+    from cryptography.hazmat.primitives import serialization
+
+    if not public_key_path:
+        public_key_path = '/etc/isula-build/isula-build.pub'
+        with open(public_key_path, "r") as key_file:
+            # isula-build public key file is PKCS#1 format by default. we should decode it to get der info first.
+            derdata = base64.b64decode('\n'.join(key_file.read().splitlines()[1:-1]))
+            return serialization.load_der_public_key(
+                derdata, backend=backends.default_backend())
+    with open(public_key_path, "rb") as key_file:
+        return serialization.load_pem_public_key(
+            key_file.read(), backend=backends.default_backend())
+
+
+def encrypt_password(public_key, password):
+    """Encrypt the password in the way isula-builder expects."""
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding
+
+    # isula-build accept password as hexadecimal encoding string which encrypted by RSA-SHA512
+    encrypted_password_byte = public_key.encrypt(
+        password.encode('utf-8'),
+        padding.OAEP(
+            mgf=padding.MGF1(algorithm=hashes.SHA512()),
+            algorithm=hashes.SHA512(),
+            label=None,
+        )
+    )
+    return codecs.encode(encrypted_password_byte, 'hex_codec')
+
+
+def prepare_build(dockerfile, output, image_format, context_dir, build_time):
+    """Check the build parameters and read the DockerFile.
+
+    :returns: tuple -- (fileContent, output, build_time, entityID, context_dir) for the build request.
+    """
+    transport, location = output.split(':', 1)
+    if transport not in ['docker', 'docker-archive', 'docker-daemon',
+        'oci', 'oci-archive', 'isulad', 'manifest']:
+        raise Exception("the output format is not correct.")
+    if transport in ['docker-archive', 'oci-archive']:
+        location = os.path.abspath(location)
+        output = ':'.join([transport, location])
+    if image_format not in ['docker', 'oci']:
+        raise Exception("image format should be either docker or oci.")
+
+    with open(dockerfile, 'rb') as content:
+        fileContent = content.read()
+        hasher = hashlib.sha256()
+        hasher.update(fileContent)
+        digest = hasher.hexdigest()
+
+    if build_time:
+        try:
+            entityID = '%s:%s' % (digest, build_time)
+            build_time = datetime.strptime(build_time, "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            raise Exception("build time should be in %Y-%m-%d %H:%M:%S format")
+    else:
+        current = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        entityID = '%s:%s' % (digest, current)
+
+    context_dir = os.path.abspath(context_dir)
+    return fileContent, output, build_time, entityID, context_dir
@@ -1,9 +1,9 @@
 import threading
 
-from google.protobuf.json_format import MessageToDict
 from google.protobuf.timestamp_pb2 import Timestamp
 
 from isula.builder_grpc import control_pb2
+from isula import utils
 
 
 class ImageBuild(threading.Thread):
@@ -29,23 +29,32 @@ class ImageBuild(threading.Thread):
         self.image_format = image_format
 
     def run(self):
-        if self.build_time:
-            buildTime = Timestamp()
-            buildTime.FromDatetime(self.build_time)
-            buildStatic = control_pb2.BuildStatic(buildTime=buildTime)
-        else:
-            buildStatic = None
-        request = control_pb2.BuildRequest(
-            buildID=self.buildID, buildType=self.buildType,
-            contextDir=self.contextDir, fileContent=self.fileContent,
-            output=self.output, buildArgs=self.buildArgs, proxy=self.proxy,
-            iidfile=self.iidfile, buildStatic=buildStatic,
-            additionalTag=self.additionalTag, capAddList=self.capAddList,
-            entityID=self.entityID, encrypted=self.encrypted,
-            format=self.image_format)
+        request = build_request(
+            self.buildID, self.buildType, self.contextDir, self.fileContent,
+            self.output, self.buildArgs, self.proxy, self.iidfile,
+            self.build_time, self.additionalTag, self.capAddList,
+            self.entityID, self.encrypted, self.image_format)
         self.client.Build(request)
 
 
+def build_request(buildID, buildType, contextDir, fileContent, output,
+                  buildArgs, proxy, iidfile, build_time, additionalTag,
+                  capAddList, entityID, encrypted, image_format):
+    """Make the request to start an image build"""
+    if build_time:
+        buildTime = Timestamp()
+        buildTime.FromDatetime(build_time)
+        buildStatic = control_pb2.BuildStatic(buildTime=buildTime)
+    else:
+        buildStatic = None
+    return control_pb2.BuildRequest(
+        buildID=buildID, buildType=buildType, contextDir=contextDir,
+        fileContent=fileContent, output=output, buildArgs=buildArgs,
+        proxy=proxy, iidfile=iidfile, buildStatic=buildStatic,
+        additionalTag=additionalTag, capAddList=capAddList,
+        entityID=entityID, encrypted=encrypted, format=image_format)
+
+
 class Image(object):
     def __init__(self, client):
         self.client = client
@@ -68,7 +77,7 @@ class Image(object):
         request = control_pb2.StatusRequest(buildID=buildID)
         response = self.client.Status(request)
         for message in response:
-            yield MessageToDict(message)['content']
+            yield utils.message_to_dict(message)['content']
 
     def push(self, pushID, imageName, image_format):
         """Push pushes image to remote repository"""
@@ -0,0 +1,117 @@
+import threading
+import time
+
+import grpc
+
+
+# Seconds an unreferenced channel is kept open before it is closed.
+DEFAULT_IDLE_TIMEOUT = 300
+
+
+class _PooledChannel(object):
+    def __init__(self, key, channel):
+        self.key = key
+        self.channel = channel
+        self.refcount = 0
+        self.idle_since = None
+
+
+class ChannelPool(object):
+    """A registry of gRPC channels shared by all clients of the process.
+
+    Channels are keyed by target and channel options and reference counted.
+    Once a channel is no longer referenced it stays open for `idle_timeout`
+    seconds so that short-lived clients reuse a warm connection, then it is
+    closed.
+    """
+    def __init__(self, idle_timeout=DEFAULT_IDLE_TIMEOUT,
+                 channel_factory=grpc.insecure_channel):
+        self.idle_timeout = idle_timeout
+        self._channel_factory = channel_factory
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._by_channel = {}
+        self._timer = None
+
+    def acquire(self, target, options=None):
+        """Get a channel for target, opening it if there is none yet.
+
+        :param target(string): the location of the daemon socket file.
+        :param options(List[(key, value)]): gRPC channel options.
+        :returns: grpc.Channel -- the shared channel.
+        """
+        options = tuple(options) if options else ()
+        key = (target, options)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                channel = self._channel_factory(target, options=options)
+                entry = _PooledChannel(key, channel)
+                self._entries[key] = entry
+                self._by_channel[id(channel)] = entry
+            entry.refcount += 1
+            entry.idle_since = None
+            return entry.channel
+
+    def release(self, channel):
+        """Drop a reference to a channel returned by `acquire`."""
+        with self._lock:
+            entry = self._by_channel.get(id(channel))
+            if entry is None or entry.channel is not channel:
+                return
+            entry.refcount -= 1
+            if entry.refcount > 0:
+                return
+            entry.idle_since = time.monotonic()
+            if self.idle_timeout <= 0:
+                self._close_entry(entry)
+            else:
+                self._schedule_eviction()
+
+    def evict_idle(self):
+        """Close the channels which have been unreferenced for too long."""
+        deadline = time.monotonic() - self.idle_timeout
+        with self._lock:
+            self._timer = None
+            for entry in list(self._entries.values()):
+                if entry.refcount == 0 and entry.idle_since <= deadline:
+                    self._close_entry(entry)
+            if any(entry.refcount == 0 for entry in self._entries.values()):
+                self._schedule_eviction()
+
+    def close(self):
+        """Close every channel in the pool, referenced or not."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            for entry in list(self._entries.values()):
+                self._close_entry(entry)
+
+    def _close_entry(self, entry):
+        del self._entries[entry.key]
+        del self._by_channel[id(entry.channel)]
+        entry.channel.close()
+
+    def _schedule_eviction(self):
+        if self._timer is not None:
+            return
+        self._timer = threading.Timer(self.idle_timeout, self.evict_idle)
+        self._timer.daemon = True
+        self._timer.start()
+
+
+_default_pool = ChannelPool()
+
+
+def default_pool():
+    """Get the channel pool shared by the clients created by pyisula."""
+    return _default_pool
+
+
+def acquire_channel(target, options=None):
+    return _default_pool.acquire(target, options)
+
+
+def release_channel(channel):
+    _default_pool.release(channel)
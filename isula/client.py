@@ -1,22 +1,54 @@
-from isula.builder import client as builder_client
-from isula.isulad import client as isulad_client
+# The client modules are imported by the init functions, so that importing
+# isula does not load the gRPC stacks of both daemons, asyncio and the
+# cryptography backend up front.
 
 
-def init_builder_client(channel_target=None, public_key_path=None):
+def init_builder_client(channel_target=None, public_key_path=None,
+                        channel_options=None, response_mode='dict'):
     """Initialize isula-build client object.
 
     :param channel_target(string): The location of isula-builder daemon socket file.
     :param public_key_path(string): THe location of isula-builder public key file for encryption.
         The content should be pem format.
+    :param channel_options(List[(key, value)]): gRPC channel options. Clients with the same
+        target and options share one channel.
+    :param response_mode(string): The form of the responses - 'dict' converted by MessageToDict,
+        'raw' protobuf message or 'view' isula.utils.MessageView. Default is 'dict'.
     :returns: isula.builder.client.Client -- The python object for isula-build client.
     """
-    return builder_client.Client(channel_target, public_key_path)
+    from isula.builder import client as builder_client
+    return builder_client.Client(channel_target, public_key_path,
+                                 channel_options, response_mode)
 
 
-def init_isulad_client(channel_target=None):
+def init_isulad_client(channel_target=None, channel_options=None,
+                       response_mode='dict'):
     """Initialize iSulad client object.
 
     :param channel_target(string): The location of iSulad daemon socket file.
+    :param channel_options(List[(key, value)]): gRPC channel options. Clients with the same
+        target and options share one channel.
+    :param response_mode(string): The form of the responses - 'dict' converted by MessageToDict,
+        'raw' protobuf message or 'view' isula.utils.MessageView. Default is 'dict'.
     :returns: isula.isulad.client.Client -- The python object for iSulad client.
     """
-    return isulad_client.Client(channel_target)
+    from isula.isulad import client as isulad_client
+    return isulad_client.Client(channel_target, channel_options,
+                                response_mode)
+
+
+def init_isulad_aio_client(channel_target=None, channel_options=None,
+                           response_mode='dict'):
+    """Initialize asyncio iSulad client object.
+
+    The client may be built before the event loop is started. Its channel
+    is opened by its first call and belongs to the loop running that call,
+    so the client must then only be used from that loop.
+
+    :param channel_target(string): The location of iSulad daemon socket file.
+    :param channel_options(List[(key, value)]): gRPC channel options.
+    :param response_mode(string): The form of the responses, see init_isulad_client.
+    :returns: isula.isulad.aio.Client -- The python object for asyncio iSulad client.
+    """
+    from isula.isulad import aio as isulad_aio
+    return isulad_aio.Client(channel_target, channel_options, response_mode)
@@ -0,0 +1,850 @@
+"""asyncio flavour of the iSulad client.
+
+Every method of isula.isulad.client.Client is available here with the same
+parameters, as a coroutine or, for the streaming RPCs, as an async iterator.
+All the calls of one client are multiplexed over a single grpc.aio channel,
+so one event loop can drive many concurrent operations.
+
+example:
+    import asyncio
+    from isula.isulad import aio
+
+    async def main():
+        async with aio.Client() as client:
+            containers = await client.list_containers(is_all=True)
+            async for event in client.container_events():
+                print(event)
+
+    asyncio.run(main())
+"""
+import asyncio
+import base64
+import functools
+import os
+import queue
+import signal
+
+from isula.isulad import container
+from isula.isulad_grpc import container_pb2
+from isula import aio_utils
+from isula import utils
+
+
+# Number of CopyFromContainer chunks queued for the extraction thread.
+COPY_QUEUE_SIZE = 4
+
+
+class Client(object):
+    """The asyncio iSulad client.
+
+    The client can be built outside of the event loop, its channel is only
+    opened by the first call, in the running loop, which the client then
+    belongs to. See isula.aio_utils.lazy_aio_channel.
+    """
+    # As in isula.isulad.client.Client, the archive, events, logs, remote
+    # and results helpers are imported by the methods using them.
+    # grpc.aio channels are bound to the running event loop, so they are
+    # owned by the client instead of being shared through isula.channel.
+    _channel = aio_utils.lazy_aio_channel()
+    # The unary wrappers return the call object of the stub, which is
+    # awaitable when the stub is built on a grpc.aio channel.
+    _container = utils.lazy_service('isula.isulad.container:Container',
+                                    'isula.isulad_grpc.container_pb2_grpc:ContainerServiceStub')
+    _images = utils.lazy_service('isula.isulad.image:Image',
+                                 'isula.isulad_grpc.images_pb2_grpc:ImagesServiceStub')
+    _volumes = utils.lazy_service('isula.isulad.volume:Volume',
+                                  'isula.isulad_grpc.volumes_pb2_grpc:VolumeServiceStub')
+    _cri_runtime = utils.lazy_service('isula.isulad.cri:CRIRuntime',
+                                      'isula.isulad_grpc.api_pb2_grpc:RuntimeServiceStub')
+    _cri_images = utils.lazy_service('isula.isulad.cri:CRIImage',
+                                     'isula.isulad_grpc.api_pb2_grpc:ImageServiceStub')
+
+    def __init__(self, channel_target=None, channel_options=None,
+                 response_mode=utils.RESPONSE_DICT):
+        if not channel_target:
+            channel_target = 'unix:///run/isulad.sock'
+        self.response_mode = utils.check_response_mode(response_mode)
+        self._channel_target = channel_target
+        self._channel_options = channel_options
+
+    @property
+    def _container_stub(self):
+        return self._container.client
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self, grace=None):
+        """ Close the channel, cancelling the in-flight calls after grace seconds
+
+        :param grace: seconds to wait for in-flight calls, default cancels them at once
+        """
+        await aio_utils.close_aio_channel(self, grace)
+
+    @utils.async_response2dict
+    async def create_container(self, container_id, container_image,
+                               rootfs=None, runtime='lcr', **kwargs):
+        """ Create a container, see isula.isulad.client.Client.create_container """
+        hostconfig, customconfig = container.build_create_configs(kwargs)
+        return await self._container.create(container_id, container_image,
+                                            rootfs, runtime, hostconfig,
+                                            customconfig)
+
+    @utils.async_response2dict
+    async def create_container_from_template(self, template, container_id,
+                                             name=None, labels=None,
+                                             binds=None):
+        """ Create a container from a template, see isula.isulad.client.Client.create_container_from_template """
+        return await self._container.create_from_request(
+            template.request(container_id, name, labels, binds))
+
+    async def create_from_template(self, template, container_ids,
+                                   overrides=None,
+                                   max_workers=utils.DEFAULT_BATCH_WORKERS,
+                                   response_mode=None):
+        """ Create containers from a template concurrently, see isula.isulad.client.Client.create_from_template """
+        overrides = overrides or {}
+
+        async def create(container_id):
+            return await self.create_container_from_template(
+                template, container_id, response_mode=response_mode,
+                **overrides.get(container_id, {}))
+
+        return await aio_utils.run_batch_async(create, container_ids,
+                                               max_workers)
+
+    @utils.async_response2dict
+    async def start_container(self, container_id, stdin=None,
+                              attach_stdin=False, stdout=None,
+                              attach_stdout=False, stderr=None,
+                              attach_stderr=False):
+        """ Start a stopped container, see isula.isulad.client.Client.start_container """
+        return await self._container.start(container_id, stdin, attach_stdin,
+                                           stdout, attach_stdout, stderr,
+                                           attach_stderr)
+
+    async def remote_start_container(self, container_id, stdin=None,
+                                     open_stdin=True, attach_stderr=True,
+                                     chunk_size=None):
+        """ Start a container remotely, see isula.isulad.client.Client.remote_start_container
+
+        :return: isula.isulad.remote.AsyncStartSession -- the session
+        """
+        from isula.isulad import remote
+        session = remote.AsyncStartSession(
+            self._container.remote_start(container_id, None, attach_stderr),
+            chunk_size or remote.DEFAULT_CHUNK_SIZE)
+        if stdin is not None:
+            session.feed(stdin)
+        elif not open_stdin:
+            await session.close_stdin()
+        return session
+
+    async def container_top(self, container_id, args=None):
+        """ Display the running processes of a container
+
+        :param container_id: identifier of container
+        :param args(List(string)): the parameter for linux command `ps`
+        :return: the linux command `ps` information in container.
+        """
+        if not isinstance(args, list):
+            raise Exception("The args should be a list contains ps parameter, such as ['-s', '-q']")
+        response = utils.message_to_dict(await self._container.top(container_id, args))
+        response['titles'] = base64.b64decode(response['titles']).decode()
+        for i in range(len(response['processes'])):
+            response['processes'][i] = base64.b64decode(response['processes'][i]).decode()
+        return response
+
+    @utils.async_response2dict
+    async def stop_container(self, container_id, force=False, timeout=None):
+        """ Stop a container, see isula.isulad.client.Client.stop_container """
+        return await self._container.stop(container_id, force, timeout)
+
+    @utils.async_response2dict
+    async def kill_container(self, container_id, k_signal=signal.SIGKILL):
+        """ Kill a running container, see isula.isulad.client.Client.kill_container """
+        return await self._container.kill(container_id, k_signal)
+
+    @utils.async_response2dict
+    async def delete_container(self, container_id, force=False, volumes=False):
+        """ Delete a container, see isula.isulad.client.Client.delete_container """
+        return await self._container.delete(container_id, force, volumes)
+
+    @utils.async_response2dict
+    async def pause_container(self, container_id):
+        """ Pause a running container """
+        return await self._container.pause(container_id)
+
+    @utils.async_response2dict
+    async def resume_container(self, container_id):
+        """ Resume a paused container """
+        return await self._container.resume(container_id)
+
+    async def start_containers(self, container_ids,
+                               max_workers=utils.DEFAULT_BATCH_WORKERS,
+                               response_mode=None):
+        """ Start containers concurrently
+
+        :param container_ids(List(string)): identifiers of containers
+        :param max_workers(int): the maximum number of requests in flight
+        :param response_mode: the form of the responses, default as the client response_mode
+        :return: dict -- the response of each container, with the error code and message if
+            its start failed, or the exception raised by its request.
+        """
+        return await aio_utils.run_batch_async(
+            functools.partial(self.start_container,
+                              response_mode=response_mode),
+            container_ids, max_workers)
+
+    async def stop_containers(self, container_ids, force=False, timeout=None,
+                              max_workers=utils.DEFAULT_BATCH_WORKERS,
+                              response_mode=None):
+        """ Stop containers concurrently, see stop_container and start_containers """
+        return await aio_utils.run_batch_async(
+            functools.partial(self.stop_container, force=force,
+                              timeout=timeout, response_mode=response_mode),
+            container_ids, max_workers)
+
+    async def kill_containers(self, container_ids, k_signal=signal.SIGKILL,
+                              max_workers=utils.DEFAULT_BATCH_WORKERS,
+                              response_mode=None):
+        """ Kill containers concurrently, see kill_container and start_containers """
+        return await aio_utils.run_batch_async(
+            functools.partial(self.kill_container, k_signal=k_signal,
+                              response_mode=response_mode),
+            container_ids, max_workers)
+
+    async def delete_containers(self, container_ids, force=False, volumes=False,
+                                max_workers=utils.DEFAULT_BATCH_WORKERS,
+                                response_mode=None):
+        """ Delete containers concurrently, see delete_container and start_containers """
+        return await aio_utils.run_batch_async(
+            functools.partial(self.delete_container, force=force,
+                              volumes=volumes, response_mode=response_mode),
+            container_ids, max_workers)
+
+    async def pause_containers(self, container_ids,
+                               max_workers=utils.DEFAULT_BATCH_WORKERS,
+                               response_mode=None):
+        """ Pause containers concurrently, see pause_container and start_containers """
+        return await aio_utils.run_batch_async(
+            functools.partial(self.pause_container,
+                              response_mode=response_mode),
+            container_ids, max_workers)
+
+    async def resume_containers(self, container_ids,
+                                max_workers=utils.DEFAULT_BATCH_WORKERS,
+                                response_mode=None):
+        """ Resume containers concurrently, see resume_container and start_containers """
+        return await aio_utils.run_batch_async(
+            functools.partial(self.resume_container,
+                              response_mode=response_mode),
+            container_ids, max_workers)
+
+    async def restart_containers(self, container_ids, timeout=None,
+                                 max_workers=utils.DEFAULT_BATCH_WORKERS,
+                                 response_mode=None):
+        """ Restart containers concurrently, see restart_container and start_containers """
+        return await aio_utils.run_batch_async(
+            functools.partial(self.restart_container, timeout=timeout,
+                              response_mode=response_mode),
+            container_ids, max_workers)
+
+    @utils.async_response2dict
+    async def inspect_container(self, container_id, bformat=False,
+                                timeout=None):
+        """ Get low-level information on a container """
+        return await self._container.inspect(container_id, bformat, timeout)
+
+    async def list_containers(self, filters=None, is_all=False,
+                              summary=False, response_mode=None):
+        """ List containers, see isula.isulad.client.Client.list_containers """
+        response = await self._container.list(filters, is_all)
+        if summary:
+            from isula.isulad import results
+            return results.ContainerList(response)
+        return utils.convert_response(response,
+                                      response_mode or self.response_mode)
+
+    async def stats_containers(self, containers=None, all_containers=False,
+                               as_columns=False, response_mode=None):
+        """ Get resource usage statistics of containers, see isula.isulad.client.Client.stats_containers """
+        response = await self._container.stats(containers, all_containers)
+        if as_columns:
+            from isula.isulad import results
+            return results.stats_columns(response)
+        return utils.convert_response(response,
+                                      response_mode or self.response_mode)
+
+    @utils.async_response2dict
+    async def wait_container(self, container_id, condition=None):
+        """ Block until the container stops or is removed """
+        return await self._container.wait(container_id, condition)
+
+    async def container_events(self, container_id=None, since=None,
+                               until=None, store_only=False,
+                               response_mode=None, event_filter=None,
+                               batch_size=None, batch_window=None):
+        """ Get real time events from the server
+
+        See isula.isulad.client.Client.container_events for the parameters.
+
+        :return: AsyncIterable -- An async iterable object contains container events.
+
+        example:
+            async for event in client.container_events('xxx'):
+                print(event)
+        """
+        request = container_pb2.EventsRequest(id=container_id, since=since,
+                                              until=until, storeOnly=store_only)
+        response = self._container_stub.Events(
+            request, metadata=[('username', '0'), ('tls_mode', '0')])
+        response_mode = response_mode or self.response_mode
+        if batch_size or batch_window is not None:
+            from isula.isulad import events
+            async for batch in events.abatch_events(
+                    self._filter_events(response, event_filter),
+                    batch_size, batch_window):
+                yield [utils.convert_response(message, response_mode)
+                       for message in batch]
+            return
+        async for message in response:
+            if event_filter is None or event_filter(message):
+                yield utils.convert_response(message, response_mode)
+
+    @staticmethod
+    async def _filter_events(response, event_filter):
+        async for message in response:
+            if event_filter is None or event_filter(message):
+                yield message
+
+    @utils.async_response2dict
+    async def container_exec(self, container_id, argv, tty=None,
+                             open_stdin=False, attach_stdin=False,
+                             attach_stdout=False, attach_stderr=False,
+                             stdin=None, stdout=None, stderr=None, env=None,
+                             user=None, suffix=None, workdir=None):
+        """ Run a command in a running container, see isula.isulad.client.Client.container_exec """
+        return await self._container.container_exec(
+            container_id, tty, open_stdin, attach_stdin, attach_stdout,
+            attach_stderr, stdin, stdout, stderr, argv, env, user, suffix,
+            workdir)
+
+    async def container_remote_exec(self, container_id, argv, stdin=None,
+                                    open_stdin=True, tty=False, env=None,
+                                    user=None, workdir=None,
+                                    attach_stdout=True, attach_stderr=True,
+                                    timeout=None, chunk_size=None):
+        """ Run a command in a running container, see isula.isulad.client.Client.container_remote_exec
+
+        The stdin may also be an async iterable of bytes.
+
+        :return: isula.isulad.remote.AsyncExecSession -- the session
+        """
+        if not isinstance(argv, list):
+            raise TypeError("argv should be a list")
+        from isula.isulad import remote
+        open_stdin = open_stdin or stdin is not None
+        session = remote.AsyncExecSession(
+            self._container.remote_exec(container_id, argv, None, tty,
+                                        open_stdin, attach_stdout,
+                                        attach_stderr, env, user, workdir,
+                                        timeout),
+            chunk_size or remote.DEFAULT_CHUNK_SIZE)
+        if stdin is not None:
+            session.feed(stdin)
+        elif not open_stdin:
+            await session.close_stdin()
+        return session
+
+    async def exec_run(self, container_id, argv, timeout=None, capture=True,
+                       stdin=None, env=None, user=None, workdir=None):
+        """ Run a command in a running container and wait for its end, see isula.isulad.client.Client.exec_run """
+        async with await self.container_remote_exec(
+                container_id, argv, stdin=stdin, open_stdin=False, env=env,
+                user=user, workdir=workdir, attach_stdout=capture,
+                attach_stderr=capture, timeout=timeout) as session:
+            stdout, stderr = await session.communicate()
+            exit_code = await session.wait()
+        if not capture:
+            stdout = stderr = None
+        from isula.isulad import results
+        return results.ExecResult(container_id, argv, exit_code, stdout,
+                                  stderr)
+
+    async def exec_many(self, commands, timeout=None, capture=True,
+                        max_workers=utils.DEFAULT_BATCH_WORKERS, **kwargs):
+        """ Run commands in containers concurrently, see isula.isulad.client.Client.exec_many """
+        commands = list(commands)
+
+        async def run(index):
+            container_id, argv = commands[index]
+            return await self.exec_run(container_id, argv, timeout, capture,
+                                       **kwargs)
+
+        outcomes = await aio_utils.run_batch_async(run, range(len(commands)),
+                                                   max_workers)
+        return [outcomes[index] for index in range(len(commands))]
+
+    @utils.async_response2dict
+    async def isulad_version(self):
+        """ Get isulad package version info """
+        return await self._container.version()
+
+    @utils.async_response2dict
+    async def isulad_info(self):
+        """ Display system-wide information """
+        return await self._container.info()
+
+    @utils.async_response2dict
+    async def update_container(self, container_id, **kwargs):
+        """ Update a container, see isula.isulad.client.Client.update_container """
+        hostconfig = container.build_update_config(kwargs)
+
+        return await self._container.update(container_id, hostconfig)
+
+    async def attach_container(self, stdin, finish=None):
+        """ Attach to a running container
+
+        :return: AsyncIterable -- the AttachResponse messages
+        """
+        request = container_pb2.AttachRequest(stdin=stdin.encode(),
+                                              finish=finish)
+        response = self._container_stub.Attach(
+            iter([request]), metadata=[('username', '0'), ('tls_mode', '0')])
+        async for message in response:
+            yield message
+
+    @utils.async_response2dict
+    async def restart_container(self, container_id, timeout=None):
+        """ Restart a container """
+        return await self._container.restart(container_id, timeout)
+
+    @utils.async_response2dict
+    async def export_container(self, container_id, file_location):
+        """ Export a container to an image file """
+        file_location = os.path.abspath(file_location)
+        return await self._container.export(container_id, file_location)
+
+    async def copy_from_container(self, container_id, srcpath, runtime=None):
+        """ Copy data from a container
+
+        :return: AsyncIterable -- the CopyFromContainerResponse messages
+        """
+        request = container_pb2.CopyFromContainerRequest(
+            id=container_id, runtime=runtime, srcpath=srcpath)
+        response = self._container_stub.CopyFromContainer(
+            request, metadata=[('username', '0'), ('tls_mode', '0')])
+        async for message in response:
+            yield message
+
+    async def copy_from_container_to(self, container_id, srcpath, path,
+                                     runtime=None, buffer_size=None,
+                                     progress=None, extraction_filter='tar'):
+        """ Copy data from a container to a host directory, see isula.isulad.client.Client.copy_from_container_to
+
+        The archive is extracted by the default executor, which is fed the
+        chunks through a bounded queue as they are received.
+        """
+        from isula.isulad import archive
+        loop = asyncio.get_running_loop()
+        chunks = queue.Queue(maxsize=COPY_QUEUE_SIZE)
+        extraction = loop.run_in_executor(
+            None, archive.extract_chunks, iter(chunks.get, None), path,
+            buffer_size or archive.DEFAULT_BUFFER_SIZE, progress,
+            extraction_filter)
+
+        def put(message):
+            # Give up when the extraction failed and stopped reading.
+            while not extraction.done():
+                try:
+                    chunks.put(message, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        try:
+            async for message in self.copy_from_container(container_id,
+                                                          srcpath, runtime):
+                await loop.run_in_executor(None, put, message)
+                if extraction.done():
+                    break
+        finally:
+            await loop.run_in_executor(None, put, None)
+        return await extraction
+
+    async def copy_to_container(self, container_id, src_path, dst_path,
+                                runtime=None, rebase_name=None,
+                                chunk_size=None, use_mmap=None,
+                                progress=None):
+        """ Copy a host file or directory into a container, see isula.isulad.client.Client.copy_to_container
+
+        The archive is built by the default executor, one chunk at a time.
+
+        :return: int -- the number of bytes of the archive sent
+        """
+        from isula.isulad import archive
+        src_path = os.path.abspath(src_path)
+        loop = asyncio.get_running_loop()
+        chunk_size = chunk_size or archive.DEFAULT_CHUNK_SIZE
+        chunks = archive.tar_chunks(src_path, chunk_size=chunk_size,
+                                    use_mmap=use_mmap, progress=progress)
+        sent = 0
+
+        async def requests():
+            nonlocal sent
+            while True:
+                chunk = await loop.run_in_executor(None, next, chunks, None)
+                if chunk is None:
+                    return
+                sent += len(chunk)
+                yield container_pb2.CopyToContainerRequest(data=chunk)
+
+        response = self._container_stub.CopyToContainer(
+            requests(), metadata=container.copy_to_container_metadata(
+                container_id, runtime, src_path, os.path.isdir(src_path),
+                rebase_name, dst_path))
+        async for _ in response:
+            pass
+        return sent
+
+    @utils.async_response2dict
+    async def rename_container(self, oldname, newname):
+        """ Rename a container """
+        return await self._container.rename(oldname, newname)
+
+    async def container_logs(self, container_id, runtime=None, since=None,
+                             until=None, timestamps=False, follow=False,
+                             tail=None, details=False):
+        """ Fetch the logs of a container, see isula.isulad.client.Client.container_logs
+
+        :return: AsyncIterable -- the LogsResponse messages
+        """
+        request = container_pb2.LogsRequest(
+            id=container_id, runtime=runtime, since=since, until=until,
+            timestamps=timestamps, follow=follow, tail=tail, details=details)
+        response = self._container_stub.Logs(
+            request, metadata=[('username', '0'), ('tls_mode', '0')])
+        async for message in response:
+            yield message
+
+    async def save_logs(self, container_id, path, compression=None,
+                        rotate_bytes=None, since=None, until=None, tail=None,
+                        timestamps=False, streams=None, runtime=None):
+        """ Save the logs of a container to files, see isula.isulad.client.Client.save_logs
+
+        The files are written by the default executor, off the event loop.
+        """
+        from isula.isulad import logs
+        if isinstance(streams, str):
+            streams = (streams,)
+        streams = frozenset(streams) if streams else None
+        loop = asyncio.get_running_loop()
+        writer = logs.RotatingLogWriter(path, compression, rotate_bytes)
+        try:
+            async for message in self.container_logs(
+                    container_id, runtime, since, until, timestamps, False,
+                    tail, False):
+                if streams is not None and message.stream not in streams:
+                    continue
+                await loop.run_in_executor(None, writer.write, message.data)
+        finally:
+            await loop.run_in_executor(None, writer.close)
+        return writer.paths
+
+    def follow_logs(self, container_ids, streams=None, reorder_window=None,
+                    buffer_size=None, ignore_errors=False, **kwargs):
+        """ Follow the logs of several containers, see isula.isulad.client.Client.follow_logs
+
+        :return: isula.isulad.logs.AsyncLogFollower -- an async iterator of LogEntry objects
+        """
+        from isula.isulad import logs
+        if reorder_window is None:
+            reorder_window = logs.DEFAULT_REORDER_WINDOW
+        kwargs.setdefault('follow', True)
+        return logs.AsyncLogFollower(self, container_ids, streams,
+                                     reorder_window,
+                                     buffer_size or logs.DEFAULT_BUFFER_SIZE,
+                                     ignore_errors, **kwargs)
+
+    @utils.async_response2dict
+    async def resize_container(self, container_id, suffix=None, height=None,
+                               width=None):
+        """ Resize the tty session """
+        return await self._container.resize(container_id, suffix, height,
+                                            width)
+
+    @utils.async_response2dict
+    async def cri_runtime_version(self, version=None):
+        """ [CRI] Get runtime version info """
+        return await self._cri_runtime.version(version)
+
+    @utils.async_response2dict
+    async def cri_list_containers(self, query_filter=None):
+        """ [CRI] List containers """
+        return await self._cri_runtime.list_containers(query_filter)
+
+    async def cri_exec_sync(self, container_id, cmd, timeout=None,
+                            deadline=None):
+        """ [CRI] Run a command in a container and wait for its end, see isula.isulad.client.Client.cri_exec_sync """
+        if not isinstance(cmd, list):
+            raise TypeError("cmd should be a list")
+        response = await self._cri_runtime.exec_sync(container_id, cmd,
+                                                     timeout, deadline)
+        from isula.isulad import results
+        return results.ExecResult(container_id, cmd, response.exit_code,
+                                  response.stdout, response.stderr)
+
+    async def cri_exec_sync_many(self, cmd, container_ids=None, timeout=None,
+                                 deadline=None, query_filter=None,
+                                 max_workers=utils.DEFAULT_BATCH_WORKERS):
+        """ [CRI] Run a command in many containers concurrently, see isula.isulad.client.Client.cri_exec_sync_many """
+        if container_ids is None:
+            response = await self._cri_runtime.list_containers(
+                query_filter or self._cri_runtime.RUNNING_FILTER)
+            container_ids = [c.id for c in response.containers]
+
+        async def run(container_id):
+            return await self.cri_exec_sync(container_id, cmd, timeout,
+                                            deadline)
+
+        return await aio_utils.run_batch_async(run, container_ids, max_workers)
+
+    @utils.async_response2dict
+    async def cri_run_pod_sandbox(self, config, runtime_handler=None):
+        """ [CRI] Create and start a pod sandbox """
+        return await self._cri_runtime.run_pod_sandbox(config, runtime_handler)
+
+    @utils.async_response2dict
+    async def cri_stop_pod_sandbox(self, pod_sandbox_id):
+        """ [CRI] Stop a pod sandbox and its containers """
+        return await self._cri_runtime.stop_pod_sandbox(pod_sandbox_id)
+
+    @utils.async_response2dict
+    async def cri_remove_pod_sandbox(self, pod_sandbox_id):
+        """ [CRI] Remove a pod sandbox and its containers """
+        return await self._cri_runtime.remove_pod_sandbox(pod_sandbox_id)
+
+    @utils.async_response2dict
+    async def cri_pod_sandbox_status(self, pod_sandbox_id, verbose=False):
+        """ [CRI] Get the status of a pod sandbox """
+        return await self._cri_runtime.pod_sandbox_status(pod_sandbox_id,
+                                                          verbose)
+
+    @utils.async_response2dict
+    async def cri_list_pod_sandbox(self, query_filter=None):
+        """ [CRI] List pod sandboxes """
+        return await self._cri_runtime.list_pod_sandbox(query_filter)
+
+    @utils.async_response2dict
+    async def cri_create_container(self, pod_sandbox_id, config,
+                                   sandbox_config):
+        """ [CRI] Create a container in a pod sandbox """
+        return await self._cri_runtime.create_container(pod_sandbox_id, config,
+                                                        sandbox_config)
+
+    @utils.async_response2dict
+    async def cri_start_container(self, container_id):
+        """ [CRI] Start a created container """
+        return await self._cri_runtime.start_container(container_id)
+
+    @utils.async_response2dict
+    async def cri_stop_container(self, container_id, timeout=0):
+        """ [CRI] Stop a running container """
+        return await self._cri_runtime.stop_container(container_id, timeout)
+
+    @utils.async_response2dict
+    async def cri_remove_container(self, container_id):
+        """ [CRI] Remove a container """
+        return await self._cri_runtime.remove_container(container_id)
+
+    @utils.async_response2dict
+    async def cri_container_status(self, container_id, verbose=False):
+        """ [CRI] Get the status of a container """
+        return await self._cri_runtime.container_status(container_id, verbose)
+
+    @utils.async_response2dict
+    async def cri_update_container_resources(self, container_id, linux):
+        """ [CRI] Update the resources of a container """
+        return await self._cri_runtime.update_container_resources(container_id,
+                                                                  linux)
+
+    @utils.async_response2dict
+    async def cri_reopen_container_log(self, container_id):
+        """ [CRI] Reopen the log file of a container """
+        return await self._cri_runtime.reopen_container_log(container_id)
+
+    @utils.async_response2dict
+    async def cri_exec(self, container_id, cmd, tty=False, stdin=False,
+                       stdout=True, stderr=True):
+        """ [CRI] Prepare a streaming endpoint to run a command in a container """
+        return await self._cri_runtime.exec(container_id, cmd, tty, stdin,
+                                            stdout, stderr)
+
+    @utils.async_response2dict
+    async def cri_attach(self, container_id, stdin=False, tty=False,
+                         stdout=True, stderr=True):
+        """ [CRI] Prepare a streaming endpoint to attach to a container """
+        return await self._cri_runtime.attach(container_id, stdin, tty, stdout,
+                                              stderr)
+
+    @utils.async_response2dict
+    async def cri_port_forward(self, pod_sandbox_id, port=None):
+        """ [CRI] Prepare a streaming endpoint to forward ports of a pod sandbox """
+        return await self._cri_runtime.port_forward(pod_sandbox_id, port)
+
+    @utils.async_response2dict
+    async def cri_container_stats(self, container_id):
+        """ [CRI] Get the stats of a container """
+        return await self._cri_runtime.container_stats(container_id)
+
+    @utils.async_response2dict
+    async def cri_list_container_stats(self, query_filter=None):
+        """ [CRI] Get the stats of the containers """
+        return await self._cri_runtime.list_container_stats(query_filter)
+
+    @utils.async_response2dict
+    async def cri_update_runtime_config(self, runtime_config):
+        """ [CRI] Update the runtime configuration """
+        return await self._cri_runtime.update_runtime_config(runtime_config)
+
+    @utils.async_response2dict
+    async def cri_runtime_status(self, verbose=False):
+        """ [CRI] Get the status of the runtime """
+        return await self._cri_runtime.status(verbose)
+
+    async def cri_teardown_pod_sandboxes(
+            self, pod_sandbox_ids, max_workers=utils.DEFAULT_BATCH_WORKERS,
+            response_mode=None):
+        """ [CRI] Stop and remove pod sandboxes concurrently, see isula.isulad.client.Client.cri_teardown_pod_sandboxes """
+        async def teardown(pod_sandbox_id):
+            await self._cri_runtime.stop_pod_sandbox(pod_sandbox_id)
+            return await self.cri_remove_pod_sandbox(
+                pod_sandbox_id, response_mode=response_mode)
+
+        return await aio_utils.run_batch_async(teardown, pod_sandbox_ids,
+                                               max_workers)
+
+    async def cri_run_pod(self, config, container_configs,
+                          runtime_handler=None, start=True,
+                          max_workers=utils.DEFAULT_BATCH_WORKERS):
+        """ [CRI] Run a pod sandbox and create and start its containers, see isula.isulad.client.Client.cri_run_pod """
+        container_configs = list(container_configs)
+        response = await self._cri_runtime.run_pod_sandbox(config,
+                                                           runtime_handler)
+        pod_sandbox_id = response.pod_sandbox_id
+        created = []
+
+        async def create(index):
+            response = await self._cri_runtime.create_container(
+                pod_sandbox_id, container_configs[index], config)
+            created.append(response.container_id)
+            if start:
+                await self._cri_runtime.start_container(response.container_id)
+            return response.container_id
+
+        try:
+            outcomes = await aio_utils.run_batch_async(
+                create, range(len(container_configs)), max_workers)
+            container_ids = [outcomes[index]
+                             for index in range(len(container_configs))]
+            for outcome in container_ids:
+                if isinstance(outcome, Exception):
+                    raise outcome
+        except BaseException:
+            await self._remove_pod(pod_sandbox_id, created)
+            raise
+        return {'pod_sandbox_id': pod_sandbox_id, 'containers': container_ids}
+
+    async def _remove_pod(self, pod_sandbox_id, container_ids):
+        # See isula.isulad.client.Client._remove_pod
+        calls = [functools.partial(self._cri_runtime.stop_pod_sandbox,
+                                   pod_sandbox_id)]
+        calls += [functools.partial(self._cri_runtime.remove_container,
+                                    container_id)
+                  for container_id in container_ids]
+        calls.append(functools.partial(self._cri_runtime.remove_pod_sandbox,
+                                       pod_sandbox_id))
+        for call in calls:
+            try:
+                await call()
+            except Exception:
+                pass
+
+    @utils.async_response2dict
+    async def cri_list_images(self, query_filter=None):
+        """ [CRI] List images """
+        return await self._cri_images.list_images(query_filter)
+
+    @utils.async_response2dict
+    async def list_images(self, filters=None):
+        """ [IMAGE] List images, see isula.isulad.client.Client.list_images """
+        if not filters:
+            filters = {}
+        for k in filters.keys():
+            if k not in ["dangling", "label", "before", "since", "reference"]:
+                raise Exception("Only supports the following fields - dangling, label, before, since, reference")
+
+        return await self._images.list(filters)
+
+    @utils.async_response2dict
+    async def delete_image(self, name, force=False):
+        """ [IMAGE] Delete the image in isulad """
+        return await self._images.delete(name, force)
+
+    @utils.async_response2dict
+    async def load_image(self, image_file, image_type, tag=''):
+        """ [IMAGE] Import the image exported using the save command """
+        if image_type not in ["oci", "embedded", "external"]:
+            raise Exception("Only supports the following type - oci, embedded, external")
+        image_file = os.path.abspath(image_file)
+        return await self._images.load(image_file, image_type, tag)
+
+    @utils.async_response2dict
+    async def inspect_image(self, image_id, bformat=False, timeout=120):
+        """ [IMAGE] Get the metadata of image """
+        return await self._images.inspect(image_id, bformat, timeout)
+
+    @utils.async_response2dict
+    async def tag_image(self, src_name, dest_name):
+        """ [IMAGE] Tag the image with dest_name for image named src_name """
+        return await self._images.tag(src_name, dest_name)
+
+    @utils.async_response2dict
+    async def import_image(self, image_file, tag):
+        """ [IMAGE] Import a new image """
+        image_file = os.path.abspath(image_file)
+        return await self._images.import_(image_file, tag)
+
+    @utils.async_response2dict
+    async def login(self, username, password, server, image_type='oci'):
+        """ [IMAGE] Login image registry with username and password """
+        if image_type != 'oci':
+            raise Exception("Invalid image_type, only oci is supported currently")
+        return await self._images.login(username, password, server,
+                                        image_type)
+
+    @utils.async_response2dict
+    async def logout(self, server, image_type='oci'):
+        """ [IMAGE] Logout image registry """
+        if image_type != 'oci':
+            raise Exception("Invalid image_type, only oci is supported currently")
+        return await self._images.logout(server, image_type)
+
+    @utils.async_response2dict
+    async def list_volumes(self):
+        """ [VOLUME] List volumes """
+        return await self._volumes.list()
+
+    @utils.async_response2dict
+    async def remove_volume(self, name):
+        """ [VOLUME] Remove the volume """
+        return await self._volumes.remove(name)
+
+    @utils.async_response2dict
+    async def prune_volume(self):
+        """ [VOLUME] Remove the unused volume """
+        return await self._volumes.prune()
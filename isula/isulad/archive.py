@@ -0,0 +1,212 @@
+"""Stream tar archives in and out of containers without holding them in memory.
+
+CopyFromContainer streams a tar archive in chunks. ChunkReader turns the
+chunks into a binary file, which tarfile reads in stream mode, so the members
+are extracted as the chunks arrive and only the read buffer is held.
+
+CopyToContainer takes the chunks of a tar archive. tar_chunks builds them
+from a host file or directory on the fly: the headers come from tarfile and
+the content of the files is read chunk by chunk, so only one chunk is held.
+
+example:
+    import isula
+
+    client = isula.init_isulad_client()
+    names = client.copy_from_container_to('xxx', '/var/log', '/tmp/logs',
+                                          progress=print)
+    client.copy_to_container('xxx', '/tmp/config', '/etc', progress=print)
+"""
+import io
+import mmap
+import os
+import tarfile
+import time
+
+from isula import utils
+
+
+# Size of the buffer tarfile reads the chunks through.
+DEFAULT_BUFFER_SIZE = 1 << 20
+# The extraction filter of tarfile, refusing members outside of the target
+# directory, where supported (Python 3.12, and security releases before).
+DEFAULT_EXTRACTION_FILTER = 'tar'
+# Size of the chunks of the archives sent to a container, well below the
+# 4 MiB default message size limit of gRPC.
+DEFAULT_CHUNK_SIZE = 1 << 20
+# Files from this size on are read through mmap by tar_chunks by default.
+MMAP_THRESHOLD = 16 << 20
+
+
+class ChunkReader(utils.RawChunkReader):
+    """A binary file over messages with a `data` field.
+
+    :param messages: the messages, such as the CopyFromContainerResponse call
+    :param progress: called with the bytes read so far and the seconds elapsed
+        after each message. Closing the reader cancels the call when the
+        messages come from one.
+    """
+    def __init__(self, messages, progress=None):
+        super(ChunkReader, self).__init__(messages)
+        self.progress = progress
+        self.bytes_read = 0
+        self._messages = iter(messages)
+        self._started = time.monotonic()
+
+    def _next_data(self):
+        message = next(self._messages, None)
+        if message is None:
+            return None
+        data = message.data
+        self.bytes_read += len(data)
+        if self.progress is not None:
+            self.progress(self.bytes_read, time.monotonic() - self._started)
+        return data
+
+
+def open_chunks(messages, buffer_size=DEFAULT_BUFFER_SIZE, progress=None):
+    """Open messages with a `data` field as a buffered binary file
+
+    :returns: io.BufferedReader -- the file, see ChunkReader for the parameters
+    """
+    return io.BufferedReader(ChunkReader(messages, progress), buffer_size)
+
+
+def extract_chunks(messages, path, buffer_size=DEFAULT_BUFFER_SIZE,
+                   progress=None, extraction_filter=DEFAULT_EXTRACTION_FILTER):
+    """Extract the tar archive streamed in the `data` of messages
+
+    The members are extracted one by one as they are read, with tarfile in
+    stream mode.
+
+    :param messages: the messages, such as the CopyFromContainerResponse call
+    :param path(string): the directory to extract the archive to
+    :param buffer_size(int): the size of the read buffer
+    :param progress: called with the bytes received so far and the seconds elapsed
+    :param extraction_filter(string): the tarfile extraction filter, when
+        tarfile supports filters, see tarfile.TarFile.extraction_filter
+    :returns: list -- the names of the extracted members
+    """
+    kwargs = {}
+    if hasattr(tarfile, 'data_filter') and extraction_filter is not None:
+        kwargs['filter'] = extraction_filter
+    names = []
+    with open_chunks(messages, buffer_size, progress) as fileobj:
+        with tarfile.open(fileobj=fileobj, mode='r|*') as tar:
+            for member in tar:
+                tar.extract(member, path, **kwargs)
+                names.append(member.name)
+    return names
+
+
+class _Chunker(object):
+    """Cut a byte stream into chunks of a fixed size"""
+    def __init__(self, chunk_size):
+        self.chunk_size = chunk_size
+        self.buffer = bytearray()
+
+    def missing(self):
+        """The number of bytes completing the current chunk"""
+        return self.chunk_size - len(self.buffer)
+
+    def feed(self, data):
+        buffer = self.buffer
+        if not buffer and len(data) == self.chunk_size:
+            yield bytes(data)
+            return
+        buffer += data
+        while len(buffer) >= self.chunk_size:
+            yield bytes(buffer[:self.chunk_size])
+            del buffer[:self.chunk_size]
+
+    def flush(self):
+        if self.buffer:
+            yield bytes(self.buffer)
+            self.buffer = bytearray()
+
+
+def _walk(src_path, arcname):
+    yield src_path, arcname
+    if os.path.isdir(src_path) and not os.path.islink(src_path):
+        for name in sorted(os.listdir(src_path)):
+            # Build the member names with '/' whatever the host separator.
+            for member in _walk(os.path.join(src_path, name),
+                                '%s/%s' % (arcname, name)):
+                yield member
+
+
+def _file_pieces(path, size, chunker, use_mmap):
+    with open(path, 'rb') as f:
+        if use_mmap and size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                pos = 0
+                while pos < size:
+                    end = min(size, pos + chunker.missing())
+                    # Slicing the mapping copies the pages once, without a
+                    # read buffer in between.
+                    data = mapped[pos:end]
+                    if len(data) < end - pos:
+                        raise IOError("%s was truncated while being archived"
+                                      % path)
+                    yield data
+                    pos = end
+            return
+        remaining = size
+        while remaining > 0:
+            data = f.read(min(remaining, chunker.missing()))
+            if not data:
+                raise IOError("%s was truncated while being archived" % path)
+            remaining -= len(data)
+            yield data
+
+
+def tar_chunks(src_path, arcname=None, chunk_size=DEFAULT_CHUNK_SIZE,
+               use_mmap=None, progress=None):
+    """Tar a host file or directory on the fly
+
+    :param src_path(string): the file or directory to archive
+    :param arcname(string): the name of src_path in the archive, default its base name
+    :param chunk_size(int): the size of the chunks
+    :param use_mmap(boolean): read the files through mmap, default for the
+        files of at least MMAP_THRESHOLD bytes
+    :param progress: called with the bytes produced so far and the seconds elapsed after each chunk
+    :returns: Iterable -- the archive in chunks of chunk_size bytes, the last one shorter
+    """
+    if arcname is None:
+        arcname = os.path.basename(os.path.normpath(src_path))
+    tar = tarfile.TarFile(fileobj=io.BytesIO(), mode='w')
+    chunker = _Chunker(chunk_size)
+    started = time.monotonic()
+    produced = [0]
+
+    def emit(pieces):
+        for chunk in pieces:
+            produced[0] += len(chunk)
+            if progress is not None:
+                progress(produced[0], time.monotonic() - started)
+            yield chunk
+
+    offset = 0
+    for path, name in _walk(src_path, arcname):
+        tarinfo = tar.gettarinfo(path, name)
+        if tarinfo is None:
+            # Sockets can not be archived.
+            continue
+        header = tarinfo.tobuf(tar.format, tar.encoding, tar.errors)
+        offset += len(header)
+        yield from emit(chunker.feed(header))
+        if not tarinfo.isreg() or not tarinfo.size:
+            continue
+        mapped = (use_mmap if use_mmap is not None
+                  else tarinfo.size >= MMAP_THRESHOLD)
+        for data in _file_pieces(path, tarinfo.size, chunker, mapped):
+            yield from emit(chunker.feed(data))
+        offset += tarinfo.size
+        padding = -tarinfo.size % tarfile.BLOCKSIZE
+        offset += padding
+        yield from emit(chunker.feed(tarfile.NUL * padding))
+    # The end of archive blocks, padded to a whole record like tarfile does.
+    end = tarfile.NUL * (tarfile.BLOCKSIZE * 2)
+    offset += len(end)
+    end += tarfile.NUL * (-offset % tarfile.RECORDSIZE)
+    yield from emit(chunker.feed(end))
+    yield from emit(chunker.flush())
@@ -1,39 +1,59 @@
 import base64
-import inspect
+import functools
 import signal
 import os
 
-from google.protobuf.json_format import MessageToDict
-import grpc
-
 from isula.isulad import container
-from isula.isulad import cri
-from isula.isulad import image
-from isula.isulad import volume
-from isula.isulad_grpc import api_pb2_grpc
 from isula.isulad_grpc import container_pb2_grpc
-from isula.isulad_grpc import images_pb2_grpc
-from isula.isulad_grpc import volumes_pb2_grpc
+from isula import channel
 from isula import utils
 
 
 class Client(object):
-    def __init__(self, channel_target):
+    # The other services are loaded on first use, importing the CRI, image
+    # and volume modules only when they are needed. In the same way, the
+    # archive, events, logs, remote and results helpers are imported by the
+    # methods using them.
+    _images = utils.lazy_service('isula.isulad.image:Image',
+                                 'isula.isulad_grpc.images_pb2_grpc:ImagesServiceStub')
+    _volumes = utils.lazy_service('isula.isulad.volume:Volume',
+                                  'isula.isulad_grpc.volumes_pb2_grpc:VolumeServiceStub')
+    _cri_runtime = utils.lazy_service('isula.isulad.cri:CRIRuntime',
+                                      'isula.isulad_grpc.api_pb2_grpc:RuntimeServiceStub')
+    _cri_images = utils.lazy_service('isula.isulad.cri:CRIImage',
+                                     'isula.isulad_grpc.api_pb2_grpc:ImageServiceStub')
+
+    def __init__(self, channel_target, channel_options=None,
+                 response_mode=utils.RESPONSE_DICT):
         if not channel_target:
             channel_target = 'unix:///run/isulad.sock'
-        channel = grpc.insecure_channel(channel_target)
+        # How responses are returned, see isula.utils.convert_response. Each
+        # method also accepts a `response_mode` keyword to override it.
+        self.response_mode = utils.check_response_mode(response_mode)
+        # Channels are shared with the other clients of the same target, see
+        # isula.channel.ChannelPool.
+        self._channel = channel.acquire_channel(channel_target,
+                                                channel_options)
+
+        container_client = container_pb2_grpc.ContainerServiceStub(
+            self._channel)
+        self._container = container.Container(container_client)
 
-        container_client = container_pb2_grpc.ContainerServiceStub(channel)
-        images_client = images_pb2_grpc.ImagesServiceStub(channel)
-        volumes_client = volumes_pb2_grpc.VolumeServiceStub(channel)
-        cri_runtime_client = api_pb2_grpc.RuntimeServiceStub(channel)
-        cri_images_client = api_pb2_grpc.ImageServiceStub(channel)
+    def __enter__(self):
+        return self
 
-        self._container = container.Container(container_client)
-        self._images = image.Image(images_client)
-        self._volumes = volume.Volume(volumes_client)
-        self._cri_runtime = cri.CRIRuntime(cri_runtime_client)
-        self._cri_images = cri.CRIImage(cri_images_client)
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """ Release the connection to iSulad
+
+        The underlying channel is closed once no other client uses it and it
+        has been idle for a while. The client can not be used after closing.
+        """
+        if self._channel is not None:
+            channel.release_channel(self._channel)
+            self._channel = None
 
     @utils.response2dict
     def create_container(self, container_id, container_image, rootfs=None,
@@ -44,26 +64,51 @@ class Client(object):
         :param container_image: image used for creating container
         :param rootfs: rootfs used for running container, default as '/dev/ram0'
         :param runtime: runtime to use for containers(default: lcr)
-        :param kwargs:
-            VolumesFrom:
+        :param kwargs: fields of isula.isulad.container.HostConfig and ContainerConfig,
+            such as Binds, Memory or Labels. An unknown field raises TypeError.
         :return:
         """
-        hc_argspec = inspect.getfullargspec(container.HostConfig.__init__).args
-        hc_args = {}
-        cc_argspec = inspect.getfullargspec(
-            container.ContainerConfig.__init__).args
-        cc_args = {}
-        for k, v in kwargs.items():
-            if k in hc_argspec:
-                hc_args[k] = v
-            if k in cc_argspec:
-                cc_args[k] = v
-
-        hostconfig = container.HostConfig(**hc_args).to_json()
-        customconfig = container.ContainerConfig(**cc_args).to_json()
+        hostconfig, customconfig = container.build_create_configs(kwargs)
         return self._container.create(container_id, container_image, rootfs,
                                       runtime, hostconfig, customconfig)
 
+    @utils.response2dict
+    def create_container_from_template(self, template, container_id,
+                                       name=None, labels=None, binds=None):
+        """ Create a container from an isula.isulad.container.ContainerTemplate
+
+        :param template: the ContainerTemplate holding the container configs
+        :param container_id: identifier of container
+        :param name: name of the container, replacing the template one
+        :param labels(dict): labels added to the template ones
+        :param binds(list): binds added to the template ones
+        :return:
+        """
+        return self._container.create_from_request(
+            template.request(container_id, name, labels, binds))
+
+    def create_from_template(self, template, container_ids, overrides=None,
+                             max_workers=utils.DEFAULT_BATCH_WORKERS,
+                             response_mode=None):
+        """ Create containers from a template concurrently
+
+        :param template: the isula.isulad.container.ContainerTemplate of the containers
+        :param container_ids(List(string)): identifiers of containers
+        :param overrides(dict): the name, labels and binds keyword arguments of
+            create_container_from_template for some of the containers, by identifier
+        :param max_workers(int): the maximum number of requests in flight
+        :param response_mode: the form of the responses, default as the client response_mode
+        :return: dict -- the response of each container, or the exception raised by its request.
+        """
+        overrides = overrides or {}
+
+        def create(container_id):
+            return self.create_container_from_template(
+                template, container_id, response_mode=response_mode,
+                **overrides.get(container_id, {}))
+
+        return utils.run_batch(create, container_ids, max_workers)
+
     @utils.response2dict
     def start_container(self, container_id, stdin=None, attach_stdin=False,
                         stdout=None, attach_stdout=False, stderr=None,
@@ -82,16 +127,32 @@ class Client(object):
         return self._container.start(container_id, stdin, attach_stdin, stdout,
                                      attach_stdout, stderr, attach_stderr)
 
-    def remote_start_container(self, container_id, stdin=None, finish=False):
-        """ Start a container remotely
+    def remote_start_container(self, container_id, stdin=None,
+                               open_stdin=True, attach_stderr=True,
+                               chunk_size=None, queue_size=None):
+        """ Start a container remotely, with its stdio attached to the session
 
         :param container_id: identifier of container
-        :param stdin: FIFO for stdin stream
-        :param finish:
-        :return:
+        :param stdin: bytes, a binary file or an iterable of bytes fed to the stdin
+        :param open_stdin(boolean): keep the stdin open for the writes of the caller
+        :param attach_stderr(boolean): receive the stderr of the container
+        :param chunk_size(int): the maximum size of the stdin messages, default
+            isula.isulad.remote.DEFAULT_CHUNK_SIZE
+        :param queue_size(int): the number of stdin chunks waiting to be sent before writes
+            wait, default isula.isulad.remote.DEFAULT_QUEUE_SIZE
+        :return: isula.isulad.remote.StartSession -- the session
         """
-        #return self._container.remote_start(container_id, stdin, finish)
-        raise NotImplementedError
+        from isula.isulad import remote
+        session = remote.StartSession(
+            functools.partial(self._container.remote_start, container_id,
+                              attach_stderr=attach_stderr),
+            chunk_size or remote.DEFAULT_CHUNK_SIZE,
+            queue_size or remote.DEFAULT_QUEUE_SIZE)
+        if stdin is not None:
+            session.feed(stdin)
+        elif not open_stdin:
+            session.close_stdin()
+        return session
 
     def container_top(self, container_id, args=None):
         """ Display the running processes of a container
@@ -102,7 +163,7 @@ class Client(object):
         """
         if not isinstance(args, list):
             raise Exception("The args should be a list contains ps parameter, such as ['-s', '-q']")
-        response = MessageToDict(self._container.top(container_id, args))
+        response = utils.message_to_dict(self._container.top(container_id, args))
         response['titles'] = base64.b64decode(response['titles']).decode()
         for i in range(len(response['processes'])):
             response['processes'][i] = base64.b64decode(response['processes'][i]).decode()
@@ -159,6 +220,76 @@ class Client(object):
         """
         return self._container.resume(container_id)
 
+    def start_containers(self, container_ids,
+                         max_workers=utils.DEFAULT_BATCH_WORKERS,
+                         response_mode=None):
+        """ Start containers concurrently
+
+        :param container_ids(List(string)): identifiers of containers
+        :param max_workers(int): the maximum number of requests in flight
+        :param response_mode: the form of the responses, default as the client response_mode
+        :return: dict -- the response of each container, with the error code and message if
+            its start failed, or the exception raised by its request.
+        """
+        return utils.run_batch(
+            functools.partial(self.start_container,
+                              response_mode=response_mode),
+            container_ids, max_workers)
+
+    def stop_containers(self, container_ids, force=False, timeout=None,
+                        max_workers=utils.DEFAULT_BATCH_WORKERS,
+                        response_mode=None):
+        """ Stop containers concurrently, see stop_container and start_containers """
+        return utils.run_batch(
+            functools.partial(self.stop_container, force=force,
+                              timeout=timeout, response_mode=response_mode),
+            container_ids, max_workers)
+
+    def kill_containers(self, container_ids, k_signal=signal.SIGKILL,
+                        max_workers=utils.DEFAULT_BATCH_WORKERS,
+                        response_mode=None):
+        """ Kill containers concurrently, see kill_container and start_containers """
+        return utils.run_batch(
+            functools.partial(self.kill_container, k_signal=k_signal,
+                              response_mode=response_mode),
+            container_ids, max_workers)
+
+    def delete_containers(self, container_ids, force=False, volumes=False,
+                          max_workers=utils.DEFAULT_BATCH_WORKERS,
+                          response_mode=None):
+        """ Delete containers concurrently, see delete_container and start_containers """
+        return utils.run_batch(
+            functools.partial(self.delete_container, force=force,
+                              volumes=volumes, response_mode=response_mode),
+            container_ids, max_workers)
+
+    def pause_containers(self, container_ids,
+                         max_workers=utils.DEFAULT_BATCH_WORKERS,
+                         response_mode=None):
+        """ Pause containers concurrently, see pause_container and start_containers """
+        return utils.run_batch(
+            functools.partial(self.pause_container,
+                              response_mode=response_mode),
+            container_ids, max_workers)
+
+    def resume_containers(self, container_ids,
+                          max_workers=utils.DEFAULT_BATCH_WORKERS,
+                          response_mode=None):
+        """ Resume containers concurrently, see resume_container and start_containers """
+        return utils.run_batch(
+            functools.partial(self.resume_container,
+                              response_mode=response_mode),
+            container_ids, max_workers)
+
+    def restart_containers(self, container_ids, timeout=None,
+                           max_workers=utils.DEFAULT_BATCH_WORKERS,
+                           response_mode=None):
+        """ Restart containers concurrently, see restart_container and start_containers """
+        return utils.run_batch(
+            functools.partial(self.restart_container, timeout=timeout,
+                              response_mode=response_mode),
+            container_ids, max_workers)
+
     @utils.response2dict
     def inspect_container(self, container_id, bformat=False, timeout=None):
         """ Get low-level information on a container
@@ -170,12 +301,15 @@ class Client(object):
         """
         return self._container.inspect(container_id, bformat, timeout)
 
-    @utils.response2dict
-    def list_containers(self, filters=None, is_all=False):
+    def list_containers(self, filters=None, is_all=False, summary=False,
+                        response_mode=None):
         """ List containers
 
         :param filters(list or dict): Filter output based on conditions provided
         :param all(boolean): Display all containers (default shows just running)
+        :param summary(boolean): Return an isula.isulad.results.ContainerList of
+            ContainerSummary objects instead of the response
+        :param response_mode: the form of the response, default as the client response_mode
         :returns: dict -- list of containers' info
 
         The filters can be a dict like:
@@ -183,17 +317,30 @@ class Client(object):
         or a list like:
             filters = [('id', xxx)]
         """
-        return self._container.list(filters, is_all)
-
-    @utils.response2dict
-    def stats_containers(self, containers=None, all_containers=False):
+        response = self._container.list(filters, is_all)
+        if summary:
+            from isula.isulad import results
+            return results.ContainerList(response)
+        return utils.convert_response(response,
+                                      response_mode or self.response_mode)
+
+    def stats_containers(self, containers=None, all_containers=False,
+                         as_columns=False, response_mode=None):
         """ Display a live stream of container(s) resource usage statistics
 
         :param containers(List(string)): A list of containers' ID (default shows all running containers)
         :param all_containers: show all containers or not
+        :param as_columns(boolean): Return isula.isulad.results.StatsColumns, the statistics as
+            a struct of arrays keyed by field name, instead of the response
+        :param response_mode: the form of the response, default as the client response_mode
         :return: resource usage statistics of containers
         """
-        return self._container.stats(containers, all_containers)
+        response = self._container.stats(containers, all_containers)
+        if as_columns:
+            from isula.isulad import results
+            return results.stats_columns(response)
+        return utils.convert_response(response,
+                                      response_mode or self.response_mode)
 
     @utils.response2dict
     def wait_container(self, container_id, condition=None):
@@ -206,13 +353,21 @@ class Client(object):
         return self._container.wait(container_id, condition)
 
     def container_events(self, container_id=None, since=None, until=None,
-                         store_only=False):
+                         store_only=False, response_mode=None,
+                         event_filter=None, batch_size=None,
+                         batch_window=None):
         """ Get real time events from the server
 
         :param container_id: identifier of container
         :param since: time when the events of a container since from
         :param until: time when the evens of a container until
         :param store_only:
+        :param response_mode: the form of the events, default as the client response_mode
+        :param event_filter: a predicate called with each raw container_pb2.Event, the events
+            it rejects are dropped before being converted. See isula.isulad.events.event_filter.
+        :param batch_size(int): yield lists of at most batch_size events
+        :param batch_window(float): yield lists of the events received within batch_window
+            seconds, see isula.isulad.events.batch_events
         :return: Iterable -- An Iterable object contains container events.
 
         example:
@@ -221,8 +376,19 @@ class Client(object):
             for event in client.container_events('xxx')
                 print(event)
         Note: The for loop will be blocked forever unless the request is canceld by hand.
+            With the 'raw' response_mode and neither filter nor batches, the gRPC
+            call itself is returned, and its cancel() method ends the loop.
         """
-        return self._container.events(container_id, since, until, store_only)
+        call = self._container.events(container_id, since, until, store_only)
+        stream = call
+        if event_filter is not None:
+            stream = filter(event_filter, stream)
+        stream = utils.convert_responses(stream,
+                                         response_mode or self.response_mode)
+        if batch_size or batch_window is not None:
+            from isula.isulad import events
+            return events.batch_events(stream, batch_size, batch_window, call)
+        return stream
 
     @utils.response2dict
     def container_exec(self, container_id, argv, tty=None, open_stdin=False,
@@ -254,15 +420,95 @@ class Client(object):
             attach_stderr, stdin, stdout, stderr, argv, env, user, suffix,
             workdir)
 
-    def container_remote_exec(self, cmd, finish=None):
+    def container_remote_exec(self, container_id, argv, stdin=None,
+                              open_stdin=True, tty=False, env=None,
+                              user=None, workdir=None, attach_stdout=True,
+                              attach_stderr=True, timeout=None,
+                              chunk_size=None, queue_size=None):
+        """ Run a command in a running container, with its stdio carried by the session
+
+        Unlike container_exec, no FIFO is needed: the stdin is sent and the
+        output received over the RemoteExec stream, see isula.isulad.remote.
+
+        :param container_id: identifier of container
+        :param argv(List(string)): the command and its arguments
+        :param stdin: bytes, a binary file or an iterable of bytes fed to the stdin
+        :param open_stdin(boolean): keep the stdin open for the writes of the caller
+        :param tty(boolean): allocate a pseudo-TTY
+        :param env(List(string)): environment variables, like `KEY=value`
+        :param user: Username or UID
+        :param workdir: Working directory inside the container
+        :param attach_stdout(boolean): receive the stdout of the command
+        :param attach_stderr(boolean): receive the stderr of the command
+        :param timeout(float): seconds after which the session fails with DEADLINE_EXCEEDED
+        :param chunk_size(int): the maximum size of the stdin messages, default
+            isula.isulad.remote.DEFAULT_CHUNK_SIZE
+        :param queue_size(int): the number of stdin chunks waiting to be sent before writes
+            wait, default isula.isulad.remote.DEFAULT_QUEUE_SIZE
+        :return: isula.isulad.remote.ExecSession -- the session, whose wait() returns the exit code
         """
+        if not isinstance(argv, list):
+            raise TypeError("argv should be a list")
+        from isula.isulad import remote
+        open_stdin = open_stdin or stdin is not None
+        session = remote.ExecSession(
+            lambda requests: self._container.remote_exec(
+                container_id, argv, requests, tty, open_stdin, attach_stdout,
+                attach_stderr, env, user, workdir, timeout),
+            chunk_size or remote.DEFAULT_CHUNK_SIZE,
+            queue_size or remote.DEFAULT_QUEUE_SIZE)
+        if stdin is not None:
+            session.feed(stdin)
+        elif not open_stdin:
+            session.close_stdin()
+        return session
+
+    def exec_run(self, container_id, argv, timeout=None, capture=True,
+                 stdin=None, env=None, user=None, workdir=None):
+        """ Run a command in a running container and wait for its end
 
-        :param cmd: commands to be executed in container
-        :param finish: wait until finish or not
-        :return:
+        :param container_id: identifier of container
+        :param argv(List(string)): the command and its arguments
+        :param timeout(float): seconds after which the command fails with DEADLINE_EXCEEDED
+        :param capture(boolean): capture the stdout and the stderr of the command
+        :param stdin: bytes, a binary file or an iterable of bytes fed to the stdin
+        :param env(List(string)): environment variables, like `KEY=value`
+        :param user: Username or UID
+        :param workdir: Working directory inside the container
+        :return: isula.isulad.results.ExecResult -- the exit code and the output
+        """
+        with self.container_remote_exec(
+                container_id, argv, stdin=stdin, open_stdin=False, env=env,
+                user=user, workdir=workdir, attach_stdout=capture,
+                attach_stderr=capture, timeout=timeout) as session:
+            stdout, stderr = session.communicate()
+            exit_code = session.wait()
+        if not capture:
+            stdout = stderr = None
+        from isula.isulad import results
+        return results.ExecResult(container_id, argv, exit_code, stdout,
+                                  stderr)
+
+    def exec_many(self, commands, timeout=None, capture=True,
+                  max_workers=utils.DEFAULT_BATCH_WORKERS, **kwargs):
+        """ Run commands in containers concurrently, see exec_run
+
+        :param commands: (container_id, argv) tuples
+        :param timeout(float): seconds after which each command fails with DEADLINE_EXCEEDED
+        :param capture(boolean): capture the stdout and the stderr of the commands
+        :param max_workers(int): the maximum number of commands running at once
+        :param kwargs: the other parameters of exec_run, like env or user
+        :return: list -- the ExecResult of each command, or the exception raised by it, in order
         """
-        #return self._container.remote_exec(cmd, finish)
-        raise NotImplementedError
+        commands = list(commands)
+
+        def run(index):
+            container_id, argv = commands[index]
+            return self.exec_run(container_id, argv, timeout, capture,
+                                 **kwargs)
+
+        outcomes = utils.run_batch(run, range(len(commands)), max_workers)
+        return [outcomes[index] for index in range(len(commands))]
 
     @utils.response2dict
     def isulad_version(self):
@@ -285,15 +531,10 @@ class Client(object):
         """ Update a container
 
         :param container_id: identifier of container
-        :param kwargs:
+        :param kwargs: fields of isula.isulad.container.HostConfig. An unknown field raises TypeError.
         :return: return the error code and message if update failed, otherwise return the container id.
         """
-        hc_argspec = inspect.getfullargspec(container.HostConfig.__init__).args
-        hc_args = {}
-        for k, v in kwargs.items():
-            if k in hc_argspec:
-                hc_args[k] = v
-        hostconfig = container.HostConfig(**hc_args).to_json()
+        hostconfig = container.build_update_config(kwargs)
 
         return self._container.update(container_id, hostconfig)
 
@@ -338,13 +579,81 @@ class Client(object):
         return self._container.copy_from_container(container_id, runtime,
                                                    srcpath)
 
-    def copy_to_container(self, data):
-        """ Copy data into a container
+    def copy_from_container_reader(self, container_id, srcpath, runtime=None,
+                                   buffer_size=None, progress=None):
+        """ Open the tar archive of data copied from a container as a binary file
 
-        :param data: data to be copied
-        :return: exit status and message
+        :param container_id: identifier of container
+        :param srcpath: path of data to be copied out
+        :param runtime: runtime to use for containers(default: lcr)
+        :param buffer_size(int): the size of the read buffer, default
+            isula.isulad.archive.DEFAULT_BUFFER_SIZE
+        :param progress: called with the bytes received so far and the seconds elapsed
+        :return: io.BufferedReader -- the tar archive, closing it ends the request.
         """
-        return self._container.copy_to_container(data)
+        from isula.isulad import archive
+        return archive.open_chunks(
+            self._container.copy_from_container(container_id, runtime,
+                                                srcpath),
+            buffer_size or archive.DEFAULT_BUFFER_SIZE, progress)
+
+    def copy_from_container_to(self, container_id, srcpath, path, runtime=None,
+                               buffer_size=None, progress=None,
+                               extraction_filter='tar'):
+        """ Copy data from a container to a host directory
+
+        The tar archive is extracted while it is received, so the memory used
+        is bounded by buffer_size whatever the size of the data.
+
+        :param path: the host directory to extract the data to
+        :param extraction_filter: the tarfile extraction filter, see isula.isulad.archive.extract_chunks
+        :return: list -- the names of the extracted files. See copy_from_container_reader for
+            the other parameters.
+        """
+        from isula.isulad import archive
+        return archive.extract_chunks(
+            self._container.copy_from_container(container_id, runtime,
+                                                srcpath),
+            path, buffer_size or archive.DEFAULT_BUFFER_SIZE, progress,
+            extraction_filter)
+
+    def copy_to_container(self, container_id, src_path, dst_path, runtime=None,
+                          rebase_name=None, chunk_size=None, use_mmap=None,
+                          progress=None):
+        """ Copy a host file or directory into a container
+
+        The file or directory is archived while it is sent, in chunks of chunk_size
+        bytes, so the memory used does not depend on its size.
+
+        :param container_id: identifier of container
+        :param src_path: the host file or directory to copy
+        :param dst_path: the destination path in the container
+        :param runtime: runtime to use for containers(default: lcr)
+        :param rebase_name: the name to give to src_path in the container, default its own
+        :param chunk_size(int): the size of the chunks sent, default
+            isula.isulad.archive.DEFAULT_CHUNK_SIZE
+        :param use_mmap(boolean): read the files through mmap, default for big files
+        :param progress: called with the bytes sent so far and the seconds elapsed
+        :return: int -- the number of bytes of the archive sent
+        """
+        from isula.isulad import archive
+        src_path = os.path.abspath(src_path)
+        chunk_size = chunk_size or archive.DEFAULT_CHUNK_SIZE
+        chunks = archive.tar_chunks(src_path, chunk_size=chunk_size,
+                                    use_mmap=use_mmap, progress=progress)
+        sent = [0]
+
+        def count(chunks):
+            for chunk in chunks:
+                sent[0] += len(chunk)
+                yield chunk
+
+        responses = self._container.copy_to_container(
+            container_id, runtime, src_path, os.path.isdir(src_path),
+            rebase_name, dst_path, count(chunks))
+        for _ in responses:
+            pass
+        return sent[0]
 
     @utils.response2dict
     def rename_container(self, oldname, newname):
@@ -376,6 +685,69 @@ class Client(object):
         return self._container.logs(container_id, runtime, since, until,
                                     timestamps, follow, tail, details)
 
+    def save_logs(self, container_id, path, compression=None,
+                  rotate_bytes=None, since=None, until=None, tail=None,
+                  timestamps=False, streams=None, runtime=None):
+        """ Save the logs of a container to files
+
+        The logs are written as they are received, through a buffered writer.
+
+        :param container_id: identifier of container
+        :param path: the path of the file, see isula.isulad.logs.RotatingLogWriter for the rotated ones
+        :param compression: 'gzip', 'zstd' or None, zstd requires the zstandard package
+        :param rotate_bytes(int): the log bytes written to a file before opening the next one
+        :param streams: the streams to save, 'stdout' and/or 'stderr', default both
+        :return: list -- the paths of the files written. See container_logs for the other parameters.
+        """
+        from isula.isulad import logs
+        call = self._container.logs(container_id, runtime, since, until,
+                                    timestamps, False, tail, False)
+        try:
+            return logs.save_logs(call, path, compression, rotate_bytes,
+                                  streams)
+        finally:
+            call.cancel()
+
+    def follow_logs(self, container_ids, streams=None, reorder_window=None,
+                    buffer_size=None, ignore_errors=False, **kwargs):
+        """ Follow the logs of several containers, merged in time order
+
+        :param container_ids(List(string)): identifiers of containers
+        :param streams: the streams to read, 'stdout' and/or 'stderr', default both
+        :param reorder_window(float): seconds an entry waits for older entries of the other
+            containers, default isula.isulad.logs.DEFAULT_REORDER_WINDOW
+        :param buffer_size(int): the maximum number of entries waiting per container, default
+            isula.isulad.logs.DEFAULT_BUFFER_SIZE
+        :param ignore_errors(boolean): only record the errors of the streams in `errors` of
+            the follower, instead of raising them from the iteration
+        :param kwargs: the parameters of container_logs, `follow` defaults to True
+        :return: isula.isulad.logs.LogFollower -- an iterator of LogEntry objects tagged with
+            the container id. Close it to end the requests.
+        """
+        from isula.isulad import logs
+        if reorder_window is None:
+            reorder_window = logs.DEFAULT_REORDER_WINDOW
+        kwargs.setdefault('follow', True)
+        return logs.LogFollower(self, container_ids, streams, reorder_window,
+                                buffer_size or logs.DEFAULT_BUFFER_SIZE,
+                                ignore_errors, **kwargs)
+
+    def container_log_reader(self, container_id, streams=None, runtime=None,
+                             since=None, until=None, timestamps=False,
+                             follow=False, tail=None, details=False):
+        """ Open the logs of a container as a binary file
+
+        :param container_id: identifier of container
+        :param streams: the streams to read, 'stdout' and/or 'stderr', default both
+        :return: isula.isulad.logs.LogReader -- the reader, see container_logs for the
+            other parameters. Closing the reader ends the request.
+        """
+        from isula.isulad import logs
+        return logs.LogReader(
+            self._container.logs(container_id, runtime, since, until,
+                                 timestamps, follow, tail, details),
+            streams)
+
     @utils.response2dict
     def resize_container(self, container_id, suffix=None, height=None,
                          width=None):
@@ -407,6 +779,316 @@ class Client(object):
         """
         return self._cri_runtime.list_containers(query_filter)
 
+    def cri_exec_sync(self, container_id, cmd, timeout=None, deadline=None):
+        """ [CRI] Run a command in a container and wait for its end
+
+        :param container_id: identifier of container
+        :param cmd(List(string)): the command and its arguments
+        :param timeout(float): seconds the runtime lets the command run, default no limit
+        :param deadline(float): seconds after which the call fails with DEADLINE_EXCEEDED,
+            default the timeout plus cri.EXEC_SYNC_DEADLINE_MARGIN
+        :return: isula.isulad.results.ExecResult -- the exit code and the output
+        """
+        if not isinstance(cmd, list):
+            raise TypeError("cmd should be a list")
+        response = self._cri_runtime.exec_sync(container_id, cmd, timeout,
+                                               deadline)
+        from isula.isulad import results
+        return results.ExecResult(container_id, cmd, response.exit_code,
+                                  response.stdout, response.stderr)
+
+    def cri_exec_sync_many(self, cmd, container_ids=None, timeout=None,
+                           deadline=None, query_filter=None,
+                           max_workers=utils.DEFAULT_BATCH_WORKERS):
+        """ [CRI] Run a command in many containers concurrently, see cri_exec_sync
+
+        :param cmd(List(string)): the command and its arguments
+        :param container_ids(List(string)): identifiers of containers, default
+            the CRI containers listed with query_filter
+        :param timeout(float): seconds the runtime lets each command run
+        :param deadline(float): seconds each call may take
+        :param query_filter: the filter of the CRI containers, default the running ones
+        :param max_workers(int): the maximum number of calls in flight
+        :return: dict -- the ExecResult of each container, or the exception raised by its call.
+        """
+        if container_ids is None:
+            response = self._cri_runtime.list_containers(
+                query_filter or self._cri_runtime.RUNNING_FILTER)
+            container_ids = [c.id for c in response.containers]
+
+        def run(container_id):
+            return self.cri_exec_sync(container_id, cmd, timeout, deadline)
+
+        return utils.run_batch(run, container_ids, max_workers)
+
+    @utils.response2dict
+    def cri_run_pod_sandbox(self, config, runtime_handler=None):
+        """ [CRI] Create and start a pod sandbox
+
+        :param config: the PodSandboxConfig, as a dict or an api_pb2.PodSandboxConfig
+        :param runtime_handler(string): the runtime of the sandbox, default the default runtime
+        :return: dict -- the id of the pod sandbox
+        """
+        return self._cri_runtime.run_pod_sandbox(config, runtime_handler)
+
+    @utils.response2dict
+    def cri_stop_pod_sandbox(self, pod_sandbox_id):
+        """ [CRI] Stop a pod sandbox and its containers
+
+        :param pod_sandbox_id: identifier of pod sandbox
+        :return: dict -- an empty dict
+        """
+        return self._cri_runtime.stop_pod_sandbox(pod_sandbox_id)
+
+    @utils.response2dict
+    def cri_remove_pod_sandbox(self, pod_sandbox_id):
+        """ [CRI] Remove a pod sandbox and its containers
+
+        :param pod_sandbox_id: identifier of pod sandbox
+        :return: dict -- an empty dict
+        """
+        return self._cri_runtime.remove_pod_sandbox(pod_sandbox_id)
+
+    @utils.response2dict
+    def cri_pod_sandbox_status(self, pod_sandbox_id, verbose=False):
+        """ [CRI] Get the status of a pod sandbox
+
+        :param pod_sandbox_id: identifier of pod sandbox
+        :param verbose(boolean): return extra information in `info`
+        :return: dict -- the status of the pod sandbox
+        """
+        return self._cri_runtime.pod_sandbox_status(pod_sandbox_id, verbose)
+
+    @utils.response2dict
+    def cri_list_pod_sandbox(self, query_filter=None):
+        """ [CRI] List pod sandboxes
+
+        :param query_filter: the PodSandboxFilter, as a dict or an api_pb2.PodSandboxFilter
+        :return: dict -- list of pod sandboxes' info
+        """
+        return self._cri_runtime.list_pod_sandbox(query_filter)
+
+    @utils.response2dict
+    def cri_create_container(self, pod_sandbox_id, config, sandbox_config):
+        """ [CRI] Create a container in a pod sandbox
+
+        :param pod_sandbox_id: identifier of pod sandbox
+        :param config: the ContainerConfig, as a dict or an api_pb2.ContainerConfig
+        :param sandbox_config: the PodSandboxConfig the sandbox was run with
+        :return: dict -- the id of the container
+        """
+        return self._cri_runtime.create_container(pod_sandbox_id, config,
+                                                  sandbox_config)
+
+    @utils.response2dict
+    def cri_start_container(self, container_id):
+        """ [CRI] Start a created container
+
+        :param container_id: identifier of container
+        :return: dict -- an empty dict
+        """
+        return self._cri_runtime.start_container(container_id)
+
+    @utils.response2dict
+    def cri_stop_container(self, container_id, timeout=0):
+        """ [CRI] Stop a running container
+
+        :param container_id: identifier of container
+        :param timeout(int): seconds to wait before killing the container
+        :return: dict -- an empty dict
+        """
+        return self._cri_runtime.stop_container(container_id, timeout)
+
+    @utils.response2dict
+    def cri_remove_container(self, container_id):
+        """ [CRI] Remove a container
+
+        :param container_id: identifier of container
+        :return: dict -- an empty dict
+        """
+        return self._cri_runtime.remove_container(container_id)
+
+    @utils.response2dict
+    def cri_container_status(self, container_id, verbose=False):
+        """ [CRI] Get the status of a container
+
+        :param container_id: identifier of container
+        :param verbose(boolean): return extra information in `info`
+        :return: dict -- the status of the container
+        """
+        return self._cri_runtime.container_status(container_id, verbose)
+
+    @utils.response2dict
+    def cri_update_container_resources(self, container_id, linux):
+        """ [CRI] Update the resources of a container
+
+        :param container_id: identifier of container
+        :param linux: the LinuxContainerResources, as a dict or an api_pb2.LinuxContainerResources
+        :return: dict -- an empty dict
+        """
+        return self._cri_runtime.update_container_resources(container_id,
+                                                            linux)
+
+    @utils.response2dict
+    def cri_reopen_container_log(self, container_id):
+        """ [CRI] Reopen the log file of a container, after it was rotated
+
+        :param container_id: identifier of container
+        :return: dict -- an empty dict
+        """
+        return self._cri_runtime.reopen_container_log(container_id)
+
+    @utils.response2dict
+    def cri_exec(self, container_id, cmd, tty=False, stdin=False,
+                 stdout=True, stderr=True):
+        """ [CRI] Prepare a streaming endpoint to run a command in a container
+
+        :param container_id: identifier of container
+        :param cmd(List(string)): the command and its arguments
+        :param tty(boolean): allocate a pseudo-TTY
+        :param stdin(boolean): stream the stdin
+        :param stdout(boolean): stream the stdout
+        :param stderr(boolean): stream the stderr
+        :return: dict -- the url of the streaming endpoint
+        """
+        return self._cri_runtime.exec(container_id, cmd, tty, stdin, stdout,
+                                      stderr)
+
+    @utils.response2dict
+    def cri_attach(self, container_id, stdin=False, tty=False, stdout=True,
+                   stderr=True):
+        """ [CRI] Prepare a streaming endpoint to attach to a container
+
+        :param container_id: identifier of container
+        :return: dict -- the url of the streaming endpoint, see cri_exec for the parameters
+        """
+        return self._cri_runtime.attach(container_id, stdin, tty, stdout,
+                                        stderr)
+
+    @utils.response2dict
+    def cri_port_forward(self, pod_sandbox_id, port=None):
+        """ [CRI] Prepare a streaming endpoint to forward ports of a pod sandbox
+
+        :param pod_sandbox_id: identifier of pod sandbox
+        :param port(List(int)): the ports to forward
+        :return: dict -- the url of the streaming endpoint
+        """
+        return self._cri_runtime.port_forward(pod_sandbox_id, port)
+
+    @utils.response2dict
+    def cri_container_stats(self, container_id):
+        """ [CRI] Get the stats of a container
+
+        :param container_id: identifier of container
+        :return: dict -- the stats of the container
+        """
+        return self._cri_runtime.container_stats(container_id)
+
+    @utils.response2dict
+    def cri_list_container_stats(self, query_filter=None):
+        """ [CRI] Get the stats of the containers
+
+        :param query_filter: the ContainerStatsFilter, as a dict or an api_pb2.ContainerStatsFilter
+        :return: dict -- the stats of the containers
+        """
+        return self._cri_runtime.list_container_stats(query_filter)
+
+    @utils.response2dict
+    def cri_update_runtime_config(self, runtime_config):
+        """ [CRI] Update the runtime configuration
+
+        :param runtime_config: the RuntimeConfig, as a dict or an api_pb2.RuntimeConfig
+        :return: dict -- an empty dict
+        """
+        return self._cri_runtime.update_runtime_config(runtime_config)
+
+    @utils.response2dict
+    def cri_runtime_status(self, verbose=False):
+        """ [CRI] Get the status of the runtime
+
+        :param verbose(boolean): return extra information in `info`
+        :return: dict -- the conditions of the runtime
+        """
+        return self._cri_runtime.status(verbose)
+
+    def cri_teardown_pod_sandboxes(self, pod_sandbox_ids,
+                                   max_workers=utils.DEFAULT_BATCH_WORKERS,
+                                   response_mode=None):
+        """ [CRI] Stop and remove pod sandboxes concurrently
+
+        Each sandbox is removed right after it is stopped, by the same worker.
+
+        :param pod_sandbox_ids(List(string)): identifiers of pod sandboxes
+        :param max_workers(int): the maximum number of sandboxes torn down at once
+        :param response_mode: the form of the responses, default as the client response_mode
+        :return: dict -- the RemovePodSandbox response of each sandbox, or the exception raised by its calls.
+        """
+        def teardown(pod_sandbox_id):
+            self._cri_runtime.stop_pod_sandbox(pod_sandbox_id)
+            return self.cri_remove_pod_sandbox(pod_sandbox_id,
+                                               response_mode=response_mode)
+
+        return utils.run_batch(teardown, pod_sandbox_ids, max_workers)
+
+    def cri_run_pod(self, config, container_configs, runtime_handler=None,
+                    start=True, max_workers=utils.DEFAULT_BATCH_WORKERS):
+        """ [CRI] Run a pod sandbox and create and start its containers
+
+        Once the sandbox runs, its containers are created concurrently, each
+        one started as soon as it is created. If a container fails to be
+        created or started, the sandbox is stopped, the containers created
+        are removed with the sandbox, and the error is raised.
+
+        :param config: the PodSandboxConfig, as a dict or an api_pb2.PodSandboxConfig
+        :param container_configs: the ContainerConfig of the containers
+        :param runtime_handler(string): the runtime of the sandbox, default the default runtime
+        :param start(boolean): start the containers once created
+        :param max_workers(int): the maximum number of containers created at once
+        :return: dict -- the `pod_sandbox_id` and, in `containers`, the id of
+            each container, in order
+        """
+        container_configs = list(container_configs)
+        response = self._cri_runtime.run_pod_sandbox(config, runtime_handler)
+        pod_sandbox_id = response.pod_sandbox_id
+        created = []
+
+        def create(index):
+            response = self._cri_runtime.create_container(
+                pod_sandbox_id, container_configs[index], config)
+            created.append(response.container_id)
+            if start:
+                self._cri_runtime.start_container(response.container_id)
+            return response.container_id
+
+        try:
+            outcomes = utils.run_batch(create, range(len(container_configs)),
+                                       max_workers)
+            container_ids = [outcomes[index]
+                             for index in range(len(container_configs))]
+            for outcome in container_ids:
+                if isinstance(outcome, Exception):
+                    raise outcome
+        except BaseException:
+            self._remove_pod(pod_sandbox_id, created)
+            raise
+        return {'pod_sandbox_id': pod_sandbox_id, 'containers': container_ids}
+
+    def _remove_pod(self, pod_sandbox_id, container_ids):
+        # Undo a pod left half run, its own errors giving way to the one
+        # which made it fail.
+        calls = [functools.partial(self._cri_runtime.stop_pod_sandbox,
+                                   pod_sandbox_id)]
+        calls += [functools.partial(self._cri_runtime.remove_container,
+                                    container_id)
+                  for container_id in container_ids]
+        calls.append(functools.partial(self._cri_runtime.remove_pod_sandbox,
+                                       pod_sandbox_id))
+        for call in calls:
+            try:
+                call()
+            except Exception:
+                pass
+
     @utils.response2dict
     def cri_list_images(self, query_filter=None):
         """ [CRI] List images
@@ -1,7 +1,5 @@
 import json
 
-from google.protobuf.json_format import MessageToDict
-
 from isula.isulad_grpc import container_pb2
 
 
@@ -19,6 +17,12 @@ class Container(object):
             request, metadata=[('username', '0'), ('tls_mode', '0')])
         return response
 
+    def create_from_request(self, request):
+        """Create a container from a prebuilt container_pb2.CreateRequest"""
+        response = self.client.Create(
+            request, metadata=[('username', '0'), ('tls_mode', '0')])
+        return response
+
     def start(self, container_id, stdin, attach_stdin, stdout, attach_stdout,
               stderr, attach_stderr):
         request = container_pb2.StartRequest(id=container_id, stdin=stdin,
@@ -31,12 +35,11 @@ class Container(object):
             request, metadata=[('username', '0'), ('tls_mode', '0')])
         return response
 
-    def remote_start(self, container_id, stdin, finish):
-        request = container_pb2.RemoteStartRequest(stdin=stdin, finish=finish)
+    def remote_start(self, container_id, requests, attach_stderr):
         response = self.client.RemoteStart(
-            request, metadata=[('username', '0'), ('tls_mode', '0'), ('container-id', container_id)])
-        for message in response:
-            yield message
+            requests, metadata=remote_start_metadata(container_id,
+                                                     attach_stderr))
+        return response
 
     def top(self, container_id, args):
         request = container_pb2.TopRequest(id=container_id, args=args)
@@ -107,10 +110,10 @@ class Container(object):
     def events(self, container_id, since, until, store_only):
         request = container_pb2.EventsRequest(id=container_id, since=since,
                                               until=until, storeOnly=store_only)
+        # The call object is an iterator of the events which can be cancelled.
         response = self.client.Events(
             request, metadata=[('username', '0'), ('tls_mode', '0')])
-        for message in response:
-            yield MessageToDict(message)
+        return response
 
     def container_exec(self, container_id, tty, open_stdin, attach_stdin,
                        attach_stdout, attach_stderr, stdin, stdout, stderr,
@@ -125,12 +128,14 @@ class Container(object):
             request, metadata=[('username', '0'), ('tls_mode', '0')])
         return response
 
-    def remote_exec(self, cmd, finish):
-        request = container_pb2.RemoteExecRequest(cmd=cmd, finish=finish)
+    def remote_exec(self, container_id, argv, requests, tty, open_stdin,
+                    attach_stdout, attach_stderr, env, user, workdir,
+                    timeout=None):
         response = self.client.RemoteExec(
-            request, metadata=[('username', '0'), ('tls_mode', '0')])
-        for message in response:
-            yield message
+            requests, timeout=timeout, metadata=remote_exec_metadata(
+                container_id, argv, tty, open_stdin, attach_stdout,
+                attach_stderr, env, user, workdir))
+        return response
 
     def version(self):
         request = container_pb2.VersionRequest()
@@ -174,18 +179,24 @@ class Container(object):
     def copy_from_container(self, container_id, runtime, srcpath):
         request = container_pb2.CopyFromContainerRequest(
             id=container_id, runtime=runtime, srcpath=srcpath)
+        # The call object is an iterator of the messages which can be cancelled.
         response = self.client.CopyFromContainer(
             request, metadata=[('username', '0'), ('tls_mode', '0')])
-        for message in response:
-            yield message
+        return response
+
+    def copy_to_container(self, container_id, runtime, src_path, src_is_dir,
+                          src_rebase_name, dst_path, chunks):
+        """Stream a tar archive into a container
 
-    def copy_to_container(self, data):
-        request = container_pb2.CopyToContainerRequest(data=data)
+        :param chunks: the chunks of the tar archive, as bytes
+        """
+        requests = (container_pb2.CopyToContainerRequest(data=chunk)
+                    for chunk in chunks)
         response = self.client.CopyToContainer(
-            request, metadata=[('username', '0'), ('tls_mode', '0'),
-                               ('isulad-copy-to-container', )])
-        for message in response:
-            yield message
+            requests, metadata=copy_to_container_metadata(
+                container_id, runtime, src_path, src_is_dir, src_rebase_name,
+                dst_path))
+        return response
 
     def rename(self, oldname, newname):
         request = container_pb2.RenameRequest(oldname=oldname, newname=newname)
@@ -198,10 +209,10 @@ class Container(object):
         request = container_pb2.LogsRequest(
             id=container_id, runtime=runtime, since=since, until=until,
             timestamps=timestamps, follow=follow, tail=tail, details=details)
+        # The call object is an iterator of the messages which can be cancelled.
         response = self.client.Logs(
             request, metadata=[('username', '0'), ('tls_mode', '0')])
-        for message in response:
-            yield message
+        return response
 
     def resize(self, container_id, suffix, height, width):
         """ Resize a container"""
@@ -212,253 +223,101 @@ class Container(object):
         return response
 
 
-class HostConfig(dict):
-    def __init__(self, VolumesFrom=None, Binds=None, Mounts=None,
-                 NetworkMode='',
-                 GroupAdd=None, IpcMode='', PidMode='',
-                 Privileged=False, SystemContainer=False, NsChangeFiles=None,
-                 UserRemap='', ShmSize=0, AutoRemove=False,
-                 AutoRemoveBak=False, ReadonlyRootfs=False, Tmpfs=None,
-                 UTSMode='', UsernsMode='', Sysctls=None, Runtime='lcr',
-                 RestartPolicy=None, CapAdd=None, CapDrop=None, Dns=None,
-                 DnsOptions=None, DnsSearch=None, ExtraHosts=None,
-                 HookSpec='', CPUShares=0, Memory=0, OomScoreAdj=0,
-                 BlkioWeight=0, BlkioWeightDevice=None,
-                 BlkioDeviceReadBps=None, BlkioDeviceWriteBps=None,
-                 BlkioDeviceReadIops=None, BlkioDeviceWriteIops=None,
-                 NanoCpus=0, CPUPeriod=0,
-                 CPUQuota=0, CPURealtimePeriod=0, CPURealtimeRuntime=0,
-                 CpusetCpus='', CpusetMems='', Devices=None,
-                 DeviceCgroupRules=None, SecurityOpt=None, StorageOpt=None,
-                 KernelMemory=0, MemoryReservation=0, MemorySwap=0,
-                 MemorySwappiness=None, OomKillDisable=False, PidsLimit=None,
-                 FilesLimit=None, Ulimits=None, Hugetlbs=None, HostChannel=None,
-                 EnvTargetFile='', ExternalRootfs='', CgroupParent=''):
-
-        if VolumesFrom:
-            if not isinstance(VolumesFrom, list):
-                raise host_config_type_error('VolumesFrom', VolumesFrom, 'list')
-            self['VolumesFrom'] = VolumesFrom
-
-        if Binds:
-            if not isinstance(Binds, list):
-                raise host_config_type_error('Binds', Binds, 'list')
-            self['Binds'] = Binds
-
-        if Mounts:
-            if not isinstance(Mounts, list):
-                raise host_config_type_error('Mounts', Mounts, 'list')
-            self['Mounts'] = Mounts
-
-        if NetworkMode:
-            self['NetworkMode'] = NetworkMode
-
-        if GroupAdd:
-            if not isinstance(GroupAdd, list):
-                raise host_config_type_error('GroupAdd', GroupAdd, 'list')
-            self['GroupAdd'] = GroupAdd
-
-        if IpcMode:
-            self['IpcMode'] = IpcMode
-        if PidMode:
-            self['PidMode'] = PidMode
-        if Privileged:
-            self['Privileged'] = Privileged
-        if SystemContainer:
-            self['SystemContainer'] = SystemContainer
-
-        if NsChangeFiles:
-            if not isinstance(NsChangeFiles, list):
-                raise host_config_type_error('NsChangeFiles', NsChangeFiles,
-                                             'list')
-            self['NsChangeFiles'] = NsChangeFiles
-
-        if NsChangeFiles:
-            self['NsChangeFiles'] = NsChangeFiles
-        if UserRemap:
-            self['UserRemap'] = UserRemap
-        if ShmSize:
-            self['ShmSize'] = ShmSize
-        if AutoRemove:
-            self['AutoRemove'] = AutoRemove
-        if AutoRemoveBak:
-            self['AutoRemoveBak'] = AutoRemoveBak
-        if ReadonlyRootfs:
-            self['ReadonlyRootfs'] = ReadonlyRootfs
-
-        if Tmpfs:
-            if not isinstance(Tmpfs, dict):
-                raise host_config_type_error('Tmpfs', Tmpfs, 'dict')
-            self['Tmpfs'] = Tmpfs
-
-        if UTSMode:
-            self['UTSMode'] = UTSMode
-        if UsernsMode:
-            self['UsernsMode'] = UsernsMode
-
-        if Sysctls:
-            if not isinstance(Sysctls, dict):
-                raise host_config_type_error('Sysctls', Sysctls, 'dict')
-            self['Sysctls'] = Sysctls
-
-        if Runtime:
-            self['Runtime'] = Runtime
-
-        if RestartPolicy:
-            if not isinstance(RestartPolicy, dict):
-                raise host_config_type_error('RestartPolicy', RestartPolicy,
-                                             'dict')
-            self['RestartPolicy'] = RestartPolicy
-
-        if CapAdd:
-            if not isinstance(CapAdd, list):
-                raise host_config_type_error('CapAdd', CapAdd, 'list')
-            self['CapAdd'] = CapAdd
-
-        if CapDrop:
-            if not isinstance(CapDrop, list):
-                raise host_config_type_error('CapDrop', CapDrop, 'list')
-            self['CapDrop'] = CapDrop
-
-        if Dns:
-            if not isinstance(Dns, list):
-                raise host_config_type_error('Dns', Dns, 'list')
-            self['Dns'] = Dns
-
-        if DnsOptions:
-            if not isinstance(DnsOptions, list):
-                raise host_config_type_error('DnsOptions', DnsOptions, 'list')
-            self['DnsOptions'] = DnsOptions
-
-        if DnsSearch:
-            if not isinstance(DnsSearch, list):
-                raise host_config_type_error('DnsSearch', DnsSearch, 'list')
-            self['DnsSearch'] = DnsSearch
-
-        if ExtraHosts:
-            if not isinstance(ExtraHosts, list):
-                raise host_config_type_error('ExtraHosts', ExtraHosts, 'list')
-            self['ExtraHosts'] = ExtraHosts
-
-        if HookSpec:
-            self['HookSpec'] = HookSpec
-        if CPUShares:
-            self['CPUShares'] = CPUShares
-        if Memory:
-            self['Memory'] = Memory
-        if OomScoreAdj:
-            self['OomScoreAdj'] = OomScoreAdj
-        if BlkioWeight:
-            self['BlkioWeight'] = BlkioWeight
-
-        if BlkioWeightDevice:
-            if not isinstance(BlkioWeightDevice, list):
-                raise host_config_type_error('BlkioWeightDevice',
-                                             BlkioWeightDevice, 'list')
-            self['BlkioWeightDevice'] = BlkioWeightDevice
-
-        if BlkioDeviceReadBps:
-            if not isinstance(BlkioDeviceReadBps, list):
-                raise host_config_type_error('BlkioDeviceReadBps',
-                                             BlkioDeviceReadBps, 'list')
-            self['BlkioDeviceReadBps'] = BlkioDeviceReadBps
-
-        if BlkioDeviceWriteBps:
-            if not isinstance(BlkioDeviceWriteBps, list):
-                raise host_config_type_error('BlkioDeviceWriteBps',
-                                             BlkioDeviceWriteBps, 'list')
-            self['BlkioDeviceWriteBps'] = BlkioDeviceWriteBps
-
-        if BlkioDeviceReadIops:
-            if not isinstance(BlkioDeviceReadIops, list):
-                raise host_config_type_error('BlkioDeviceReadIops',
-                                             BlkioDeviceReadIops, 'list')
-            self['BlkioDeviceReadIops'] = BlkioDeviceReadIops
-
-        if BlkioDeviceWriteIops:
-            if not isinstance(BlkioDeviceWriteIops, list):
-                raise host_config_type_error('BlkioDeviceWriteIops',
-                                             BlkioDeviceWriteIops, 'list')
-            self['BlkioDeviceWriteIops'] = BlkioDeviceWriteIops
-
-        if NanoCpus:
-            self['NanoCpus'] = NanoCpus
-        if CPUPeriod:
-            self['CPUPeriod'] = CPUPeriod
-        if CPUQuota:
-            self['CPUQuota'] = CPUQuota
-        if CPURealtimePeriod:
-            self['CPURealtimePeriod'] = CPURealtimePeriod
-        if CPURealtimeRuntime:
-            self['CPURealtimeRuntime'] = CPURealtimeRuntime
-        if CpusetCpus:
-            self['CpusetCpus'] = CpusetCpus
-        if CpusetMems:
-            self['CpusetMems'] = CpusetMems
-
-        if Devices:
-            if not isinstance(Devices, list):
-                raise host_config_type_error('Devices',
-                                             Devices, 'list')
-            self['Devices'] = Devices
-
-        if DeviceCgroupRules:
-            if not isinstance(DeviceCgroupRules, list):
-                raise host_config_type_error('DeviceCgroupRules',
-                                             DeviceCgroupRules, 'list')
-            self['DeviceCgroupRules'] = DeviceCgroupRules
-
-        if SecurityOpt:
-            if not isinstance(SecurityOpt, list):
-                raise host_config_type_error('SecurityOpt',
-                                             SecurityOpt, 'list')
-            self['SecurityOpt'] = SecurityOpt
-
-        if StorageOpt:
-            if not isinstance(StorageOpt, dict):
-                raise host_config_type_error('StorageOpt', StorageOpt, 'dict')
-            self['StorageOpt'] = StorageOpt
-
-        if KernelMemory:
-            self['KernelMemory'] = KernelMemory
-        if MemoryReservation:
-            self['MemoryReservation'] = MemoryReservation
-        if MemorySwap:
-            self['MemorySwap'] = MemorySwap
-        if MemorySwappiness:
-            self['MemorySwappiness'] = MemorySwappiness
-        if OomKillDisable:
-            self['OomKillDisable'] = OomKillDisable
-        if PidsLimit:
-            if not isinstance('PidsLimit', PidsLimit, int):
-                raise host_config_type_error('PidsLimit', PidsLimit, 'int')
-            self['PidsLimit'] = PidsLimit
-        if FilesLimit:
-            if not isinstance('FilesLimit', FilesLimit, int):
-                raise host_config_type_error('FilesLimit', FilesLimit, 'int')
-            self['FilesLimit'] = FilesLimit
-
-        if Ulimits:
-            if not isinstance(Ulimits, list):
-                raise host_config_type_error('Ulimits', Ulimits, 'list')
-            self['Ulimits'] = Ulimits
-
-        if Hugetlbs:
-            if not isinstance(Hugetlbs, list):
-                raise host_config_type_error('Hugetlbs', Hugetlbs, 'list')
-            self['Hugetlbs'] = Hugetlbs
-
-        if HostChannel:
-            if not isinstance(HostChannel, dict):
-                raise host_config_type_error('HostChannel', HostChannel, 'dict')
-            self['HostChannel'] = HostChannel
-
-        if EnvTargetFile:
-            self['EnvTargetFile'] = EnvTargetFile
-        if ExternalRootfs:
-            self['ExternalRootfs'] = ExternalRootfs
-        if CgroupParent:
-            self['CgroupParent'] = CgroupParent
+def remote_start_metadata(container_id, attach_stderr):
+    """Build the metadata of a RemoteStart call"""
+    return [('username', '0'), ('tls_mode', '0'),
+            ('container-id', container_id),
+            ('attach-stderr', 'true' if attach_stderr else 'false')]
+
+
+def remote_exec_metadata(container_id, argv, tty, open_stdin, attach_stdout,
+                         attach_stderr, env, user, workdir):
+    """Build the metadata of a RemoteExec call
+
+    iSulad reads the command to run from the isulad-remote-exec metadata,
+    as the JSON of an exec request.
+    """
+    exec_info = json.dumps({'container_id': container_id, 'argv': argv,
+                            'tty': tty, 'open_stdin': open_stdin,
+                            'attach_stdin': open_stdin,
+                            'attach_stdout': attach_stdout,
+                            'attach_stderr': attach_stderr,
+                            'env': env or [], 'user': user or '',
+                            'workdir': workdir or ''})
+    return [('username', '0'), ('tls_mode', '0'),
+            ('isulad-remote-exec', exec_info)]
+
+
+def copy_to_container_metadata(container_id, runtime, src_path, src_is_dir,
+                               src_rebase_name, dst_path):
+    """Build the metadata of a CopyToContainer call
+
+    iSulad reads where the archive comes from and where to extract it from
+    the isulad-copy-to-container metadata, as JSON.
+    """
+    copy_info = json.dumps({'id': container_id, 'runtime': runtime or '',
+                            'srcPath': src_path, 'srcIsDir': src_is_dir,
+                            'srcRebaseName': src_rebase_name or '',
+                            'dstPath': dst_path})
+    return [('username', '0'), ('tls_mode', '0'),
+            ('isulad-copy-to-container', copy_info)]
+
+
+class ConfigField(object):
+    """A field of a container config.
+
+    :param name(string): the keyword argument of the config class
+    :param types: the accepted type(s) checked with isinstance. A bool is
+        only accepted by a field declaring bool, not by an int field.
+    :param default: the value used when the argument is not given
+    :param key(string): the JSON key, default as the name
+    """
+    __slots__ = ('name', 'key', 'types', 'default', 'type_names')
+
+    def __init__(self, name, types, default=None, key=None):
+        self.name = name
+        self.key = key or name
+        self.types = types if isinstance(types, tuple) else (types,)
+        self.default = default
+        self.type_names = ' or '.join(t.__name__ for t in self.types)
+
+    def check(self, value):
+        """Raise TypeError unless the value has one of the field types"""
+        if (not isinstance(value, self.types)
+                or (isinstance(value, bool) and bool not in self.types)):
+            raise host_config_type_error(self.name, value, self.type_names)
+
+
+class _SchemaConfig(dict):
+    """A config dict built from a table of ConfigField.
+
+    The names of the given arguments are checked against the table, an
+    unknown one raises TypeError, and so does a value of another type than
+    its field. Like the defaults, falsy values are left out of the JSON.
+    """
+    fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields_by_name = dict((f.name, f) for f in cls.fields)
+        cls._default_items = tuple((f.name, f.key, f.default)
+                                   for f in cls.fields if f.default)
+
+    def __init__(self, **kwargs):
+        fields_by_name = self._fields_by_name
+        for name, value in kwargs.items():
+            field = fields_by_name.get(name)
+            if field is None:
+                raise TypeError('%s got an unexpected keyword argument %r'
+                                % (type(self).__name__, name))
+            if value is None:
+                continue
+            field.check(value)
+            if value:
+                self[field.key] = value
+        for name, key, default in self._default_items:
+            if name not in kwargs:
+                self[key] = default
 
     def to_json(self):
         return json.dumps(self)
@@ -469,48 +328,189 @@ def host_config_type_error(param, param_value, expected):
     return TypeError(error_msg.format(param, expected, type(param_value)))
 
 
-class ContainerConfig(dict):
-    def __init__(self, container_id=None, name=None, pid=None, status=None,
-                 image=None, imageRef=None, command=None, ram=None, swap=None,
-                 exit_code=None, restartcount=None, Created=None, startat=None,
-                 finishat=None, runtime=None, HealthState=None, Labels=None,
-                 Annotations=None):
-        if container_id:
-            self['id'] = container_id
-        if name:
-            self['name'] = name
-        if pid:
-            self['pid'] = pid
-        if status:
-            self['status'] = status
-        if image:
-            self['image'] = image
-        if imageRef:
-            self['imageRef'] = imageRef
-        if command:
-            self['command'] =command
-        if ram:
-            self['ram'] = ram
-        if swap:
-            self['swap'] = swap
-        if exit_code:
-            self['exit_code'] = exit_code
-        if restartcount:
-            self['restartcount'] = restartcount
-        if Created:
-            self['Created'] = Created
-        if startat:
-            self['startat'] = startat
-        if finishat:
-            self['finishat'] = finishat
-        if runtime:
-            self['runtime'] = runtime
-        if HealthState:
-            self['HealthState'] = HealthState
-        if Labels:
-            self['Labels'] = Labels
-        if Annotations:
-            self['Annotations'] = Annotations
-
-    def to_json(self):
-        return json.dumps(self)
+class HostConfig(_SchemaConfig):
+    fields = (
+        ConfigField('VolumesFrom', list),
+        ConfigField('Binds', list),
+        ConfigField('Mounts', list),
+        ConfigField('NetworkMode', str),
+        ConfigField('GroupAdd', list),
+        ConfigField('IpcMode', str),
+        ConfigField('PidMode', str),
+        ConfigField('Privileged', bool),
+        ConfigField('SystemContainer', bool),
+        ConfigField('NsChangeFiles', list),
+        ConfigField('UserRemap', str),
+        ConfigField('ShmSize', int),
+        ConfigField('AutoRemove', bool),
+        ConfigField('AutoRemoveBak', bool),
+        ConfigField('ReadonlyRootfs', bool),
+        ConfigField('Tmpfs', dict),
+        ConfigField('UTSMode', str),
+        ConfigField('UsernsMode', str),
+        ConfigField('Sysctls', dict),
+        ConfigField('Runtime', str, default='lcr'),
+        ConfigField('RestartPolicy', dict),
+        ConfigField('CapAdd', list),
+        ConfigField('CapDrop', list),
+        ConfigField('Dns', list),
+        ConfigField('DnsOptions', list),
+        ConfigField('DnsSearch', list),
+        ConfigField('ExtraHosts', list),
+        ConfigField('HookSpec', str),
+        ConfigField('CPUShares', int),
+        ConfigField('Memory', int),
+        ConfigField('OomScoreAdj', int),
+        ConfigField('BlkioWeight', int),
+        ConfigField('BlkioWeightDevice', list),
+        ConfigField('BlkioDeviceReadBps', list),
+        ConfigField('BlkioDeviceWriteBps', list),
+        ConfigField('BlkioDeviceReadIops', list),
+        ConfigField('BlkioDeviceWriteIops', list),
+        ConfigField('NanoCpus', int),
+        ConfigField('CPUPeriod', int),
+        ConfigField('CPUQuota', int),
+        ConfigField('CPURealtimePeriod', int),
+        ConfigField('CPURealtimeRuntime', int),
+        ConfigField('CpusetCpus', str),
+        ConfigField('CpusetMems', str),
+        ConfigField('Devices', list),
+        ConfigField('DeviceCgroupRules', list),
+        ConfigField('SecurityOpt', list),
+        ConfigField('StorageOpt', dict),
+        ConfigField('KernelMemory', int),
+        ConfigField('MemoryReservation', int),
+        ConfigField('MemorySwap', int),
+        ConfigField('MemorySwappiness', int),
+        ConfigField('OomKillDisable', bool),
+        ConfigField('PidsLimit', int),
+        ConfigField('FilesLimit', int),
+        ConfigField('Ulimits', list),
+        ConfigField('Hugetlbs', list),
+        ConfigField('HostChannel', dict),
+        ConfigField('EnvTargetFile', str),
+        ConfigField('ExternalRootfs', str),
+        ConfigField('CgroupParent', str),
+    )
+
+
+class ContainerConfig(_SchemaConfig):
+    fields = (
+        ConfigField('container_id', str, key='id'),
+        ConfigField('name', str),
+        ConfigField('pid', int),
+        ConfigField('status', str),
+        ConfigField('image', str),
+        ConfigField('imageRef', str),
+        ConfigField('command', str),
+        ConfigField('ram', (int, float)),
+        ConfigField('swap', (int, float)),
+        ConfigField('exit_code', int),
+        ConfigField('restartcount', int),
+        ConfigField('Created', int),
+        ConfigField('startat', str),
+        ConfigField('finishat', str),
+        ConfigField('runtime', str),
+        ConfigField('HealthState', str),
+        ConfigField('Labels', dict),
+        ConfigField('Annotations', dict),
+    )
+
+
+# The keyword arguments accepted by HostConfig and ContainerConfig.
+HOST_CONFIG_FIELDS = frozenset(f.name for f in HostConfig.fields)
+CONTAINER_CONFIG_FIELDS = frozenset(f.name for f in ContainerConfig.fields)
+
+
+def build_create_configs(kwargs):
+    """Build the hostconfig and customconfig JSON of a container to create
+
+    :param kwargs(dict): HostConfig and ContainerConfig fields, a field
+        accepted by both is passed to both
+    :returns: tuple -- (hostconfig, customconfig) JSON strings
+    """
+    host_config, container_config = _build_create_config_dicts(kwargs)
+    return host_config.to_json(), container_config.to_json()
+
+
+def _build_create_config_dicts(kwargs):
+    unknown = kwargs.keys() - HOST_CONFIG_FIELDS - CONTAINER_CONFIG_FIELDS
+    if unknown:
+        raise TypeError('Unknown container config fields: %s'
+                        % ', '.join(sorted(unknown)))
+    hc_args = {}
+    cc_args = {}
+    for k, v in kwargs.items():
+        if k in HOST_CONFIG_FIELDS:
+            hc_args[k] = v
+        if k in CONTAINER_CONFIG_FIELDS:
+            cc_args[k] = v
+    return HostConfig(**hc_args), ContainerConfig(**cc_args)
+
+
+def build_update_config(kwargs):
+    """Build the hostconfig JSON to update a container with
+
+    :param kwargs(dict): HostConfig fields
+    :returns: string -- the hostconfig JSON
+    """
+    unknown = kwargs.keys() - HOST_CONFIG_FIELDS
+    if unknown:
+        raise TypeError('Unknown host config fields: %s'
+                        % ', '.join(sorted(unknown)))
+    return HostConfig(**kwargs).to_json()
+
+
+class ContainerTemplate(object):
+    """A profile to create many containers from.
+
+    The configs are built, with the checks of HostConfig and ContainerConfig,
+    and serialized once, into a prototype CreateRequest which is copied for
+    each container. The name, labels and binds can still be set per
+    container, which only serializes the config they belong to again.
+
+    :param image(string): image used for creating the containers
+    :param rootfs(string): rootfs used for running the containers
+    :param runtime(string): runtime to use for the containers (default: lcr)
+    :param kwargs: fields of HostConfig and ContainerConfig, see
+        isula.isulad.client.Client.create_container
+    """
+    def __init__(self, image, rootfs=None, runtime='lcr', **kwargs):
+        self.image = image
+        self.rootfs = rootfs
+        self.runtime = runtime
+        self.host_config, self.container_config = \
+            _build_create_config_dicts(kwargs)
+        self.prototype = container_pb2.CreateRequest(
+            image=image, rootfs=rootfs, runtime=runtime,
+            hostconfig=self.host_config.to_json(),
+            customconfig=self.container_config.to_json())
+
+    def request(self, container_id, name=None, labels=None, binds=None):
+        """Build the CreateRequest of a container
+
+        :param container_id(string): identifier of the container
+        :param name(string): name of the container, replacing the template one
+        :param labels(dict): labels added to the template ones
+        :param binds(list): binds added to the template ones
+        :returns: container_pb2.CreateRequest -- the request
+        """
+        request = container_pb2.CreateRequest()
+        request.CopyFrom(self.prototype)
+        request.id = container_id
+        if name or labels:
+            config = dict(self.container_config)
+            if name:
+                config['name'] = name
+            if labels:
+                if not isinstance(labels, dict):
+                    raise host_config_type_error('Labels', labels, 'dict')
+                config['Labels'] = dict(config.get('Labels', ()), **labels)
+            request.customconfig = json.dumps(config)
+        if binds:
+            if not isinstance(binds, list):
+                raise host_config_type_error('Binds', binds, 'list')
+            config = dict(self.host_config)
+            config['Binds'] = config.get('Binds', []) + binds
+            request.hostconfig = json.dumps(config)
+        return request
@@ -1,7 +1,25 @@
+import math
+
 from isula.isulad_grpc import api_pb2
 
 
+# Seconds the deadline of an ExecSync call leaves after the timeout of the
+# command, so the runtime reports the timeout rather than gRPC.
+EXEC_SYNC_DEADLINE_MARGIN = 2.0
+
+
+def exec_sync_deadline(timeout, deadline=None):
+    """The deadline of an ExecSync call, in seconds, None for no deadline"""
+    if deadline is None and timeout:
+        deadline = timeout + EXEC_SYNC_DEADLINE_MARGIN
+    return deadline
+
+
 class CRIRuntime(object):
+    # The filter of the running containers.
+    RUNNING_FILTER = api_pb2.ContainerFilter(
+        state=api_pb2.ContainerStateValue(state=api_pb2.CONTAINER_RUNNING))
+
     def __init__(self, client):
         self.client = client
 
@@ -11,12 +29,152 @@ class CRIRuntime(object):
         response = self.client.Version(request)
         return response
 
+    def run_pod_sandbox(self, config, runtime_handler):
+        """Create and start a pod sandbox"""
+        request = api_pb2.RunPodSandboxRequest(config=config,
+                                               runtime_handler=runtime_handler)
+        response = self.client.RunPodSandbox(request)
+        return response
+
+    def stop_pod_sandbox(self, pod_sandbox_id):
+        """Stop a pod sandbox and its containers"""
+        request = api_pb2.StopPodSandboxRequest(pod_sandbox_id=pod_sandbox_id)
+        response = self.client.StopPodSandbox(request)
+        return response
+
+    def remove_pod_sandbox(self, pod_sandbox_id):
+        """Remove a stopped pod sandbox and its containers"""
+        request = api_pb2.RemovePodSandboxRequest(
+            pod_sandbox_id=pod_sandbox_id)
+        response = self.client.RemovePodSandbox(request)
+        return response
+
+    def pod_sandbox_status(self, pod_sandbox_id, verbose):
+        """Get the status of a pod sandbox"""
+        request = api_pb2.PodSandboxStatusRequest(
+            pod_sandbox_id=pod_sandbox_id, verbose=verbose)
+        response = self.client.PodSandboxStatus(request)
+        return response
+
+    def list_pod_sandbox(self, query_filter):
+        """Get list of pod sandboxes"""
+        request = api_pb2.ListPodSandboxRequest(filter=query_filter)
+        response = self.client.ListPodSandbox(request)
+        return response
+
+    def create_container(self, pod_sandbox_id, config, sandbox_config):
+        """Create a container in a pod sandbox"""
+        request = api_pb2.CreateContainerRequest(pod_sandbox_id=pod_sandbox_id,
+                                                 config=config,
+                                                 sandbox_config=sandbox_config)
+        response = self.client.CreateContainer(request)
+        return response
+
+    def start_container(self, container_id):
+        """Start a created container"""
+        request = api_pb2.StartContainerRequest(container_id=container_id)
+        response = self.client.StartContainer(request)
+        return response
+
+    def stop_container(self, container_id, timeout):
+        """Stop a running container"""
+        request = api_pb2.StopContainerRequest(container_id=container_id,
+                                               timeout=timeout)
+        response = self.client.StopContainer(request)
+        return response
+
+    def remove_container(self, container_id):
+        """Remove a container"""
+        request = api_pb2.RemoveContainerRequest(container_id=container_id)
+        response = self.client.RemoveContainer(request)
+        return response
+
     def list_containers(self, query_filter):
         """Get list of containers"""
         request = api_pb2.ListContainersRequest(filter=query_filter)
         response = self.client.ListContainers(request)
         return response
 
+    def container_status(self, container_id, verbose):
+        """Get the status of a container"""
+        request = api_pb2.ContainerStatusRequest(container_id=container_id,
+                                                 verbose=verbose)
+        response = self.client.ContainerStatus(request)
+        return response
+
+    def update_container_resources(self, container_id, linux):
+        """Update the linux resources of a container"""
+        request = api_pb2.UpdateContainerResourcesRequest(
+            container_id=container_id, linux=linux)
+        response = self.client.UpdateContainerResources(request)
+        return response
+
+    def reopen_container_log(self, container_id):
+        """Reopen the log file of a container"""
+        request = api_pb2.ReopenContainerLogRequest(container_id=container_id)
+        response = self.client.ReopenContainerLog(request)
+        return response
+
+    def exec_sync(self, container_id, cmd, timeout, deadline):
+        """Run a command in a container synchronously
+
+        :param timeout(float): seconds the runtime lets the command run, rounded up
+        :param deadline(float): seconds the call may take, see exec_sync_deadline
+        """
+        request = api_pb2.ExecSyncRequest(
+            container_id=container_id, cmd=cmd,
+            timeout=int(math.ceil(timeout)) if timeout else 0)
+        response = self.client.ExecSync(
+            request, timeout=exec_sync_deadline(timeout, deadline))
+        return response
+
+    def exec(self, container_id, cmd, tty, stdin, stdout, stderr):
+        """Prepare a streaming endpoint to run a command in a container"""
+        request = api_pb2.ExecRequest(container_id=container_id, cmd=cmd,
+                                      tty=tty, stdin=stdin, stdout=stdout,
+                                      stderr=stderr)
+        response = self.client.Exec(request)
+        return response
+
+    def attach(self, container_id, stdin, tty, stdout, stderr):
+        """Prepare a streaming endpoint to attach to a container"""
+        request = api_pb2.AttachRequest(container_id=container_id, stdin=stdin,
+                                        tty=tty, stdout=stdout, stderr=stderr)
+        response = self.client.Attach(request)
+        return response
+
+    def port_forward(self, pod_sandbox_id, port):
+        """Prepare a streaming endpoint to forward ports of a pod sandbox"""
+        request = api_pb2.PortForwardRequest(pod_sandbox_id=pod_sandbox_id,
+                                             port=port)
+        response = self.client.PortForward(request)
+        return response
+
+    def container_stats(self, container_id):
+        """Get the stats of a container"""
+        request = api_pb2.ContainerStatsRequest(container_id=container_id)
+        response = self.client.ContainerStats(request)
+        return response
+
+    def list_container_stats(self, query_filter):
+        """Get the stats of the containers"""
+        request = api_pb2.ListContainerStatsRequest(filter=query_filter)
+        response = self.client.ListContainerStats(request)
+        return response
+
+    def update_runtime_config(self, runtime_config):
+        """Update the runtime configuration"""
+        request = api_pb2.UpdateRuntimeConfigRequest(
+            runtime_config=runtime_config)
+        response = self.client.UpdateRuntimeConfig(request)
+        return response
+
+    def status(self, verbose):
+        """Get the status of the runtime"""
+        request = api_pb2.StatusRequest(verbose=verbose)
+        response = self.client.Status(request)
+        return response
+
 
 class CRIImage(object):
     def __init__(self, client):
@@ -0,0 +1,503 @@
+"""A managed subscription to the container events of iSulad.
+
+Client.container_events is a single Events call: it blocks until the next
+event and ends with the first channel error. EventSubscription reads the
+events in a background thread instead, opens the stream again when it
+breaks, from the timestamp of the last event received, and skips the events
+replayed twice. Each consumer gets its own bounded EventQueue, so several
+consumers share one stream.
+
+example:
+    import isula
+    from isula.isulad import events
+
+    client = isula.init_isulad_client()
+    subscription = events.EventSubscription(client)
+    queue = subscription.subscribe(maxsize=256,
+                                   overflow=events.OVERFLOW_DROP_OLDEST)
+    subscription.start()
+    for event in queue:
+        print(event.id, event.opt)
+"""
+import asyncio
+import collections
+import queue
+import threading
+import time
+
+from google.protobuf import timestamp_pb2
+import grpc
+
+from isula import utils
+
+
+# What EventQueue.put does when the queue is full: wait for the consumer,
+# drop the oldest event, or keep only the latest event of each container.
+OVERFLOW_BLOCK = 'block'
+OVERFLOW_DROP_OLDEST = 'drop-oldest'
+OVERFLOW_COALESCE = 'coalesce'
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_COALESCE)
+
+DEFAULT_QUEUE_SIZE = 1024
+# Number of recent events remembered to recognize the replayed ones.
+DEDUP_WINDOW = 1024
+
+
+def event_action(event):
+    """Get the action of an Event message, like 'start' or 'exec_die'"""
+    return event.opt.split(':', 1)[0].strip()
+
+
+def event_filter(opts=None, id_prefix=None, annotations=None):
+    """Build a predicate selecting container_pb2.Event messages
+
+    The predicate reads the fields of the raw message, so the events it
+    rejects are never converted.
+
+    :param opts(List(string)): the actions to keep, like ['die', 'oom']
+    :param id_prefix(string): the prefix of the identifiers of the containers to keep
+    :param annotations(dict): the annotations the events must have, a None
+        value only requires the key
+    :returns: function -- the predicate, True for the events to keep
+    """
+    if isinstance(opts, str):
+        opts = (opts,)
+    opts = frozenset(opts) if opts else None
+    annotations = dict(annotations) if annotations else None
+
+    def predicate(event):
+        if id_prefix and not event.id.startswith(id_prefix):
+            return False
+        if opts is not None and event_action(event) not in opts:
+            return False
+        if annotations is not None:
+            event_annotations = event.annotations
+            for key, value in annotations.items():
+                if key not in event_annotations:
+                    return False
+                if value is not None and event_annotations[key] != value:
+                    return False
+        return True
+
+    return predicate
+
+
+_END = object()
+# Seconds the reader thread of batch_events waits on a full queue before
+# checking whether the batches were closed.
+_PUT_INTERVAL = 0.1
+
+
+def batch_events(events, max_count=None, window=None, call=None):
+    """Group the events of a stream into lists
+
+    A batch is yielded once it holds max_count events, or window seconds
+    after its first event arrived, whichever comes first. With a window the
+    stream is read in a separate thread, so a batch is not held back by a
+    quiet stream.
+
+    :param events: the iterable of events
+    :param max_count(int): the maximum number of events in a batch
+    :param window(float): the maximum seconds a batch waits for more events
+    :param call: the gRPC call of the stream, cancelled when the batches are closed
+    :returns: Iterable -- the lists of events
+    """
+    if not max_count and window is None:
+        raise ValueError("max_count or window is required to batch events")
+    closed = threading.Event()
+    try:
+        if window is None:
+            batch = []
+            for event in events:
+                batch.append(event)
+                if len(batch) >= max_count:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+            return
+
+        pending = queue.Queue(maxsize=max_count or DEFAULT_QUEUE_SIZE)
+
+        def put(item):
+            # Give up once the batches are closed, instead of waiting
+            # forever for a consumer that is gone.
+            while not closed.is_set():
+                try:
+                    pending.put(item, timeout=_PUT_INTERVAL)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def read():
+            try:
+                for event in events:
+                    if not put(event):
+                        return
+            except Exception as e:
+                put(e)
+            else:
+                put(_END)
+
+        threading.Thread(target=read, daemon=True).start()
+        batch = []
+        deadline = None
+        while True:
+            try:
+                timeout = None
+                if deadline is not None:
+                    timeout = max(0.0, deadline - time.monotonic())
+                item = pending.get(timeout=timeout)
+            except queue.Empty:
+                yield batch
+                batch, deadline = [], None
+                continue
+            if item is _END:
+                break
+            if isinstance(item, Exception):
+                raise item
+            if not batch:
+                deadline = time.monotonic() + window
+            batch.append(item)
+            if max_count and len(batch) >= max_count:
+                yield batch
+                batch, deadline = [], None
+        if batch:
+            yield batch
+    finally:
+        closed.set()
+        if call is not None:
+            call.cancel()
+
+
+async def abatch_events(events, max_count=None, window=None):
+    """Group the events of an async stream into lists, see batch_events"""
+    if not max_count and window is None:
+        raise ValueError("max_count or window is required to batch events")
+    loop = asyncio.get_running_loop()
+    iterator = events.__aiter__()
+    batch = []
+    deadline = None
+    pending = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            timeout = None
+            if deadline is not None:
+                timeout = max(0.0, deadline - loop.time())
+            # Unlike wait_for, wait does not cancel the read on timeout.
+            done, _ = await asyncio.wait((pending,), timeout=timeout)
+            if not done:
+                yield batch
+                batch, deadline = [], None
+                continue
+            try:
+                event = pending.result()
+            except StopAsyncIteration:
+                pending = None
+                break
+            pending = None
+            if not batch and window is not None:
+                deadline = loop.time() + window
+            batch.append(event)
+            if max_count and len(batch) >= max_count:
+                yield batch
+                batch, deadline = [], None
+        if batch:
+            yield batch
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+class EventQueue(object):
+    """A bounded queue of container_pb2.Event messages for one consumer.
+
+    With the 'block' overflow policy a full queue makes the subscription
+    wait, which holds the events of every consumer back. 'drop-oldest'
+    drops the oldest event instead. 'coalesce' replaces the queued event of
+    the same container, keeping its place in the queue, and drops the
+    oldest event when the queue is full of other containers. The number of
+    events dropped or replaced is counted in `dropped`.
+
+    :param maxsize(int): the maximum number of queued events
+    :param overflow(string): the overflow policy, one of OVERFLOW_POLICIES
+    :param response_mode: the form the events are returned in, default raw messages
+    :param event_filter: a predicate called with each raw event, the events
+        it rejects are not queued. See event_filter.
+    """
+    def __init__(self, maxsize=DEFAULT_QUEUE_SIZE, overflow=OVERFLOW_BLOCK,
+                 response_mode=utils.RESPONSE_RAW, event_filter=None):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError("Invalid overflow policy %r, it should be one of %s"
+                             % (overflow, ', '.join(OVERFLOW_POLICIES)))
+        if maxsize < 1:
+            raise ValueError("maxsize should be at least 1")
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.response_mode = utils.check_response_mode(response_mode)
+        self.event_filter = event_filter
+        self.dropped = 0
+        if overflow == OVERFLOW_COALESCE:
+            self._events = collections.OrderedDict()
+        else:
+            self._events = collections.deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._error = None
+
+    def __len__(self):
+        return len(self._events)
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def put(self, event):
+        """Queue an event following the overflow policy
+
+        :returns: boolean -- False if the queue is closed
+        """
+        if self.event_filter is not None and not self.event_filter(event):
+            return not self._closed
+        with self._condition:
+            if self._closed:
+                return False
+            events = self._events
+            if self.overflow == OVERFLOW_COALESCE:
+                if event.id in events:
+                    self.dropped += 1
+                elif len(events) >= self.maxsize:
+                    events.popitem(last=False)
+                    self.dropped += 1
+                events[event.id] = event
+            elif self.overflow == OVERFLOW_DROP_OLDEST:
+                if len(events) >= self.maxsize:
+                    events.popleft()
+                    self.dropped += 1
+                events.append(event)
+            else:
+                while len(events) >= self.maxsize and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return False
+                events.append(event)
+            self._condition.notify_all()
+            return True
+
+    def get(self, timeout=None):
+        """Get the next event
+
+        :param timeout(float): seconds to wait for an event, default forever
+        :returns: the event, or None once the queue is closed and empty
+        :raises queue.Empty: no event arrived within the timeout
+        :raises: the error the queue was closed with, once it is empty
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while not self._events:
+                if self._closed:
+                    if self._error is not None:
+                        raise self._error
+                    return None
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise queue.Empty
+                self._condition.wait(remaining)
+            if self.overflow == OVERFLOW_COALESCE:
+                event = self._events.popitem(last=False)[1]
+            else:
+                event = self._events.popleft()
+            self._condition.notify_all()
+        return utils.convert_response(event, self.response_mode)
+
+    def close(self, error=None):
+        """Stop accepting events, the queued ones can still be read
+
+        :param error(Exception): raised by get() once the queued events are read
+        """
+        with self._condition:
+            self._closed = True
+            if error is not None:
+                self._error = error
+            self._condition.notify_all()
+
+    def __iter__(self):
+        while True:
+            event = self.get()
+            if event is None:
+                return
+            yield event
+
+
+class EventSubscription(object):
+    """Follow the container events of iSulad, surviving broken streams.
+
+    The events are read from a single Events call in a background thread and
+    put into the queue of every consumer. When the call fails, it is made
+    again after `reconnect_delay` seconds with `since` set to the timestamp
+    of the last event received. The events received again are recognized by
+    their timestamp, container and action and skipped. With `until`, the
+    subscription ends, closing the queues, once the server ends the stream.
+    Any other exception, from the call, a consumer filter or dispatch, ends
+    the thread. It is kept as `last_error`, raised by the queues once their
+    events are read and raised again by stop().
+
+    :param client: the isula.isulad.client.Client to read the events with
+    :param container_id(string): only follow the events of this container
+    :param since: a google.protobuf.Timestamp, follow the events since this time
+    :param until: a google.protobuf.Timestamp, follow the events until this time
+    :param reconnect_delay(float): seconds to wait before making a failed call again
+    """
+    def __init__(self, client, container_id=None, since=None, until=None,
+                 reconnect_delay=1.0):
+        self.client = client
+        self.container_id = container_id
+        self.since = since
+        self.until = until
+        self.reconnect_delay = reconnect_delay
+        self.last_timestamp = None
+        self.last_error = None
+        # Replaced rather than mutated, so it is read without the lock.
+        self._queues = ()
+        self._recent = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._stream = None
+        self._thread = None
+        self._failure = None
+        self._stopped = threading.Event()
+
+    def subscribe(self, maxsize=DEFAULT_QUEUE_SIZE, overflow=OVERFLOW_BLOCK,
+                  response_mode=utils.RESPONSE_RAW, event_filter=None):
+        """Add a consumer, see EventQueue for the parameters
+
+        :returns: EventQueue -- the queue the consumer reads the events from
+        """
+        event_queue = EventQueue(maxsize, overflow, response_mode,
+                                 event_filter)
+        with self._lock:
+            self._queues += (event_queue,)
+        return event_queue
+
+    def unsubscribe(self, event_queue):
+        """Remove a consumer and close its queue"""
+        with self._lock:
+            self._queues = tuple(q for q in self._queues if q is not event_queue)
+        event_queue.close()
+
+    def start(self):
+        """Read the events in a background thread until stop() is called"""
+        if self._thread is not None:
+            raise RuntimeError("The subscription is already started")
+        self._failure = None
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self):
+        """Whether the background thread started by start() is reading"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self):
+        """Cancel the events stream and close the queues
+
+        :raises: the exception which ended the thread, see EventSubscription
+        """
+        self._stopped.set()
+        with self._lock:
+            stream = self._stream
+        if stream is not None:
+            stream.cancel()
+        # A blocked put() is woken up by closing its queue.
+        for event_queue in self._queues:
+            event_queue.close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        failure, self._failure = self._failure, None
+        if failure is not None:
+            raise failure
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _run(self):
+        failure = None
+        try:
+            while not self._stopped.is_set():
+                try:
+                    with self._lock:
+                        stream = self.client.container_events(
+                            self.container_id, since=self._resume_since(),
+                            until=self.until, response_mode=utils.RESPONSE_RAW)
+                        self._stream = stream
+                    if self._stopped.is_set():
+                        stream.cancel()
+                    for event in stream:
+                        self.dispatch(event)
+                    if self.until is not None:
+                        break
+                except grpc.RpcError as e:
+                    if self._stopped.is_set():
+                        break
+                    self.last_error = e
+                self._stopped.wait(self.reconnect_delay)
+        except Exception as e:
+            self.last_error = self._failure = failure = e
+            self._stopped.set()
+            with self._lock:
+                stream = self._stream
+            if stream is not None:
+                stream.cancel()
+        for event_queue in self._queues:
+            event_queue.close(failure)
+
+    def _resume_since(self):
+        if self.last_timestamp is None:
+            return self.since
+        seconds, nanos = self.last_timestamp
+        return timestamp_pb2.Timestamp(seconds=seconds, nanos=nanos)
+
+    def dispatch(self, event):
+        """Put an event into the queue of every consumer, unless it was already
+
+        :returns: boolean -- False if the event was a replayed one
+        """
+        if not self._record(event):
+            return False
+        for event_queue in self._queues:
+            event_queue.put(event)
+        return True
+
+    def _received(self, event):
+        # Whether the event was already received.
+        return _event_key(event) in self._recent
+
+    def _record(self, event):
+        # Remember the event, returns False if it was already received.
+        key = _event_key(event)
+        timestamp = key[0]
+        recent = self._recent
+        if key in recent:
+            return False
+        recent[key] = None
+        if len(recent) > DEDUP_WINDOW:
+            recent.popitem(last=False)
+        if self.last_timestamp is None or timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
+        return True
+
+
+def _event_key(event):
+    # The events received again after a reconnection have the same key.
+    return ((event.timestamp.seconds, event.timestamp.nanos), event.id,
+            event.opt)
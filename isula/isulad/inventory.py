@@ -0,0 +1,189 @@
+"""A local inventory of the containers of iSulad kept fresh by its events.
+
+Instead of listing the containers again and again to notice their changes,
+the inventory lists them once, then follows the Events stream of iSulad and
+applies each event to its copy. Lookups by id and name are dict lookups, and
+the containers are also indexed by status and image.
+
+example:
+    import isula
+    from isula.isulad import inventory
+
+    client = isula.init_isulad_client()
+    containers = inventory.ContainerInventory(client)
+    containers.start()
+    print(containers.get_by_name('web'))
+    print(containers.by_status('RUNNING'))
+    containers.stop()
+"""
+import threading
+
+from google.protobuf import timestamp_pb2
+
+from isula.isulad import events
+from isula.isulad import results
+
+
+# The status of a container after an event, by the `opt` of the event.
+EVENT_STATUS = {
+    'start': 'RUNNING',
+    'restart': 'RUNNING',
+    'unpause': 'RUNNING',
+    'pause': 'PAUSED',
+    'die': 'STOPPED',
+    'stop': 'STOPPED',
+}
+# Events removing a container.
+REMOVE_EVENTS = frozenset(('destroy', 'delete', 'remove'))
+# Events after which a container is listed again, since they change fields
+# that are not carried by the event.
+REFRESH_EVENTS = frozenset(('create', 'rename', 'update'))
+
+
+class ContainerInventory(events.EventSubscription):
+    """The containers of iSulad, kept up to date from its events.
+
+    start() lists all the containers and follows the events from the time
+    of that list in a background thread. The events are read by an
+    events.EventSubscription, which opens a broken stream again from the
+    time of the last event applied, so the events missed in between are
+    replayed. Applying an event twice leaves the inventory unchanged, so
+    replayed events are harmless. The events can also be read through
+    subscribe(), once they are applied.
+
+    The containers are results.ContainerSummary objects, which are updated
+    in place. An event of an unknown container, or one that changes more
+    than the status, lists that single container again.
+
+    :param client: the isula.isulad.client.Client to list the containers with
+    :param reconnect_delay(float): seconds to wait before opening a broken events stream again
+    """
+    def __init__(self, client, reconnect_delay=1.0):
+        super(ContainerInventory, self).__init__(
+            client, reconnect_delay=reconnect_delay)
+        self._by_id = {}
+        self._by_name = {}
+        self._by_status = {}
+        self._by_image = {}
+        self._index_lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, container_id):
+        return container_id in self._by_id
+
+    def __iter__(self):
+        with self._index_lock:
+            containers = list(self._by_id.values())
+        return iter(containers)
+
+    def get(self, container_id):
+        """Get the ContainerSummary of a container by id, or None"""
+        return self._by_id.get(container_id)
+
+    def get_by_name(self, name):
+        """Get the ContainerSummary of a container by name, or None"""
+        return self._by_name.get(name)
+
+    def by_status(self, status):
+        """Get the containers with a status, like 'RUNNING'
+
+        :returns: list -- the ContainerSummary of the containers
+        """
+        with self._index_lock:
+            return list(self._by_status.get(status, {}).values())
+
+    def by_image(self, image):
+        """Get the containers created from an image
+
+        :returns: list -- the ContainerSummary of the containers
+        """
+        with self._index_lock:
+            return list(self._by_image.get(image, {}).values())
+
+    def sync(self):
+        """List all the containers and replace the inventory with them
+
+        The events are followed from the time of this list.
+        """
+        since = timestamp_pb2.Timestamp()
+        since.GetCurrentTime()
+        response = self.client.list_containers(is_all=True,
+                                               response_mode='raw')
+        with self._index_lock:
+            self._by_id.clear()
+            self._by_name.clear()
+            self._by_status.clear()
+            self._by_image.clear()
+            for message in response.containers:
+                self._add(results.ContainerSummary.from_message(message))
+        with self._lock:
+            self.since = since
+            self.last_timestamp = None
+
+    def refresh(self, container_id):
+        """List a single container again, dropping it if it is gone"""
+        response = self.client.list_containers(filters={'id': container_id},
+                                               is_all=True,
+                                               response_mode='raw')
+        with self._index_lock:
+            self._remove(container_id)
+            for message in response.containers:
+                if message.id == container_id:
+                    self._add(results.ContainerSummary.from_message(message))
+
+    def apply_event(self, event):
+        """Apply a container_pb2.Event message to the inventory"""
+        action = events.event_action(event)
+        container_id = event.id
+        if action in REMOVE_EVENTS:
+            with self._index_lock:
+                self._remove(container_id)
+        elif action in REFRESH_EVENTS or (action in EVENT_STATUS
+                                          and container_id not in self._by_id):
+            self.refresh(container_id)
+        elif action in EVENT_STATUS:
+            with self._index_lock:
+                summary = self._by_id.get(container_id)
+                if summary is not None:
+                    self._remove(container_id)
+                    summary.status = EVENT_STATUS[action]
+                    self._add(summary)
+
+    def _record(self, event):
+        # A replayed event is skipped without being applied. A new event is
+        # applied before being recorded, so that an event whose refresh
+        # failed is replayed once the stream is opened again.
+        if self._received(event):
+            return False
+        self.apply_event(event)
+        return super(ContainerInventory, self)._record(event)
+
+    def _add(self, summary):
+        self._by_id[summary.id] = summary
+        if summary.name:
+            self._by_name[summary.name] = summary
+        self._by_status.setdefault(summary.status, {})[summary.id] = summary
+        self._by_image.setdefault(summary.image, {})[summary.id] = summary
+
+    def _remove(self, container_id):
+        summary = self._by_id.pop(container_id, None)
+        if summary is None:
+            return
+        if self._by_name.get(summary.name) is summary:
+            del self._by_name[summary.name]
+        for index, key in ((self._by_status, summary.status),
+                           (self._by_image, summary.image)):
+            containers = index.get(key)
+            if containers is not None:
+                containers.pop(container_id, None)
+                if not containers:
+                    del index[key]
+
+    def start(self):
+        """List the containers and follow the events in a background thread"""
+        if self._thread is not None:
+            raise RuntimeError("The inventory is already started")
+        self.sync()
+        super(ContainerInventory, self).start()
@@ -0,0 +1,535 @@
+"""Read the logs of a container as bytes without copying them around.
+
+The Logs RPC streams LogsResponse messages, each holding a chunk of the
+output of the container in its `data` field. LogReader exposes those chunks
+as a binary file: readinto() copies straight from the chunks into the
+caller's buffer, chunks() hands out memoryview slices of them, and lines()
+splits them on newlines, only joining the pieces of the lines spread over
+several chunks instead of concatenating a growing buffer.
+
+example:
+    import isula
+    from isula.isulad import logs
+
+    client = isula.init_isulad_client()
+    with client.container_log_reader('xxx', streams=logs.STDERR,
+                                     follow=True) as reader:
+        for line in reader.lines():
+            print(line)
+"""
+import asyncio
+import calendar
+import collections
+import gzip
+import heapq
+import itertools
+import threading
+import time
+
+from isula import utils
+
+
+STDOUT = 'stdout'
+STDERR = 'stderr'
+
+# Seconds an entry of follow_logs waits for older entries of other streams.
+DEFAULT_REORDER_WINDOW = 0.2
+# Number of entries of a stream follow_logs holds before the stream waits.
+DEFAULT_BUFFER_SIZE = 256
+
+# Compressions of save_logs, with their default levels.
+COMPRESSION_GZIP = 'gzip'
+COMPRESSION_ZSTD = 'zstd'
+COMPRESSION_LEVELS = {COMPRESSION_GZIP: 6, COMPRESSION_ZSTD: 3}
+COMPRESSION_SUFFIXES = {COMPRESSION_GZIP: '.gz', COMPRESSION_ZSTD: '.zst'}
+# Size of the buffer of the files written by save_logs.
+DEFAULT_WRITE_BUFFER = 1 << 20
+
+
+class LogReader(utils.RawChunkReader):
+    """A binary file over the LogsResponse messages of a container.
+
+    The reader can be wrapped in io.BufferedReader or io.TextIOWrapper, or
+    read with chunks(), which returns memoryview objects sharing the memory
+    of the messages, and lines(). Closing the reader cancels the call when
+    the messages come from one.
+
+    :param messages: the LogsResponse messages, such as the call returned by
+        isula.isulad.container.Container.logs
+    :param streams(string or List(string)): the streams to read, STDOUT
+        and/or STDERR, default both
+    """
+    def __init__(self, messages, streams=None):
+        super(LogReader, self).__init__(messages)
+        if isinstance(streams, str):
+            streams = (streams,)
+        self.streams = frozenset(streams) if streams else None
+        self.stream = None
+        self.time = None
+        self._messages = iter(messages)
+
+    def _next_data(self):
+        streams = self.streams
+        for message in self._messages:
+            if streams is not None and message.stream not in streams:
+                continue
+            self.stream = message.stream
+            self.time = message.time
+            return message.data
+        return None
+
+    def chunks(self):
+        """Iterate over the remaining data, one chunk per message
+
+        :returns: Iterable -- (stream, memoryview) tuples, the stream being
+            STDOUT or STDERR, which demultiplexes the output of the container
+        """
+        data, pos = self._data, self._pos
+        self._data, self._pos = b'', 0
+        if pos < len(data):
+            yield self.stream, memoryview(data)[pos:]
+        while True:
+            data = self._next_data()
+            if data is None:
+                return
+            if data:
+                yield self.stream, memoryview(data)
+
+    def lines(self, keepends=False):
+        """Iterate over the remaining lines
+
+        Each chunk is split at once by bytes.split, only the pieces of the
+        lines spread over several chunks are joined, once per line. The
+        pieces are kept per stream, so the stdout and stderr chunks of a
+        container may interleave: every line comes from a single stream,
+        which is `stream` while the line is yielded.
+
+        :param keepends(boolean): keep the trailing newlines
+        :returns: Iterable -- the lines as bytes
+        """
+        data, pos = self._data, self._pos
+        self._data, self._pos = b'', 0
+        pending = {}
+        if pos:
+            data = data[pos:]
+        while data is not None:
+            parts = data.split(b'\n')
+            pieces = pending.get(self.stream)
+            if pieces:
+                pieces.append(parts[0])
+                parts[0] = b''.join(pieces)
+                del pending[self.stream]
+            tail = parts.pop()
+            if tail:
+                pending.setdefault(self.stream, []).append(tail)
+            if keepends:
+                for line in parts:
+                    yield line + b'\n'
+            else:
+                yield from parts
+            data = self._next_data()
+        for stream, pieces in pending.items():
+            self.stream = stream
+            yield b''.join(pieces)
+
+
+def log_time_key(value):
+    """Get a sortable key of the RFC 3339 time of a log, like '2021-06-01T08:00:00.123456789Z'
+
+    :returns: tuple -- (seconds, nanoseconds) since the epoch, None for a time that can not be parsed
+    """
+    try:
+        seconds = calendar.timegm((int(value[0:4]), int(value[5:7]),
+                                   int(value[8:10]), int(value[11:13]),
+                                   int(value[14:16]), int(value[17:19]),
+                                   0, 0, 0))
+        rest = value[19:]
+        nanos = 0
+        if rest.startswith('.'):
+            end = 1
+            while end < len(rest) and rest[end].isdigit():
+                end += 1
+            nanos = int(rest[1:end][:9].ljust(9, '0'))
+            rest = rest[end:]
+        if rest[:1] in ('+', '-') and len(rest) >= 6:
+            offset = int(rest[1:3]) * 3600 + int(rest[4:6]) * 60
+            seconds -= offset if rest[0] == '+' else -offset
+    except (TypeError, ValueError):
+        return None
+    return seconds, nanos
+
+
+class LogEntry(object):
+    """A chunk of the logs of a container, as returned by follow_logs"""
+    __slots__ = ('container_id', 'stream', 'time', 'data')
+
+    def __init__(self, container_id, stream, time, data):
+        self.container_id = container_id
+        self.stream = stream
+        self.time = time
+        self.data = data
+
+    def __repr__(self):
+        return 'LogEntry(container_id=%r, stream=%r, time=%r, data=%r)' % (
+            self.container_id, self.stream, self.time, self.data)
+
+
+class _LogMerger(object):
+    """Order the entries of several streams by time.
+
+    An entry is held for the reorder window after it arrived, so an older
+    entry of a slower stream can still go before it.
+    """
+    def __init__(self, reorder_window, buffer_size):
+        self.reorder_window = reorder_window
+        self.buffer_size = buffer_size
+        self._heap = []
+        self._counts = collections.Counter()
+        self._sequence = itertools.count()
+
+    def full(self, container_id):
+        return self._counts[container_id] >= self.buffer_size
+
+    def push(self, entry):
+        key = log_time_key(entry.time)
+        if key is None:
+            # An entry whose time can not be parsed keeps its arrival order.
+            key = divmod(time.time_ns(), 1000000000)
+        heapq.heappush(self._heap, (key, next(self._sequence),
+                                    time.monotonic(), entry))
+        self._counts[entry.container_id] += 1
+
+    def pop(self, flush=False):
+        """Get the next entry, or None and the seconds until there is one"""
+        if not self._heap:
+            return None, None
+        arrival = self._heap[0][2]
+        wait = arrival + self.reorder_window - time.monotonic()
+        if wait > 0 and not flush:
+            return None, wait
+        entry = heapq.heappop(self._heap)[3]
+        self._counts[entry.container_id] -= 1
+        return entry, 0
+
+
+class LogFollower(object):
+    """Follow the logs of several containers as a single iterator.
+
+    The Logs stream of each container is read by its own thread. The
+    LogEntry objects are yielded in the order of their time, within the
+    reorder window. A stream with buffer_size entries waiting waits in turn,
+    so a chatty container does not fill the memory. A stream failing is
+    recorded in `errors` by container id and its error is raised by the
+    next call to next(), unless ignore_errors is set. The other streams go
+    on either way.
+
+    :param client: the isula.isulad.client.Client to read the logs with
+    :param container_ids(List(string)): identifiers of containers
+    :param streams(string or List(string)): the streams to read, STDOUT and/or STDERR, default both
+    :param reorder_window(float): seconds an entry waits for older entries
+    :param buffer_size(int): the maximum number of entries waiting per container
+    :param ignore_errors(boolean): only record the errors of the streams, do not raise them
+    :param logs_kwargs: the other parameters of Client.container_logs, like since or tail
+    """
+    def __init__(self, client, container_ids, streams=None,
+                 reorder_window=DEFAULT_REORDER_WINDOW,
+                 buffer_size=DEFAULT_BUFFER_SIZE, ignore_errors=False,
+                 **logs_kwargs):
+        if isinstance(streams, str):
+            streams = (streams,)
+        self.streams = frozenset(streams) if streams else None
+        self.ignore_errors = ignore_errors
+        self.errors = {}
+        self._failures = collections.deque()
+        self._merger = _LogMerger(reorder_window, buffer_size)
+        self._condition = threading.Condition()
+        self._calls = {}
+        self._closed = False
+        container_ids = list(dict.fromkeys(container_ids))
+        self._running = len(container_ids)
+        self._threads = []
+        for container_id in container_ids:
+            thread = threading.Thread(
+                target=self._read, args=(client, container_id, logs_kwargs),
+                daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _read(self, client, container_id, logs_kwargs):
+        condition = self._condition
+        merger = self._merger
+        streams = self.streams
+        try:
+            with condition:
+                if self._closed:
+                    return
+                call = client.container_logs(container_id, **logs_kwargs)
+                self._calls[container_id] = call
+            for message in call:
+                if streams is not None and message.stream not in streams:
+                    continue
+                entry = LogEntry(container_id, message.stream, message.time,
+                                 message.data)
+                with condition:
+                    while merger.full(container_id) and not self._closed:
+                        condition.wait()
+                    if self._closed:
+                        return
+                    merger.push(entry)
+                    condition.notify_all()
+        except Exception as e:
+            with condition:
+                if not self._closed:
+                    self.errors[container_id] = e
+                    if not self.ignore_errors:
+                        self._failures.append(e)
+        finally:
+            with condition:
+                self._running -= 1
+                condition.notify_all()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        condition = self._condition
+        with condition:
+            while True:
+                if self._failures:
+                    raise self._failures.popleft()
+                entry, wait = self._merger.pop(flush=not self._running)
+                if entry is not None:
+                    condition.notify_all()
+                    return entry
+                if wait is None and (not self._running or self._closed):
+                    raise StopIteration
+                condition.wait(wait)
+
+    def close(self):
+        """Cancel the streams still open"""
+        with self._condition:
+            self._closed = True
+            calls = list(self._calls.values())
+            self._condition.notify_all()
+        for call in calls:
+            call.cancel()
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class AsyncLogFollower(object):
+    """Follow the logs of several containers as a single async iterator.
+
+    The asyncio flavour of LogFollower, reading each stream in a task.
+    """
+    def __init__(self, client, container_ids, streams=None,
+                 reorder_window=DEFAULT_REORDER_WINDOW,
+                 buffer_size=DEFAULT_BUFFER_SIZE, ignore_errors=False,
+                 **logs_kwargs):
+        if isinstance(streams, str):
+            streams = (streams,)
+        self.streams = frozenset(streams) if streams else None
+        self.ignore_errors = ignore_errors
+        self.errors = {}
+        self._failures = collections.deque()
+        self._client = client
+        self._container_ids = list(dict.fromkeys(container_ids))
+        self._logs_kwargs = logs_kwargs
+        self._merger = _LogMerger(reorder_window, buffer_size)
+        self._condition = None
+        self._tasks = None
+        self._running = 0
+        self._closed = False
+
+    def _start(self):
+        self._condition = asyncio.Condition()
+        self._running = len(self._container_ids)
+        self._tasks = [asyncio.ensure_future(self._read(container_id))
+                       for container_id in self._container_ids]
+
+    async def _read(self, container_id):
+        condition = self._condition
+        merger = self._merger
+        streams = self.streams
+        try:
+            async for message in self._client.container_logs(
+                    container_id, **self._logs_kwargs):
+                if streams is not None and message.stream not in streams:
+                    continue
+                entry = LogEntry(container_id, message.stream, message.time,
+                                 message.data)
+                async with condition:
+                    while merger.full(container_id) and not self._closed:
+                        await condition.wait()
+                    if self._closed:
+                        return
+                    merger.push(entry)
+                    condition.notify_all()
+        except Exception as e:
+            if not self._closed:
+                self.errors[container_id] = e
+                if not self.ignore_errors:
+                    self._failures.append(e)
+        finally:
+            async with condition:
+                self._running -= 1
+                condition.notify_all()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._tasks is None:
+            self._start()
+        condition = self._condition
+        async with condition:
+            while True:
+                if self._failures:
+                    raise self._failures.popleft()
+                entry, wait = self._merger.pop(flush=not self._running)
+                if entry is not None:
+                    condition.notify_all()
+                    return entry
+                if wait is None and (not self._running or self._closed):
+                    raise StopAsyncIteration
+                try:
+                    await asyncio.wait_for(condition.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def aclose(self):
+        """Cancel the streams still open"""
+        self._closed = True
+        if self._tasks is None:
+            return
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+
+class RotatingLogWriter(object):
+    """Write log data to buffered, optionally compressed files.
+
+    The first file is `path`, and once rotate_bytes bytes of log are
+    written to a file the next one is opened as path.1, path.2 and so on,
+    keeping a '.gz' or '.zst' suffix of the path last, like app.1.gz.
+    Rotation happens between chunks, so a file exceeds rotate_bytes by less
+    than a chunk. rotate_bytes counts the log bytes before compression.
+
+    :param path(string): the path of the first file
+    :param compression(string): 'gzip', 'zstd' or None, zstd requires the zstandard package
+    :param rotate_bytes(int): the log bytes written per file, default a single file
+    :param compresslevel(int): the compression level, default 6 for gzip and 3 for zstd
+    :param buffer_size(int): the size of the write buffer of the files
+    """
+    def __init__(self, path, compression=None, rotate_bytes=None,
+                 compresslevel=None, buffer_size=DEFAULT_WRITE_BUFFER):
+        if compression is not None and compression not in COMPRESSION_LEVELS:
+            raise ValueError("Invalid compression %r, it should be one of %s"
+                             % (compression, ', '.join(COMPRESSION_LEVELS)))
+        if compression == COMPRESSION_ZSTD:
+            try:
+                import zstandard
+            except ImportError:
+                raise ImportError("The zstandard package is required for "
+                                  "zstd compression")
+            self._zstandard = zstandard
+        self.path = path
+        self.compression = compression
+        self.rotate_bytes = rotate_bytes
+        self.compresslevel = (compresslevel if compresslevel is not None
+                              else COMPRESSION_LEVELS.get(compression))
+        self.buffer_size = buffer_size
+        self.paths = []
+        self.bytes_written = 0
+        self._file = None
+        self._file_bytes = 0
+
+    def _open(self):
+        path = self.path
+        if self.paths:
+            suffix = COMPRESSION_SUFFIXES.get(self.compression, '')
+            if suffix and path.endswith(suffix):
+                path = '%s.%d%s' % (path[:-len(suffix)], len(self.paths),
+                                    suffix)
+            else:
+                path = '%s.%d' % (path, len(self.paths))
+        raw = open(path, 'wb', buffering=self.buffer_size)
+        if self.compression == COMPRESSION_GZIP:
+            self._file = gzip.GzipFile(fileobj=raw, mode='wb',
+                                       compresslevel=self.compresslevel)
+            self._raw = raw
+        elif self.compression == COMPRESSION_ZSTD:
+            compressor = self._zstandard.ZstdCompressor(
+                level=self.compresslevel)
+            self._file = compressor.stream_writer(raw, closefd=False)
+            self._raw = raw
+        else:
+            self._file = raw
+            self._raw = None
+        self._file_bytes = 0
+        self.paths.append(path)
+
+    def write(self, data):
+        if self._file is None:
+            self._open()
+        self._file.write(data)
+        self._file_bytes += len(data)
+        self.bytes_written += len(data)
+        if self.rotate_bytes and self._file_bytes >= self.rotate_bytes:
+            self._close_file()
+
+    def _close_file(self):
+        if self._file is None:
+            return
+        self._file.close()
+        if self._raw is not None:
+            self._raw.close()
+        self._file = self._raw = None
+
+    def close(self):
+        """Close the current file, creating an empty one if nothing was written"""
+        if not self.paths:
+            self._open()
+        self._close_file()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def save_logs(messages, path, compression=None, rotate_bytes=None,
+              streams=None, compresslevel=None,
+              buffer_size=DEFAULT_WRITE_BUFFER):
+    """Write the data of LogsResponse messages to files as they arrive
+
+    :param messages: the LogsResponse messages, such as the call returned by
+        isula.isulad.container.Container.logs
+    :param streams(string or List(string)): the streams to save, STDOUT and/or STDERR, default both
+    :returns: list -- the paths of the files written
+    See RotatingLogWriter for the other parameters.
+    """
+    if isinstance(streams, str):
+        streams = (streams,)
+    streams = frozenset(streams) if streams else None
+    with RotatingLogWriter(path, compression, rotate_bytes, compresslevel,
+                           buffer_size) as writer:
+        for message in messages:
+            if streams is not None and message.stream not in streams:
+                continue
+            writer.write(message.data)
+    return writer.paths
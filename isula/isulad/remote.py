@@ -0,0 +1,570 @@
+"""Interactive sessions over the RemoteStart and RemoteExec streams.
+
+RemoteExec runs a command in a container and RemoteStart starts a container,
+both carrying the stdin of the process in the requests and its stdout and
+stderr in the responses of one bidirectional stream. A session keeps both
+directions going at once: write() queues the stdin in chunks which gRPC
+sends while the output is read, so large data can be piped through a
+command without FIFOs on the host or a CLI process per command.
+
+example:
+    import isula
+
+    client = isula.init_isulad_client()
+    with client.container_remote_exec('xxx', ['gzip', '-c']) as session:
+        session.feed(open('/tmp/data', 'rb'))
+        with open('/tmp/data.gz', 'wb') as f:
+            while True:
+                chunk = session.stdout.read1()
+                if not chunk:
+                    break
+                f.write(chunk)
+        print(session.wait())
+"""
+import asyncio
+import collections
+import io
+import threading
+
+import grpc
+
+from isula.isulad import logs
+from isula.isulad_grpc import container_pb2
+from isula import utils
+
+
+# Size of the chunks the stdin is sent in, well below the 4 MiB default
+# message size limit of gRPC.
+DEFAULT_CHUNK_SIZE = 256 << 10
+# Number of stdin chunks waiting to be sent before write() waits.
+DEFAULT_QUEUE_SIZE = 16
+
+
+def session_result(metadata):
+    """Read the result of a session from the trailing metadata of its call
+
+    iSulad reports a failure of the session in `cc` and `errmsg`, and the
+    exit code of an exec in `exit_code`.
+
+    :returns: int -- the exit code, None when it is not reported
+    """
+    values = dict(metadata or ())
+    cc = values.get('cc')
+    if cc and cc != '0':
+        raise Exception(values.get('errmsg')
+                        or "The remote session failed with code %s" % cc)
+    exit_code = values.get('exit_code')
+    return int(exit_code) if exit_code else None
+
+
+def _source_chunks(data, chunk_size):
+    """Iterate over bytes, a binary file or an iterable of bytes"""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        yield data
+    elif hasattr(data, 'read'):
+        while True:
+            chunk = data.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        for chunk in data:
+            yield chunk
+
+
+def _split(data, chunk_size):
+    if isinstance(data, bytes) and len(data) <= chunk_size:
+        return (data,)
+    view = memoryview(data).cast('B')
+    # The messages only take bytes, so the pieces are copied once here.
+    return [bytes(view[start:start + chunk_size])
+            for start in range(0, len(view), chunk_size)]
+
+
+class _StreamReader(utils.RawChunkReader):
+    """The stdout or stderr of a session as a raw binary file"""
+    def __init__(self, session, stream):
+        super(_StreamReader, self).__init__()
+        self._session = session
+        self._stream = stream
+
+    def _next_data(self):
+        return self._session._read_chunk(self._stream)
+
+
+class RemoteSession(object):
+    """A session over a RemoteStart or RemoteExec call.
+
+    The stdin is queued by write() in chunks of chunk_size bytes, at most
+    queue_size of them, and sent by gRPC from its own thread. feed() writes
+    from a background thread instead, so the output can be read meanwhile.
+
+    `stdout` and `stderr` are buffered binary files over the output. They
+    can be read from different threads: the messages are pulled by one
+    reader at a time, and the data of the other stream is kept for its own
+    reader. The output of a stream nobody reads is thus held in memory
+    until wait() or close(), chunks() and communicate() read both streams.
+
+    :param open_call: called with the iterator of requests, returns the call
+    :param chunk_size(int): the maximum size of the stdin messages
+    :param queue_size(int): the number of stdin chunks waiting to be sent before write() waits
+    """
+    def __init__(self, open_call, chunk_size=DEFAULT_CHUNK_SIZE,
+                 queue_size=DEFAULT_QUEUE_SIZE):
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+        self.last_error = None
+        self._stdin = collections.deque()
+        self._stdin_condition = threading.Condition()
+        self._stdin_closed = False
+        self._done = False
+        self._pending = {logs.STDOUT: collections.deque(),
+                         logs.STDERR: collections.deque()}
+        self._condition = threading.Condition()
+        self._pulling = False
+        self._eof = False
+        self._error = None
+        self._closed = False
+        self._feeder = None
+        self._call = open_call(self._requests())
+        self._call.add_done_callback(self._on_done)
+        self.stdout = io.BufferedReader(_StreamReader(self, logs.STDOUT))
+        self.stderr = io.BufferedReader(_StreamReader(self, logs.STDERR))
+
+    def _request(self, data, finish):
+        raise NotImplementedError
+
+    def _requests(self):
+        condition = self._stdin_condition
+        stdin = self._stdin
+        while True:
+            with condition:
+                while not stdin and not self._stdin_closed and not self._done:
+                    condition.wait()
+                if not stdin:
+                    if self._stdin_closed and not self._done:
+                        yield self._request(b'', True)
+                    return
+                data = stdin.popleft()
+                condition.notify_all()
+            yield self._request(data, False)
+
+    def _on_done(self, call):
+        with self._stdin_condition:
+            self._done = True
+            self._stdin.clear()
+            self._stdin_condition.notify_all()
+
+    def write(self, data):
+        """Write to the stdin of the process
+
+        Waits while queue_size chunks are waiting to be sent.
+
+        :param data(bytes-like): the data, split in chunks of chunk_size bytes
+        :returns: int -- the number of bytes written
+        """
+        condition = self._stdin_condition
+        stdin = self._stdin
+        pieces = _split(data, self.chunk_size)
+        for piece in pieces:
+            with condition:
+                while len(stdin) >= self.queue_size and not self._done:
+                    condition.wait()
+                if self._stdin_closed:
+                    raise ValueError("The stdin of the session is closed")
+                if self._done:
+                    raise BrokenPipeError("The remote session is over")
+                stdin.append(piece)
+                condition.notify_all()
+        return sum(len(piece) for piece in pieces)
+
+    def close_stdin(self):
+        """Close the stdin of the process once the data written is sent"""
+        with self._stdin_condition:
+            self._stdin_closed = True
+            self._stdin_condition.notify_all()
+
+    def feed(self, data):
+        """Write data to the stdin from a background thread, then close the stdin
+
+        A failure to write or to read the data is kept as `last_error`, a
+        failure to read also cancels the session rather than sending a
+        truncated stdin.
+
+        :param data: bytes, a binary file or an iterable of bytes
+        """
+        if self._feeder is not None:
+            raise RuntimeError("The session is already fed")
+        self._feeder = threading.Thread(target=self._feed, args=(data,),
+                                        daemon=True)
+        self._feeder.start()
+
+    def _feed(self, data):
+        try:
+            for chunk in _source_chunks(data, self.chunk_size):
+                if not self._feed_chunk(chunk):
+                    return
+            self.close_stdin()
+        except Exception as e:
+            # Reading the data failed, like reading a closed file.
+            self.last_error = e
+            self._call.cancel()
+
+    def _feed_chunk(self, chunk):
+        # Write a chunk of the fed data, returns False once the session is
+        # over or its stdin was closed by close_stdin().
+        try:
+            self.write(chunk)
+        except BrokenPipeError as e:
+            self.last_error = e
+            return False
+        except ValueError as e:
+            if not self._stdin_closed:
+                raise
+            self.last_error = e
+            return False
+        return True
+
+    def _pull(self):
+        """Pull one message, or wait for the reader pulling one
+
+        Called with the condition held.
+
+        :returns: boolean -- False at the end of the output
+        """
+        condition = self._condition
+        if self._eof:
+            if self._error is not None:
+                raise self._error
+            return False
+        if self._pulling:
+            condition.wait()
+            return True
+        self._pulling = True
+        condition.release()
+        try:
+            message = next(self._call, None)
+        except grpc.RpcError as e:
+            message = None
+            if not self._closed:
+                self._error = e
+        finally:
+            condition.acquire()
+            self._pulling = False
+            condition.notify_all()
+        if message is None:
+            self._eof = True
+            if self._error is not None:
+                raise self._error
+            return False
+        if message.stdout:
+            self._pending[logs.STDOUT].append(message.stdout)
+        if message.stderr:
+            self._pending[logs.STDERR].append(message.stderr)
+        return True
+
+    def _read_chunk(self, stream):
+        pending = self._pending[stream]
+        with self._condition:
+            while not pending:
+                if not self._pull():
+                    return None
+            return pending.popleft()
+
+    def chunks(self):
+        """Iterate over the output of both streams as it comes
+
+        :returns: Iterable -- (stream, bytes) tuples, the stream being
+            isula.isulad.logs.STDOUT or STDERR
+        """
+        pending = self._pending
+        with self._condition:
+            while True:
+                for stream in (logs.STDOUT, logs.STDERR):
+                    while pending[stream]:
+                        data = pending[stream].popleft()
+                        self._condition.release()
+                        try:
+                            yield stream, data
+                        finally:
+                            self._condition.acquire()
+                if not self._pull():
+                    return
+
+    def communicate(self, input=None):
+        """Send the input, close the stdin and read the output to its end
+
+        :param input: bytes, a binary file or an iterable of bytes to feed
+        :returns: tuple -- the stdout and the stderr as bytes
+        """
+        if input is not None:
+            self.feed(input)
+        elif self._feeder is None:
+            self.close_stdin()
+        output = {logs.STDOUT: [], logs.STDERR: []}
+        for stream, data in self.chunks():
+            output[stream].append(data)
+        if self._feeder is not None:
+            self._feeder.join()
+        return b''.join(output[logs.STDOUT]), b''.join(output[logs.STDERR])
+
+    def wait(self):
+        """Wait for the end of the session
+
+        The output not read yet is kept for the readers.
+
+        :returns: int -- the exit code of the process when iSulad reports it
+        """
+        with self._condition:
+            while self._pull():
+                pass
+        return session_result(self._call.trailing_metadata())
+
+    def close(self):
+        """Cancel the session if it is still running"""
+        self._closed = True
+        self._call.cancel()
+        self._on_done(self._call)
+        if self._feeder is not None:
+            self._feeder.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ExecSession(RemoteSession):
+    """A command running in a container, see RemoteSession"""
+    def _request(self, data, finish):
+        return container_pb2.RemoteExecRequest(cmd=[data] if data else [],
+                                               finish=finish)
+
+
+class StartSession(RemoteSession):
+    """A container started with its stdio attached, see RemoteSession"""
+    def _request(self, data, finish):
+        return container_pb2.RemoteStartRequest(stdin=data, finish=finish)
+
+
+class _AsyncStreamReader(object):
+    """The stdout or stderr of an asyncio session"""
+    def __init__(self, session, stream):
+        self._session = session
+        self._stream = stream
+
+    async def read(self, size=-1):
+        """Read up to size bytes, all the remaining output when size is negative
+
+        :returns: bytes -- the data, empty at the end of the output
+        """
+        session = self._session
+        if size < 0:
+            chunks = []
+            while True:
+                data = await session._read_chunk(self._stream)
+                if data is None:
+                    return b''.join(chunks)
+                chunks.append(data)
+        data = await session._read_chunk(self._stream)
+        if data is None:
+            return b''
+        if len(data) > size:
+            session._pending[self._stream].appendleft(data[size:])
+            data = data[:size]
+        return data
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        data = await self._session._read_chunk(self._stream)
+        if data is None:
+            raise StopAsyncIteration
+        return data
+
+
+class AsyncRemoteSession(object):
+    """A session over a RemoteStart or RemoteExec call of grpc.aio.
+
+    The asyncio flavour of RemoteSession: the requests are written to the
+    call, which waits for the flow control of gRPC, and feed() writes from
+    a task. `stdout` and `stderr` have an async read() and iterate over the
+    chunks of their output.
+
+    :param call: the call opened without requests
+    :param chunk_size(int): the maximum size of the stdin messages
+    """
+    def __init__(self, call, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.last_error = None
+        self._call = call
+        self._write_lock = asyncio.Lock()
+        self._stdin_closed = False
+        self._pending = {logs.STDOUT: collections.deque(),
+                         logs.STDERR: collections.deque()}
+        self._read_lock = asyncio.Lock()
+        self._eof = False
+        self._error = None
+        self._closed = False
+        self._feeder = None
+        self.stdout = _AsyncStreamReader(self, logs.STDOUT)
+        self.stderr = _AsyncStreamReader(self, logs.STDERR)
+
+    def _request(self, data, finish):
+        raise NotImplementedError
+
+    async def write(self, data):
+        """Write to the stdin of the process, see RemoteSession.write"""
+        pieces = _split(data, self.chunk_size)
+        async with self._write_lock:
+            if self._stdin_closed:
+                raise ValueError("The stdin of the session is closed")
+            for piece in pieces:
+                if self._call.done():
+                    raise BrokenPipeError("The remote session is over")
+                await self._call.write(self._request(piece, False))
+        return sum(len(piece) for piece in pieces)
+
+    async def close_stdin(self):
+        """Close the stdin of the process"""
+        async with self._write_lock:
+            if self._stdin_closed:
+                return
+            self._stdin_closed = True
+            if not self._call.done():
+                await self._call.write(self._request(b'', True))
+                await self._call.done_writing()
+
+    def feed(self, data):
+        """Write data to the stdin from a task, then close the stdin, see RemoteSession.feed"""
+        if self._feeder is not None:
+            raise RuntimeError("The session is already fed")
+        self._feeder = asyncio.ensure_future(self._feed(data))
+
+    async def _feed(self, data):
+        try:
+            if hasattr(data, '__aiter__'):
+                async for chunk in data:
+                    if not await self._feed_chunk(chunk):
+                        return
+            else:
+                for chunk in _source_chunks(data, self.chunk_size):
+                    if not await self._feed_chunk(chunk):
+                        return
+        except Exception as e:
+            # Reading the data failed, like reading a closed file.
+            self.last_error = e
+            self._call.cancel()
+            return
+        try:
+            await self.close_stdin()
+        except grpc.RpcError as e:
+            self.last_error = e
+
+    async def _feed_chunk(self, chunk):
+        # Write a chunk of the fed data, returns False once the session is
+        # over or its stdin was closed by close_stdin().
+        try:
+            await self.write(chunk)
+        except (BrokenPipeError, grpc.RpcError) as e:
+            self.last_error = e
+            return False
+        except ValueError as e:
+            if not self._stdin_closed:
+                raise
+            self.last_error = e
+            return False
+        return True
+
+    async def _pull(self):
+        """Pull one message, or wait for the reader pulling one
+
+        :returns: boolean -- False at the end of the output
+        """
+        async with self._read_lock:
+            if self._eof:
+                if self._error is not None:
+                    raise self._error
+                return False
+            try:
+                message = await self._call.read()
+            except grpc.RpcError as e:
+                message = grpc.aio.EOF
+                if not self._closed:
+                    self._error = e
+            except asyncio.CancelledError:
+                # Reading a call cancelled by aclose() raises CancelledError.
+                if not self._closed:
+                    raise
+                message = grpc.aio.EOF
+            if message is grpc.aio.EOF:
+                self._eof = True
+                if self._error is not None:
+                    raise self._error
+                return False
+            if message.stdout:
+                self._pending[logs.STDOUT].append(message.stdout)
+            if message.stderr:
+                self._pending[logs.STDERR].append(message.stderr)
+            return True
+
+    async def _read_chunk(self, stream):
+        pending = self._pending[stream]
+        while not pending:
+            if not await self._pull():
+                return None
+        return pending.popleft()
+
+    async def chunks(self):
+        """Iterate over the output of both streams as it comes, see RemoteSession.chunks"""
+        pending = self._pending
+        while True:
+            for stream in (logs.STDOUT, logs.STDERR):
+                while pending[stream]:
+                    yield stream, pending[stream].popleft()
+            if not await self._pull():
+                return
+
+    async def communicate(self, input=None):
+        """Send the input, close the stdin and read the output, see RemoteSession.communicate"""
+        if input is not None:
+            self.feed(input)
+        elif self._feeder is None:
+            await self.close_stdin()
+        output = {logs.STDOUT: [], logs.STDERR: []}
+        async for stream, data in self.chunks():
+            output[stream].append(data)
+        if self._feeder is not None:
+            await self._feeder
+        return b''.join(output[logs.STDOUT]), b''.join(output[logs.STDERR])
+
+    async def wait(self):
+        """Wait for the end of the session, see RemoteSession.wait"""
+        while await self._pull():
+            pass
+        return session_result(await self._call.trailing_metadata())
+
+    async def aclose(self):
+        """Cancel the session if it is still running"""
+        self._closed = True
+        self._call.cancel()
+        if self._feeder is not None:
+            await asyncio.gather(self._feeder, return_exceptions=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+
+class AsyncExecSession(AsyncRemoteSession):
+    """A command running in a container, see AsyncRemoteSession"""
+    _request = ExecSession._request
+
+
+class AsyncStartSession(AsyncRemoteSession):
+    """A container started with its stdio attached, see AsyncRemoteSession"""
+    _request = StartSession._request
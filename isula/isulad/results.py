@@ -0,0 +1,200 @@
+import array
+import collections.abc
+
+from isula.isulad_grpc import container_pb2
+
+
+class ContainerSummary(object):
+    """The summary of a container, as listed by Container.list.
+
+    Fields keep their protobuf names and Python types, and unset fields
+    hold the protobuf default. `status` is the name of the ContainerStatus
+    enum value, like 'RUNNING'.
+    """
+    __slots__ = ('id', 'pid', 'status', 'interface', 'ipv4', 'ipv6', 'image',
+                 'command', 'ram', 'swap', 'exit_code', 'restartcount',
+                 'startat', 'finishat', 'runtime', 'name', 'health_state',
+                 'created')
+
+    def __init__(self, id='', pid=0, status='UNKNOWN', interface='', ipv4='',
+                 ipv6='', image='', command='', ram=0.0, swap=0.0,
+                 exit_code=0, restartcount=0, startat='', finishat='',
+                 runtime='', name='', health_state='', created=0):
+        self.id = id
+        self.pid = pid
+        self.status = status
+        self.interface = interface
+        self.ipv4 = ipv4
+        self.ipv6 = ipv6
+        self.image = image
+        self.command = command
+        self.ram = ram
+        self.swap = swap
+        self.exit_code = exit_code
+        self.restartcount = restartcount
+        self.startat = startat
+        self.finishat = finishat
+        self.runtime = runtime
+        self.name = name
+        self.health_state = health_state
+        self.created = created
+
+    @classmethod
+    def from_message(cls, message):
+        """Build the summary of a container_pb2.Container message"""
+        status = _STATUS_NAMES.get(message.status, message.status)
+        return cls(message.id, message.pid, status, message.interface,
+                   message.ipv4, message.ipv6, message.image, message.command,
+                   message.ram, message.swap, message.exit_code,
+                   message.restartcount, message.startat, message.finishat,
+                   message.runtime, message.name, message.health_state,
+                   message.created)
+
+    def __eq__(self, other):
+        if not isinstance(other, ContainerSummary):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name)
+                   for name in self.__slots__)
+
+    def __repr__(self):
+        return 'ContainerSummary(id=%r, name=%r, status=%r)' % (
+            self.id, self.name, self.status)
+
+    def to_dict(self):
+        return dict((name, getattr(self, name)) for name in self.__slots__)
+
+
+_STATUS_NAMES = dict((number, value.name) for number, value in
+                     container_pb2.ContainerStatus.DESCRIPTOR.values_by_number.items())
+
+
+class ContainerList(collections.abc.Sequence):
+    """The containers of a ListResponse, as ContainerSummary objects.
+
+    A summary is built from the protobuf message the first time its entry
+    is accessed, and the response is dropped once every entry is built, so
+    a long-lived list only holds the compact summaries.
+    """
+    def __init__(self, response):
+        self.cc = response.cc
+        self.errmsg = response.errmsg
+        self._messages = response.containers
+        self._summaries = [None] * len(self._messages)
+        self._pending = len(self._summaries)
+
+    def __len__(self):
+        return len(self._summaries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        summary = self._summaries[index]
+        if summary is None:
+            summary = ContainerSummary.from_message(self._messages[index])
+            self._summaries[index] = summary
+            self._pending -= 1
+            if not self._pending:
+                self._messages = None
+        return summary
+
+    def __iter__(self):
+        for i in range(len(self._summaries)):
+            yield self[i]
+
+    def __repr__(self):
+        return 'ContainerList(%r)' % list(self)
+
+
+class ExecResult(object):
+    """The outcome of a command run by exec_run.
+
+    `stdout` and `stderr` are the output of the command as bytes, or None
+    when it was not captured. `exit_code` is None when iSulad does not
+    report it.
+    """
+    __slots__ = ('container_id', 'argv', 'exit_code', 'stdout', 'stderr')
+
+    def __init__(self, container_id, argv, exit_code, stdout=None,
+                 stderr=None):
+        self.container_id = container_id
+        self.argv = argv
+        self.exit_code = exit_code
+        self.stdout = stdout
+        self.stderr = stderr
+
+    def __repr__(self):
+        return 'ExecResult(container_id=%r, argv=%r, exit_code=%r)' % (
+            self.container_id, self.argv, self.exit_code)
+
+    def to_dict(self):
+        return dict((name, getattr(self, name)) for name in self.__slots__)
+
+
+# Numeric fields of container_pb2.Container_info with their array type codes
+# (uint64 for the counters, uint32 for online_cpus).
+STATS_NUMERIC_FIELDS = (
+    ('pids_current', 'Q'), ('cpu_use_nanos', 'Q'), ('cpu_use_user', 'Q'),
+    ('cpu_use_kernel', 'Q'), ('cpu_system_use', 'Q'), ('online_cpus', 'I'),
+    ('blkio_read', 'Q'), ('blkio_write', 'Q'), ('mem_used', 'Q'),
+    ('mem_limit', 'Q'), ('kmem_used', 'Q'), ('kmem_limit', 'Q'),
+    ('cache', 'Q'), ('cache_total', 'Q'), ('inactive_file_total', 'Q'),
+)
+STATS_TEXT_FIELDS = ('id', 'name', 'status')
+
+
+class StatsColumns(dict):
+    """Container statistics as a struct of arrays, keyed by field name.
+
+    Numeric fields are NumPy arrays when NumPy is installed and array.array
+    otherwise, text fields are lists. Entry i of every column belongs to the
+    same container. As for any dict, len() is the number of columns, `count`
+    is the number of containers.
+    """
+    def __init__(self, columns, cc=0, errmsg=''):
+        super(StatsColumns, self).__init__(columns)
+        self.cc = cc
+        self.errmsg = errmsg
+
+    @property
+    def count(self):
+        """The number of containers"""
+        return len(self['id'])
+
+
+def stats_columns(response, use_numpy=None):
+    """Turn a StatsResponse into StatsColumns
+
+    :param response: the container_pb2.StatsResponse
+    :param use_numpy(boolean): build NumPy arrays, default as whether NumPy is installed
+    :returns: StatsColumns -- the statistics keyed by field name
+    """
+    numpy = _import_numpy() if use_numpy is not False else None
+    if use_numpy and numpy is None:
+        raise ImportError("NumPy is required for NumPy columns")
+    containers = response.containers
+    columns = {}
+    for field in STATS_TEXT_FIELDS:
+        columns[field] = [getattr(c, field) for c in containers]
+    for field, typecode in STATS_NUMERIC_FIELDS:
+        column = array.array(typecode, [getattr(c, field) for c in containers])
+        if numpy is not None:
+            # Wrap the buffer of the array.array instead of copying it.
+            dtype = numpy.uint64 if typecode == 'Q' else numpy.uint32
+            column = (numpy.frombuffer(column, dtype=dtype) if column
+                      else numpy.zeros(0, dtype=dtype))
+        columns[field] = column
+    return StatsColumns(columns, response.cc, response.errmsg)
+
+
+_numpy = None
+
+
+def _import_numpy():
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
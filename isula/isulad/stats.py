@@ -0,0 +1,257 @@
+"""Resource usage rates of containers sampled from the Stats RPC.
+
+iSulad only reports cumulative counters, so the rates are computed from the
+difference between two polls of stats_containers, for all the containers of
+a poll at once (with NumPy when it is installed).
+
+example:
+    import isula
+    from isula.isulad import stats
+
+    client = isula.init_isulad_client()
+    for rates in stats.StatsSampler(client, interval=2):
+        for i, container_id in enumerate(rates['id']):
+            print(container_id, rates['cpu_percent'][i])
+"""
+import array
+import asyncio
+import collections
+import inspect
+import threading
+import time
+
+import grpc
+
+
+class StatsRates(dict):
+    """The rates of the containers between two polls, keyed by field name.
+
+    Like results.StatsColumns, entry i of every column belongs to the same
+    container: `id` and `name` are lists, `cpu_percent`, `memory_percent`,
+    `blkio_read_rate` and `blkio_write_rate` (bytes per second) are float
+    arrays. A container seen for the first time has a zero CPU percentage
+    and blkio rates. `timestamp` is the time of the poll, `interval` the
+    seconds since the previous one and `count` the number of containers.
+    """
+    def __init__(self, columns, timestamp, interval):
+        super(StatsRates, self).__init__(columns)
+        self.timestamp = timestamp
+        self.interval = interval
+        self.count = len(columns['id'])
+
+
+def compute_rates(previous, current, interval):
+    """Compute the rates between two results.StatsColumns
+
+    :param previous: the StatsColumns of the previous poll, or None
+    :param current: the StatsColumns of the current poll
+    :param interval(float): the seconds between the two polls
+    :returns: dict -- the rate columns, see StatsRates
+    """
+    if isinstance(current['cpu_use_nanos'], array.array):
+        return _compute_rates_python(previous, current, interval)
+    return _compute_rates_numpy(previous, current, interval)
+
+
+def _compute_rates_numpy(previous, current, interval):
+    import numpy
+
+    count = len(current['id'])
+    columns = {'id': current['id'], 'name': current['name']}
+
+    mem_used = current['mem_used'].astype(numpy.float64)
+    mem_limit = current['mem_limit'].astype(numpy.float64)
+    columns['memory_percent'] = numpy.divide(
+        mem_used * 100.0, mem_limit, out=numpy.zeros(count),
+        where=mem_limit > 0)
+
+    if previous is not None and len(previous['id']):
+        index = dict((container_id, i)
+                     for i, container_id in enumerate(previous['id']))
+        position = numpy.fromiter((index.get(container_id, -1)
+                                   for container_id in current['id']),
+                                  dtype=numpy.int64, count=count)
+    else:
+        position = numpy.full(count, -1, dtype=numpy.int64)
+    known = position >= 0
+    position = numpy.where(known, position, 0)
+
+    def delta(field):
+        value = current[field].astype(numpy.float64)
+        if previous is None or not len(previous['id']):
+            return numpy.zeros(count)
+        before = previous[field].astype(numpy.float64)[position]
+        # Counters going backwards mean the container was restarted.
+        return numpy.where(known & (value >= before), value - before, 0.0)
+
+    cpu_delta = delta('cpu_use_nanos')
+    system_delta = delta('cpu_system_use')
+    online_cpus = current['online_cpus'].astype(numpy.float64)
+    columns['cpu_percent'] = numpy.divide(
+        cpu_delta * online_cpus * 100.0, system_delta,
+        out=numpy.zeros(count), where=system_delta > 0)
+    seconds = interval if interval > 0 else 1.0
+    columns['blkio_read_rate'] = delta('blkio_read') / seconds
+    columns['blkio_write_rate'] = delta('blkio_write') / seconds
+    return columns
+
+
+def _compute_rates_python(previous, current, interval):
+    index = {}
+    if previous is not None:
+        index = dict((container_id, i)
+                     for i, container_id in enumerate(previous['id']))
+    seconds = interval if interval > 0 else 1.0
+    cpu_percent = array.array('d')
+    memory_percent = array.array('d')
+    read_rate = array.array('d')
+    write_rate = array.array('d')
+    for i, container_id in enumerate(current['id']):
+        mem_limit = current['mem_limit'][i]
+        memory_percent.append(current['mem_used'][i] * 100.0 / mem_limit
+                              if mem_limit > 0 else 0.0)
+        j = index.get(container_id)
+        if j is None:
+            cpu_percent.append(0.0)
+            read_rate.append(0.0)
+            write_rate.append(0.0)
+            continue
+
+        def delta(field):
+            value, before = current[field][i], previous[field][j]
+            return value - before if value >= before else 0
+
+        system_delta = delta('cpu_system_use')
+        cpu_percent.append(
+            delta('cpu_use_nanos') * current['online_cpus'][i] * 100.0
+            / system_delta if system_delta > 0 else 0.0)
+        read_rate.append(delta('blkio_read') / seconds)
+        write_rate.append(delta('blkio_write') / seconds)
+    return {'id': current['id'], 'name': current['name'],
+            'cpu_percent': cpu_percent, 'memory_percent': memory_percent,
+            'blkio_read_rate': read_rate, 'blkio_write_rate': write_rate}
+
+
+class StatsSampler(object):
+    """Poll the statistics of containers and compute their usage rates.
+
+    The sampler works with both isula.isulad.client.Client and
+    isula.isulad.aio.Client: iterate it, call poll() or start() a background
+    thread with the former, and use `async for` or apoll() with the latter.
+    The last `history` polls are kept as columns in a ring buffer, the rates
+    are computed against the previous one.
+
+    :param client: the iSulad client to poll
+    :param interval(float): seconds between two polls
+    :param containers(List(string)): the containers to poll, default all running containers
+    :param all_containers(boolean): poll the stopped containers too
+    :param history(int): the number of polls kept, at least 2
+    """
+    def __init__(self, client, interval=1.0, containers=None,
+                 all_containers=False, history=2):
+        if history < 2:
+            raise ValueError("history should keep at least 2 polls")
+        self.client = client
+        self.interval = interval
+        self.containers = containers
+        self.all_containers = all_containers
+        self.history = collections.deque(maxlen=history)
+        self.latest = None
+        self.last_error = None
+        self._thread = None
+        self._failure = None
+        self._stopped = threading.Event()
+
+    def poll(self):
+        """Poll the statistics once and compute the rates since the last poll
+
+        :returns: StatsRates -- the rates, zero for the first poll
+        """
+        columns = self.client.stats_containers(
+            self.containers, self.all_containers, as_columns=True)
+        return self._record(columns)
+
+    async def apoll(self):
+        """Poll the statistics once with an asyncio client, see poll()"""
+        columns = self.client.stats_containers(
+            self.containers, self.all_containers, as_columns=True)
+        if inspect.isawaitable(columns):
+            columns = await columns
+        return self._record(columns)
+
+    def _record(self, columns):
+        now = time.monotonic()
+        previous, interval = None, 0.0
+        if self.history:
+            previous_time, previous = self.history[-1]
+            interval = now - previous_time
+        self.history.append((now, columns))
+        self.latest = StatsRates(compute_rates(previous, columns, interval),
+                                 time.time(), interval)
+        return self.latest
+
+    def __iter__(self):
+        while True:
+            started = time.monotonic()
+            yield self.poll()
+            time.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    async def __aiter__(self):
+        while True:
+            started = time.monotonic()
+            yield await self.apoll()
+            await asyncio.sleep(
+                max(0.0, self.interval - (time.monotonic() - started)))
+
+    def start(self, callback=None):
+        """Poll in a background thread until stop() is called
+
+        :param callback: called with the StatsRates of every poll, the last
+            ones are available as `latest` anyway. A poll failing with an
+            RpcError is skipped and its exception kept as `last_error`. Any
+            other exception, from the poll or the callback, ends the thread
+            and is raised again by stop().
+        """
+        if self.running:
+            raise RuntimeError("The sampler is already started")
+        self._thread = None
+        self._failure = None
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, args=(callback,),
+                                        daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self):
+        """Whether the background thread started by start() is polling"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self):
+        """Stop the background thread started by start()
+
+        :raises: the exception which ended the thread, see start()
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        failure, self._failure = self._failure, None
+        if failure is not None:
+            raise failure
+
+    def _run(self, callback):
+        try:
+            while not self._stopped.is_set():
+                started = time.monotonic()
+                try:
+                    rates = self.poll()
+                except grpc.RpcError as e:
+                    self.last_error = e
+                else:
+                    if callback is not None:
+                        callback(rates)
+                self._stopped.wait(
+                    max(0.0, self.interval - (time.monotonic() - started)))
+        except Exception as e:
+            self.last_error = self._failure = e
+            self._stopped.set()
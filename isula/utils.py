@@ -1,13 +1,404 @@
+import base64
+import collections.abc
+from concurrent import futures
 import functools
+import importlib
+import io
+import math
+import threading
 
+from google.protobuf.descriptor import FieldDescriptor
+from google.protobuf.internal import type_checkers
 from google.protobuf.json_format import MessageToDict
 
 
+# The forms a client can return the responses of iSulad and isula-builder in:
+# a dict converted by MessageToDict, the raw protobuf message, or a
+# MessageView which reads the fields straight from the message.
+RESPONSE_DICT = 'dict'
+RESPONSE_RAW = 'raw'
+RESPONSE_VIEW = 'view'
+RESPONSE_MODES = (RESPONSE_DICT, RESPONSE_RAW, RESPONSE_VIEW)
+
+
+def check_response_mode(response_mode):
+    if response_mode not in RESPONSE_MODES:
+        raise ValueError("Invalid response mode %r, it should be one of %s"
+                         % (response_mode, ', '.join(RESPONSE_MODES)))
+    return response_mode
+
+
+def convert_response(response, response_mode=RESPONSE_DICT):
+    """Convert a protobuf response to the form asked by response_mode"""
+    if response_mode == RESPONSE_DICT:
+        return message_to_dict(response)
+    if response_mode == RESPONSE_RAW:
+        return response
+    if response_mode == RESPONSE_VIEW:
+        return MessageView(response)
+    check_response_mode(response_mode)
+
+
+def convert_responses(responses, response_mode=RESPONSE_DICT):
+    """Convert every message of a streaming response
+
+    Raw responses are returned as they are, so the caller keeps the call
+    object of the stream and can cancel it.
+    """
+    if response_mode == RESPONSE_RAW:
+        return responses
+    check_response_mode(response_mode)
+    return (convert_response(response, response_mode)
+            for response in responses)
+
+
 def response2dict(fn):
+    """Convert the response returned by a client method.
+
+    The response is converted to a dict unless the client has another
+    `response_mode`, which a caller can override with the `response_mode`
+    keyword argument of the method.
+    """
     @functools.wraps(fn)
-    def wrap(*args, **kwargs):
-        response = fn(*args, **kwargs)
-        response = MessageToDict(response)
-        return response
+    def wrap(self, *args, response_mode=None, **kwargs):
+        response = fn(self, *args, **kwargs)
+        if response_mode is None:
+            response_mode = getattr(self, 'response_mode', RESPONSE_DICT)
+        return convert_response(response, response_mode)
+
+    return wrap
+
+
+def async_response2dict(fn):
+    @functools.wraps(fn)
+    async def wrap(self, *args, response_mode=None, **kwargs):
+        response = await fn(self, *args, **kwargs)
+        if response_mode is None:
+            response_mode = getattr(self, 'response_mode', RESPONSE_DICT)
+        return convert_response(response, response_mode)
 
     return wrap
+
+
+# Default number of calls a batch operation keeps in flight.
+DEFAULT_BATCH_WORKERS = 16
+
+
+def run_batch(fn, items, max_workers=DEFAULT_BATCH_WORKERS):
+    """Call fn on every item from a thread pool.
+
+    The results are keyed by item, so fn is called once per distinct item:
+    an item given twice, like a container id repeated in the list, gets a
+    single entry, in the place of its first occurrence.
+
+    :param fn: the function called with each item
+    :param items: the items, such as container ids
+    :param max_workers(int): the maximum number of calls in flight
+    :returns: dict -- the result of each item, or the exception raised by
+        its call, in the order of the items
+    """
+    items = list(dict.fromkeys(items))
+    if not items:
+        return {}
+    results = {}
+    with futures.ThreadPoolExecutor(
+            max_workers=min(max_workers, len(items))) as executor:
+        calls = [(item, executor.submit(fn, item)) for item in items]
+        for item, call in calls:
+            try:
+                results[item] = call.result()
+            except Exception as e:
+                results[item] = e
+    return results
+
+
+class lazy_service(object):
+    """A client attribute holding a service wrapper built on first access.
+
+    The module of the wrapper and the generated gRPC module of its stub are
+    only imported when the service is used, so a client does not pay the
+    import time of the services it never calls. The stub is built on the
+    `_channel` attribute of the client.
+
+    :param wrapper(string): the wrapper class, as 'module:Class', or None
+        for the stub itself
+    :param stub(string): the gRPC stub class, as 'module:Class'
+    """
+    def __init__(self, wrapper, stub):
+        self.wrapper = wrapper
+        self.stub = stub
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        service = _import_object(self.stub)(instance._channel)
+        if self.wrapper is not None:
+            service = _import_object(self.wrapper)(service)
+        # The instance attribute shadows this non-data descriptor from now on.
+        instance.__dict__[self.name] = service
+        return service
+
+
+class RawChunkReader(io.RawIOBase):
+    """A raw binary file over chunks of bytes, such as the `data` of messages.
+
+    readinto() copies from the current chunk, the chunks are never joined.
+    Subclasses implement _next_data(), which returns the next chunk, or None
+    at the end. Closing the reader cancels `call` when it has a cancel()
+    method, like the call returned by a streaming RPC.
+
+    :param call: the call the chunks come from, or None
+    """
+    def __init__(self, call=None):
+        super(RawChunkReader, self).__init__()
+        self._call = call
+        self._data = b''
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def _next_data(self):
+        raise NotImplementedError
+
+    def readinto(self, buffer):
+        data = self._data
+        pos = self._pos
+        while pos >= len(data):
+            data = self._next_data()
+            if data is None:
+                return 0
+            self._data = data
+            pos = 0
+        target = memoryview(buffer).cast('B')
+        count = min(len(target), len(data) - pos)
+        target[:count] = memoryview(data)[pos:pos + count]
+        self._pos = pos + count
+        return count
+
+    def close(self):
+        if not self.closed:
+            cancel = getattr(self._call, 'cancel', None)
+            if cancel is not None:
+                cancel()
+        super(RawChunkReader, self).close()
+
+
+def _import_object(path):
+    module, name = path.split(':')
+    return getattr(importlib.import_module(module), name)
+
+
+class MessageView(object):
+    """A read-only view of a protobuf message.
+
+    Fields are read as attributes straight from the message, with their
+    protobuf names and Python types, so nothing is converted until it is
+    accessed. Message fields are wrapped in views as well.
+    """
+    __slots__ = ('_message',)
+
+    def __init__(self, message):
+        object.__setattr__(self, '_message', message)
+
+    def __getattr__(self, name):
+        message = self._message
+        value = getattr(message, name)
+        field = message.DESCRIPTOR.fields_by_name.get(name)
+        if field is None or field.type != FieldDescriptor.TYPE_MESSAGE:
+            return value
+        if field.label != FieldDescriptor.LABEL_REPEATED:
+            return MessageView(value)
+        if field.message_type.GetOptions().map_entry:
+            return value
+        return RepeatedView(value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("%s is read-only" % type(self).__name__)
+
+    def __eq__(self, other):
+        if isinstance(other, MessageView):
+            return self._message == other._message
+        return NotImplemented
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__,
+                           self._message.DESCRIPTOR.full_name)
+
+    def to_message(self):
+        return self._message
+
+    def to_dict(self):
+        return message_to_dict(self._message)
+
+
+class RepeatedView(collections.abc.Sequence):
+    """A read-only view of a repeated message field"""
+    __slots__ = ('_values',)
+
+    def __init__(self, values):
+        self._values = values
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [MessageView(value) for value in self._values[index]]
+        return MessageView(self._values[index])
+
+    def __iter__(self):
+        for value in self._values:
+            yield MessageView(value)
+
+
+# Converters generated for each message type by message_to_dict, keyed by
+# message descriptor.
+_converters = {}
+_converters_lock = threading.Lock()
+
+
+def message_to_dict(message):
+    """Convert a protobuf message to a dict, the same way as MessageToDict.
+
+    Instead of walking the descriptor of the message on every call, a function
+    specialized for the message type is generated on first use and cached, so
+    converting large responses such as the container list is much cheaper.
+    """
+    descriptor = message.DESCRIPTOR
+    converter = _converters.get(descriptor)
+    if converter is None:
+        converter = _get_converter(descriptor)
+    return converter(message)
+
+
+def _get_converter(descriptor):
+    with _converters_lock:
+        converter = _converters.get(descriptor)
+        if converter is None:
+            if descriptor.full_name.startswith('google.protobuf.'):
+                # Well-known types have their own JSON mapping.
+                converter = MessageToDict
+            else:
+                converter = _compile_converter(descriptor)
+            _converters[descriptor] = converter
+        return converter
+
+
+def _float_to_json(value):
+    if math.isinf(value):
+        return 'Infinity' if value > 0 else '-Infinity'
+    if math.isnan(value):
+        return 'NaN'
+    return type_checkers.ToShortestFloat(value)
+
+
+def _double_to_json(value):
+    if math.isinf(value):
+        return 'Infinity' if value > 0 else '-Infinity'
+    if math.isnan(value):
+        return 'NaN'
+    return value
+
+
+def _bytes_to_json(value):
+    return base64.b64encode(value).decode('utf-8')
+
+
+def _has_presence(field):
+    if field.label == FieldDescriptor.LABEL_REPEATED:
+        return False
+    if (field.cpp_type == FieldDescriptor.CPPTYPE_MESSAGE
+            or field.containing_oneof is not None):
+        return True
+    return field.file.syntax == 'proto2'
+
+
+def _value_expr(field, var, namespace):
+    """Get the expression converting var, a value of field, to JSON"""
+    cpp_type = field.cpp_type
+    if cpp_type == FieldDescriptor.CPPTYPE_MESSAGE:
+        name = 'convert_%d' % len(namespace)
+        namespace[name] = _LazyConverter(field.message_type)
+        return '%s(%s)' % (name, var)
+    if cpp_type == FieldDescriptor.CPPTYPE_ENUM:
+        if field.enum_type.full_name == 'google.protobuf.NullValue':
+            return 'None'
+        name = 'enum_%d' % len(namespace)
+        namespace[name] = dict((number, value.name) for number, value
+                               in field.enum_type.values_by_number.items())
+        return '%s.get(%s, %s)' % (name, var, var)
+    if field.type == FieldDescriptor.TYPE_BYTES:
+        return '_bytes_to_json(%s)' % var
+    if cpp_type == FieldDescriptor.CPPTYPE_BOOL:
+        return 'bool(%s)' % var
+    if cpp_type in (FieldDescriptor.CPPTYPE_INT64,
+                    FieldDescriptor.CPPTYPE_UINT64):
+        return 'str(%s)' % var
+    if cpp_type == FieldDescriptor.CPPTYPE_FLOAT:
+        return '_float_to_json(%s)' % var
+    if cpp_type == FieldDescriptor.CPPTYPE_DOUBLE:
+        return '_double_to_json(%s)' % var
+    return var
+
+
+class _LazyConverter(object):
+    """Look up the converter of a nested message type on first call"""
+    __slots__ = ('descriptor', 'converter')
+
+    def __init__(self, descriptor):
+        self.descriptor = descriptor
+        self.converter = None
+
+    def __call__(self, message):
+        converter = self.converter
+        if converter is None:
+            converter = self.converter = (_converters.get(self.descriptor)
+                                          or _get_converter(self.descriptor))
+        return converter(message)
+
+
+def _compile_converter(descriptor):
+    namespace = {
+        '_bytes_to_json': _bytes_to_json,
+        '_float_to_json': _float_to_json,
+        '_double_to_json': _double_to_json,
+    }
+    lines = ['def convert(message):', '    js = {}']
+    # Fields are emitted in field number order, like ListFields does.
+    for field in sorted(descriptor.fields, key=lambda f: f.number):
+        key = repr(field.json_name)
+        lines.append('    value = message.%s' % field.name)
+        message_type = field.message_type
+        if message_type is not None and message_type.GetOptions().map_entry:
+            key_field = message_type.fields_by_name['key']
+            value_field = message_type.fields_by_name['value']
+            if key_field.cpp_type == FieldDescriptor.CPPTYPE_BOOL:
+                key_expr = "('true' if k else 'false')"
+            else:
+                key_expr = 'str(k)'
+            lines.append('    if value:')
+            lines.append('        js[%s] = {%s: %s for k, v in value.items()}'
+                         % (key, key_expr,
+                            _value_expr(value_field, 'v', namespace)))
+        elif field.label == FieldDescriptor.LABEL_REPEATED:
+            lines.append('    if value:')
+            lines.append('        js[%s] = [%s for v in value]'
+                         % (key, _value_expr(field, 'v', namespace)))
+        elif _has_presence(field):
+            lines.append('    if message.HasField(%r):' % field.name)
+            lines.append('        js[%s] = %s'
+                         % (key, _value_expr(field, 'value', namespace)))
+        else:
+            lines.append('    if value:')
+            lines.append('        js[%s] = %s'
+                         % (key, _value_expr(field, 'value', namespace)))
+    lines.append('    return js')
+    code = compile('\n'.join(lines), '<converter %s>' % descriptor.full_name,
+                   'exec')
+    exec(code, namespace)
+    return namespace['convert']
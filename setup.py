@@ -21,4 +21,10 @@ setup(
         'grpcio',
         'protobuf'
     ],
+    extras_require={
+        # NumPy arrays for the columnar container statistics.
+        'numpy': ['numpy'],
+        # zstd compression of the logs saved by save_logs.
+        'zstd': ['zstandard'],
+    },
 )
@@ -0,0 +1,82 @@
+import io
+import os
+import tarfile
+
+import pytest
+
+from isula.isulad import archive
+from isula.isulad_grpc import container_pb2
+
+
+@pytest.fixture
+def src(tmp_path):
+    src = tmp_path / 'src'
+    (src / 'sub').mkdir(parents=True)
+    (src / 'a.txt').write_bytes(b'hello\n' * 1000)
+    (src / 'empty').write_bytes(b'')
+    (src / 'sub' / 'b.bin').write_bytes(os.urandom(70000))
+    os.symlink('a.txt', str(src / 'link'))
+    return src
+
+
+def tarfile_bytes(path, arcname):
+    buffer = io.BytesIO()
+    with tarfile.TarFile(fileobj=buffer, mode='w') as tar:
+        tar.add(path, arcname)
+    return buffer.getvalue()
+
+
+def messages(data, size=1000):
+    return [container_pb2.CopyFromContainerResponse(data=data[i:i + size])
+            for i in range(0, len(data), size)]
+
+
+def test_open_chunks_round_trip(src):
+    data = tarfile_bytes(str(src), 'src')
+    with archive.open_chunks(messages(data), buffer_size=4096) as reader:
+        assert reader.read() == data
+
+
+def test_extract_chunks(src, tmp_path):
+    dst = tmp_path / 'dst'
+    dst.mkdir()
+    names = archive.extract_chunks(
+        messages(tarfile_bytes(str(src), 'src'), 4096), str(dst))
+    assert 'src/sub/b.bin' in names
+    assert ((dst / 'src' / 'sub' / 'b.bin').read_bytes()
+            == (src / 'sub' / 'b.bin').read_bytes())
+
+
+@pytest.mark.parametrize('use_mmap', [False, True])
+@pytest.mark.parametrize('chunk_size', [512, 4096, 1 << 20])
+def test_tar_chunks_matches_tarfile(src, use_mmap, chunk_size):
+    chunks = list(archive.tar_chunks(str(src), chunk_size=chunk_size,
+                                     use_mmap=use_mmap))
+    assert b''.join(chunks) == tarfile_bytes(str(src), 'src')
+    assert all(len(chunk) == chunk_size for chunk in chunks[:-1])
+    assert 0 < len(chunks[-1]) <= chunk_size
+
+
+def test_tar_chunks_single_file(src):
+    path = str(src / 'a.txt')
+    data = b''.join(archive.tar_chunks(path, arcname='renamed.txt'))
+    assert data == tarfile_bytes(path, 'renamed.txt')
+
+
+def test_tar_chunks_progress(src):
+    produced = []
+    chunks = list(archive.tar_chunks(
+        str(src), chunk_size=4096,
+        progress=lambda count, elapsed: produced.append(count)))
+    assert produced[-1] == sum(len(chunk) for chunk in chunks)
+
+
+def test_extract_tar_chunks(src, tmp_path):
+    chunks = archive.tar_chunks(str(src), chunk_size=4096)
+    dst = tmp_path / 'dst'
+    dst.mkdir()
+    archive.extract_chunks(
+        [container_pb2.CopyFromContainerResponse(data=c) for c in chunks],
+        str(dst))
+    assert (dst / 'src' / 'a.txt').read_bytes() == b'hello\n' * 1000
+    assert os.readlink(str(dst / 'src' / 'link')) == 'a.txt'
@@ -0,0 +1,74 @@
+import pytest
+
+from isula import channel
+
+
+class _Channel(object):
+    def __init__(self, target, options=None):
+        self.target = target
+        self.options = options
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool():
+    pool = channel.ChannelPool(idle_timeout=60, channel_factory=_Channel)
+    yield pool
+    pool.close()
+
+
+def test_acquire_shares_channels(pool):
+    first = pool.acquire('unix:///run/isulad.sock')
+    assert pool.acquire('unix:///run/isulad.sock') is first
+    assert pool.acquire('unix:///run/isulad.sock',
+                        [('grpc.max_send_message_length', 1)]) is not first
+    assert pool.acquire('unix:///run/other.sock') is not first
+
+
+def test_release_keeps_idle_channels_open(pool):
+    channel_a = pool.acquire('unix:///run/isulad.sock')
+    pool.acquire('unix:///run/isulad.sock')
+    pool.release(channel_a)
+    pool.release(channel_a)
+    assert not channel_a.closed
+    assert pool.acquire('unix:///run/isulad.sock') is channel_a
+
+
+def test_release_unknown_channel(pool):
+    pool.release(_Channel('unix:///run/isulad.sock'))
+
+
+def test_evict_idle(pool, monkeypatch):
+    idle = pool.acquire('unix:///run/idle.sock')
+    used = pool.acquire('unix:///run/used.sock')
+    pool.release(idle)
+    now = channel.time.monotonic()
+    monkeypatch.setattr(channel.time, 'monotonic', lambda: now + 61)
+    pool.evict_idle()
+    assert idle.closed
+    assert not used.closed
+    assert pool.acquire('unix:///run/idle.sock') is not idle
+
+
+def test_evict_keeps_recent_channels(pool):
+    recent = pool.acquire('unix:///run/isulad.sock')
+    pool.release(recent)
+    pool.evict_idle()
+    assert not recent.closed
+
+
+def test_zero_idle_timeout_closes_at_once():
+    pool = channel.ChannelPool(idle_timeout=0, channel_factory=_Channel)
+    first = pool.acquire('unix:///run/isulad.sock')
+    pool.release(first)
+    assert first.closed
+    assert pool.acquire('unix:///run/isulad.sock') is not first
+
+
+def test_close(pool):
+    first = pool.acquire('unix:///run/isulad.sock')
+    pool.close()
+    assert first.closed
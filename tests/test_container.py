@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from isula.isulad import container
+
+
+def test_build_create_configs():
+    hostconfig, customconfig = container.build_create_configs(dict(
+        Binds=['/data:/data'], Memory=1 << 30, Privileged=True,
+        OomKillDisable=False, CpusetCpus='0-1', name='web',
+        Labels={'app': 'web'}, ram=1.5))
+    assert json.loads(hostconfig) == {'Binds': ['/data:/data'],
+                                      'Memory': 1 << 30, 'Privileged': True,
+                                      'CpusetCpus': '0-1', 'Runtime': 'lcr'}
+    assert json.loads(customconfig) == {'name': 'web',
+                                        'Labels': {'app': 'web'}, 'ram': 1.5}
+
+
+@pytest.mark.parametrize('kwargs', [
+    dict(Memory='1g'),
+    dict(Memory=True),
+    dict(Privileged='yes'),
+    dict(Privileged=1),
+    dict(CpusetCpus=0.5),
+    dict(Binds='/data:/data'),
+    dict(Sysctls=[]),
+    dict(PidsLimit=1.5),
+    dict(name=['web']),
+    dict(Labels='app=web'),
+    dict(ram='1g'),
+])
+def test_build_create_configs_rejects_wrong_types(kwargs):
+    with pytest.raises(TypeError):
+        container.build_create_configs(kwargs)
+
+
+def test_build_create_configs_rejects_unknown_fields():
+    with pytest.raises(TypeError):
+        container.build_create_configs(dict(Memroy=1))
+
+
+def test_build_update_config():
+    assert json.loads(container.build_update_config(dict(
+        Memory=0, CPUShares=512))) == {'CPUShares': 512, 'Runtime': 'lcr'}
+    with pytest.raises(TypeError):
+        container.build_update_config(dict(MemorySwap='-1'))
+    with pytest.raises(TypeError):
+        container.build_update_config(dict(name='web'))
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+
+import pytest
+
+from isula.isulad import aio
+from isula.isulad import client
+from isula.isulad_grpc import api_pb2
+
+
+class _Runtime(object):
+    def __init__(self, fail=()):
+        self.fail = fail
+        self.calls = []
+        self._lock = threading.Lock()
+        self._count = 0
+
+    def _call(self, *args):
+        with self._lock:
+            self.calls.append(args)
+
+    def run_pod_sandbox(self, config, runtime_handler):
+        self._call('run_pod_sandbox')
+        return api_pb2.RunPodSandboxResponse(pod_sandbox_id='pod')
+
+    def create_container(self, pod_sandbox_id, config, sandbox_config):
+        if config['metadata']['name'] in self.fail:
+            raise TypeError('bad config')
+        with self._lock:
+            self._count += 1
+            container_id = 'c%d' % self._count
+        self._call('create_container', container_id)
+        return api_pb2.CreateContainerResponse(container_id=container_id)
+
+    def start_container(self, container_id):
+        self._call('start_container', container_id)
+
+    def stop_pod_sandbox(self, pod_sandbox_id):
+        self._call('stop_pod_sandbox', pod_sandbox_id)
+
+    def remove_container(self, container_id):
+        self._call('remove_container', container_id)
+
+    def remove_pod_sandbox(self, pod_sandbox_id):
+        self._call('remove_pod_sandbox', pod_sandbox_id)
+
+
+class _AsyncRuntime(_Runtime):
+    def __getattribute__(self, name):
+        method = super(_AsyncRuntime, self).__getattribute__(name)
+        if name.startswith('_') or not callable(method):
+            return method
+
+        async def call(*args):
+            return method(*args)
+
+        return call
+
+
+def container_configs(*names):
+    return [{'metadata': {'name': name}} for name in names]
+
+
+def removed(runtime):
+    return sorted(call for call in runtime.calls
+                  if call[0] in ('stop_pod_sandbox', 'remove_container',
+                                 'remove_pod_sandbox'))
+
+
+def test_cri_run_pod():
+    runtime = _Runtime()
+    with client.Client('unix:///run/none.sock') as isulad:
+        isulad._cri_runtime = runtime
+        pod = isulad.cri_run_pod({}, container_configs('a', 'b'))
+    assert pod['pod_sandbox_id'] == 'pod'
+    assert sorted(pod['containers']) == ['c1', 'c2']
+    assert removed(runtime) == []
+
+
+def test_cri_run_pod_removes_the_pod_when_a_create_fails():
+    runtime = _Runtime(fail=('b',))
+    with client.Client('unix:///run/none.sock') as isulad:
+        isulad._cri_runtime = runtime
+        with pytest.raises(TypeError):
+            isulad.cri_run_pod({}, container_configs('a', 'b', 'c'),
+                               max_workers=1)
+    assert removed(runtime) == [('remove_container', 'c1'),
+                                ('remove_container', 'c2'),
+                                ('remove_pod_sandbox', 'pod'),
+                                ('stop_pod_sandbox', 'pod')]
+    assert runtime.calls[-1] == ('remove_pod_sandbox', 'pod')
+
+
+def test_async_cri_run_pod_removes_the_pod_when_a_create_fails():
+    runtime = _AsyncRuntime(fail=('a',))
+    isulad = aio.Client('unix:///run/none.sock')
+    isulad._cri_runtime = runtime
+    with pytest.raises(TypeError):
+        asyncio.run(isulad.cri_run_pod({}, container_configs('a', 'b')))
+    assert removed(runtime) == [('remove_container', 'c1'),
+                                ('remove_pod_sandbox', 'pod'),
+                                ('stop_pod_sandbox', 'pod')]
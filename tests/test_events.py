@@ -0,0 +1,151 @@
+import threading
+
+import pytest
+
+from isula.isulad import events
+from isula.isulad_grpc import container_pb2
+
+
+def event(opt, container_id='c1', seconds=1, **annotations):
+    message = container_pb2.Event(opt=opt, id=container_id,
+                                  annotations=annotations)
+    message.timestamp.FromSeconds(seconds)
+    return message
+
+
+def test_event_action():
+    assert events.event_action(event('start')) == 'start'
+    assert events.event_action(event('exec_die: ls -l')) == 'exec_die'
+
+
+def test_event_filter_opts():
+    predicate = events.event_filter(opts=['die', 'oom'])
+    assert predicate(event('die'))
+    assert predicate(event('oom: killed'))
+    assert not predicate(event('start'))
+    assert events.event_filter(opts='die')(event('die'))
+
+
+def test_event_filter_id_prefix():
+    predicate = events.event_filter(id_prefix='abc')
+    assert predicate(event('start', 'abcdef'))
+    assert not predicate(event('start', 'defabc'))
+
+
+def test_event_filter_annotations():
+    predicate = events.event_filter(annotations={'image': 'busybox',
+                                                 'name': None})
+    assert predicate(event('start', image='busybox', name='web'))
+    assert not predicate(event('start', image='nginx', name='web'))
+    assert not predicate(event('start', image='busybox'))
+
+
+def test_event_filter_everything():
+    assert events.event_filter()(event('start'))
+
+
+def test_batch_events_max_count():
+    stream = [event('start', str(i)) for i in range(7)]
+    batches = list(events.batch_events(stream, max_count=3))
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [e for batch in batches for e in batch] == stream
+
+
+def test_batch_events_window():
+    stream = [event('start', str(i)) for i in range(5)]
+    batches = list(events.batch_events(iter(stream), max_count=2, window=10))
+    assert [e for batch in batches for e in batch] == stream
+    assert all(0 < len(batch) <= 2 for batch in batches)
+
+
+def test_batch_events_window_yields_quiet_batches():
+    release = threading.Event()
+
+    def stream():
+        yield event('start')
+        release.wait(5)
+
+    batches = events.batch_events(stream(), window=0.05)
+    assert len(next(batches)) == 1
+    release.set()
+    batches.close()
+
+
+def test_batch_events_raises_stream_errors():
+    def stream():
+        yield event('start')
+        raise RuntimeError('broken')
+
+    with pytest.raises(RuntimeError):
+        list(events.batch_events(stream(), window=10))
+
+
+def test_batch_events_requires_a_bound():
+    with pytest.raises(ValueError):
+        list(events.batch_events([], None, None))
+
+
+class _Call(object):
+    def __init__(self, count):
+        self.count = count
+        self.cancelled = threading.Event()
+
+    def __iter__(self):
+        for i in range(self.count):
+            if self.cancelled.is_set():
+                return
+            yield event('start', str(i))
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+def test_batch_events_close_cancels_the_call():
+    call = _Call(100000)
+    batches = events.batch_events(call, max_count=1, window=10, call=call)
+    next(batches)
+    batches.close()
+    assert call.cancelled.is_set()
+
+
+def test_subscription_dispatch_skips_replayed_events():
+    subscription = events.EventSubscription(client=None)
+    received = subscription.subscribe()
+    assert subscription.dispatch(event('start', seconds=1))
+    assert subscription.dispatch(event('die', seconds=2))
+    assert not subscription.dispatch(event('start', seconds=1))
+    assert subscription.last_timestamp == (2, 0)
+    assert len(received) == 2
+
+
+class _Client(object):
+    def __init__(self, stream):
+        self.stream = stream
+
+    def container_events(self, container_id, since, until, response_mode):
+        return _Stream(self.stream)
+
+
+class _Stream(list):
+    def cancel(self):
+        pass
+
+
+def test_subscription_failure_is_raised():
+    def event_filter(event):
+        if event.opt == 'die':
+            raise TypeError('broken filter')
+        return True
+
+    subscription = events.EventSubscription(
+        _Client([event('start', seconds=1), event('die', seconds=2)]))
+    received = subscription.subscribe(event_filter=event_filter)
+    subscription.start()
+    subscription._thread.join(5)
+    assert not subscription.running
+    assert isinstance(subscription.last_error, TypeError)
+    assert received.get().opt == 'start'
+    with pytest.raises(TypeError):
+        list(received)
+    with pytest.raises(TypeError):
+        subscription.stop()
@@ -0,0 +1,39 @@
+from isula.isulad import inventory
+from isula.isulad_grpc import container_pb2
+
+
+class _Client(object):
+    def __init__(self):
+        self.listed = []
+
+    def list_containers(self, filters=None, is_all=False, response_mode=None):
+        self.listed.append(filters)
+        return container_pb2.ListResponse(containers=[
+            container_pb2.Container(id='c1', name='web', image='busybox',
+                                    status=container_pb2.CREATED)])
+
+
+def event(opt, container_id='c1', seconds=1):
+    message = container_pb2.Event(opt=opt, id=container_id)
+    message.timestamp.FromSeconds(seconds)
+    return message
+
+
+def test_replayed_event_is_applied_once():
+    client = _Client()
+    containers = inventory.ContainerInventory(client)
+    assert containers.dispatch(event('create'))
+    assert not containers.dispatch(event('create'))
+    assert client.listed == [{'id': 'c1'}]
+    assert containers.get_by_name('web').status == 'CREATED'
+
+
+def test_apply_status_and_remove_events():
+    containers = inventory.ContainerInventory(_Client())
+    containers.sync()
+    assert containers.dispatch(event('start', seconds=2))
+    assert [c.id for c in containers.by_status('RUNNING')] == ['c1']
+    assert containers.by_status('CREATED') == []
+    assert containers.dispatch(event('destroy', seconds=3))
+    assert 'c1' not in containers
+    assert containers.by_image('busybox') == []
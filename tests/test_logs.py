@@ -0,0 +1,144 @@
+import asyncio
+import io
+
+import pytest
+
+from isula.isulad import logs
+from isula.isulad_grpc import container_pb2
+
+
+@pytest.mark.parametrize('value, key', [
+    ('2021-06-01T08:00:00Z', (1622534400, 0)),
+    ('2021-06-01T08:00:00.5Z', (1622534400, 500000000)),
+    ('2021-06-01T08:00:00.123456789123Z', (1622534400, 123456789)),
+    ('2021-06-01T10:00:00+02:00', (1622534400, 0)),
+    ('2021-06-01T06:30:00.25-01:30', (1622534400, 250000000)),
+])
+def test_log_time_key(value, key):
+    assert logs.log_time_key(value) == key
+
+
+@pytest.mark.parametrize('value', [
+    '', 'garbage', '2021-06-01T08:00:00+ab:cd', '2021-xx-01T08:00:00Z', None,
+])
+def test_log_time_key_invalid(value):
+    assert logs.log_time_key(value) is None
+
+
+def test_log_time_key_order():
+    values = ['2021-06-01T08:00:00.1Z', '2021-06-01T08:00:00.05Z',
+              '2021-06-01T09:00:00+02:00']
+    assert sorted(values, key=logs.log_time_key) == [values[2], values[1],
+                                                     values[0]]
+
+
+def test_merger_orders_by_time():
+    merger = logs._LogMerger(0, 10)
+    merger.push(logs.LogEntry('a', logs.STDOUT, '2021-06-01T08:00:02Z', b'2'))
+    merger.push(logs.LogEntry('b', logs.STDOUT, '2021-06-01T08:00:01Z', b'1'))
+    assert merger.pop(flush=True)[0].data == b'1'
+    assert merger.pop(flush=True)[0].data == b'2'
+
+
+def test_merger_keeps_arrival_order_of_invalid_times():
+    merger = logs._LogMerger(0, 10)
+    for data in (b'1', b'2', b'3'):
+        merger.push(logs.LogEntry('a', logs.STDOUT, 'garbage', data))
+    assert [merger.pop(flush=True)[0].data for _ in range(3)] == [b'1', b'2',
+                                                                  b'3']
+
+
+def messages(*chunks):
+    return [container_pb2.LogsResponse(stream=stream, data=data)
+            for stream, data in chunks]
+
+
+def test_log_reader_read():
+    reader = logs.LogReader(messages((logs.STDOUT, b'ab'),
+                                     (logs.STDERR, b'cd'),
+                                     (logs.STDOUT, b'ef')))
+    assert io.BufferedReader(reader).read() == b'abcdef'
+
+
+def test_log_reader_streams():
+    reader = logs.LogReader(messages((logs.STDOUT, b'ab'),
+                                     (logs.STDERR, b'cd')), logs.STDERR)
+    assert reader.read() == b'cd'
+
+
+def test_log_reader_lines_per_stream():
+    reader = logs.LogReader(messages((logs.STDOUT, b'out 1\nout'),
+                                     (logs.STDERR, b'err 1\nerr'),
+                                     (logs.STDOUT, b' 2\n'),
+                                     (logs.STDERR, b' 2')))
+    lines = [(reader.stream, line) for line in reader.lines()]
+    assert lines == [(logs.STDOUT, b'out 1'), (logs.STDERR, b'err 1'),
+                     (logs.STDOUT, b'out 2'), (logs.STDERR, b'err 2')]
+
+
+def test_log_reader_lines_after_read():
+    reader = logs.LogReader(messages((logs.STDOUT, b'a\nb\n')))
+    assert reader.read(1) == b'a'
+    assert list(reader.lines(keepends=True)) == [b'\n', b'b\n']
+
+
+class _Call(list):
+    def cancel(self):
+        pass
+
+
+class _Client(object):
+    def __init__(self, **streams):
+        self.streams = streams
+
+    def container_logs(self, container_id, follow=False):
+        chunks = self.streams[container_id]
+        if isinstance(chunks, Exception):
+            raise chunks
+        return _Call(messages(*chunks))
+
+
+class _AsyncClient(_Client):
+    async def container_logs(self, container_id, follow=False):
+        for message in super(_AsyncClient, self).container_logs(container_id,
+                                                                follow):
+            yield message
+
+
+def test_follower_raises_stream_errors():
+    client = _Client(a=[(logs.STDOUT, b'1'), (logs.STDOUT, b'2')],
+                     b=TypeError('bad kwargs'))
+    data = []
+    with logs.LogFollower(client, ['a', 'b'], reorder_window=0) as follower:
+        with pytest.raises(TypeError):
+            while True:
+                data.append(next(follower).data)
+        # The other stream goes on after the error.
+        data.extend(entry.data for entry in follower)
+    assert data == [b'1', b'2']
+    assert list(follower.errors) == ['b']
+
+
+def test_follower_ignore_errors():
+    client = _Client(a=[(logs.STDOUT, b'1'), (logs.STDOUT, b'2')],
+                     b=TypeError('bad kwargs'))
+    with logs.LogFollower(client, ['a', 'b'], reorder_window=0,
+                          ignore_errors=True) as follower:
+        assert [entry.data for entry in follower] == [b'1', b'2']
+    assert list(follower.errors) == ['b']
+
+
+def test_async_follower_raises_stream_errors():
+    client = _AsyncClient(a=[(logs.STDOUT, b'1')], b=TypeError('bad kwargs'))
+
+    async def follow(ignore_errors):
+        async with logs.AsyncLogFollower(
+                client, ['a', 'b'], reorder_window=0,
+                ignore_errors=ignore_errors) as follower:
+            return [entry.data async for entry in follower], follower.errors
+
+    with pytest.raises(TypeError):
+        asyncio.run(follow(False))
+    entries, errors = asyncio.run(follow(True))
+    assert entries == [b'1']
+    assert isinstance(errors['b'], TypeError)
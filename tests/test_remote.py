@@ -0,0 +1,98 @@
+import asyncio
+import io
+
+from isula.isulad import remote
+
+
+class _Call(object):
+    def __init__(self, requests):
+        self.requests = requests
+        self.cancelled = False
+        self._callbacks = []
+
+    def add_done_callback(self, callback):
+        self._callbacks.append(callback)
+
+    def cancel(self):
+        self.cancelled = True
+        for callback in self._callbacks:
+            callback(self)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        raise StopIteration
+
+
+class _AsyncCall(object):
+    def __init__(self):
+        self.requests = []
+        self.cancelled = False
+
+    async def write(self, request):
+        self.requests.append(request)
+
+    async def done_writing(self):
+        pass
+
+    def done(self):
+        return self.cancelled
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def closed_file():
+    data = io.BytesIO(b'data')
+    data.close()
+    return data
+
+
+def feed(session, data):
+    session.feed(data)
+    session._feeder.join(5)
+
+
+def test_feed_cancels_when_reading_fails():
+    session = remote.StartSession(_Call)
+    feed(session, closed_file())
+    assert isinstance(session.last_error, ValueError)
+    assert session._call.cancelled
+
+
+def test_feed_after_close_stdin():
+    session = remote.StartSession(_Call)
+    session.close_stdin()
+    feed(session, b'data')
+    assert isinstance(session.last_error, ValueError)
+    assert not session._call.cancelled
+
+
+def test_feed_writes_and_closes_stdin():
+    session = remote.StartSession(_Call)
+    feed(session, [b'ab', b'cd'])
+    assert session.last_error is None
+    assert [(r.stdin, r.finish) for r in session._call.requests] == [
+        (b'ab', False), (b'cd', False), (b'', True)]
+
+
+def test_async_feed():
+    async def feed_async(data, close_stdin=False):
+        session = remote.AsyncStartSession(_AsyncCall())
+        if close_stdin:
+            await session.close_stdin()
+        session.feed(data)
+        await session._feeder
+        return session
+
+    session = asyncio.run(feed_async(closed_file()))
+    assert isinstance(session.last_error, ValueError)
+    assert session._call.cancelled
+    session = asyncio.run(feed_async(b'data', close_stdin=True))
+    assert isinstance(session.last_error, ValueError)
+    assert not session._call.cancelled
+    session = asyncio.run(feed_async(b'data'))
+    assert session.last_error is None
+    assert [(r.stdin, r.finish) for r in session._call.requests] == [
+        (b'data', False), (b'', True)]
@@ -0,0 +1,41 @@
+from isula.isulad import results
+from isula.isulad_grpc import container_pb2
+
+
+def list_response(count):
+    return container_pb2.ListResponse(containers=[
+        container_pb2.Container(id='%064x' % i, name='c%d' % i, pid=i,
+                                status=container_pb2.RUNNING, ram=1.5)
+        for i in range(count)])
+
+
+def test_container_summary_from_message():
+    message = list_response(1).containers[0]
+    summary = results.ContainerSummary.from_message(message)
+    assert summary.id == message.id
+    assert summary.status == 'RUNNING'
+    assert summary.ram == 1.5
+    assert summary.to_dict()['name'] == 'c0'
+    assert summary == results.ContainerSummary.from_message(message)
+    assert results.ContainerSummary().status == 'UNKNOWN'
+
+
+def test_container_list_builds_summaries_lazily():
+    containers = results.ContainerList(list_response(3))
+    assert len(containers) == 3
+    assert containers[1].name == 'c1'
+    assert containers[1] is containers[1]
+    assert containers._messages is not None
+    assert [c.pid for c in containers] == [0, 1, 2]
+    # Every summary is built, so the response is no longer held.
+    assert containers._messages is None
+    assert [c.name for c in containers[::2]] == ['c0', 'c2']
+    assert containers[-1].name == 'c2'
+
+
+def test_container_list_empty():
+    containers = results.ContainerList(
+        container_pb2.ListResponse(cc=1, errmsg='failed'))
+    assert len(containers) == 0
+    assert list(containers) == []
+    assert containers.errmsg == 'failed'
@@ -0,0 +1,108 @@
+import pytest
+
+from isula.isulad import results
+from isula.isulad import stats
+from isula.isulad_grpc import container_pb2
+
+
+def columns(containers, use_numpy):
+    response = container_pb2.StatsResponse(containers=[
+        container_pb2.Container_info(**fields) for fields in containers])
+    return results.stats_columns(response, use_numpy=use_numpy)
+
+
+def use_numpy_params():
+    return [False, pytest.param(True, marks=pytest.mark.skipif(
+        results._import_numpy() is None, reason='NumPy is not installed'))]
+
+
+def test_stats_columns_count():
+    stats_columns = columns([dict(id='a'), dict(id='b')], False)
+    assert stats_columns.count == 2
+    assert len(stats_columns) == len(stats_columns.keys())
+
+
+@pytest.mark.parametrize('use_numpy', use_numpy_params())
+def test_stats_columns(use_numpy):
+    stats_columns = columns([dict(id='a', name='web', mem_used=2 ** 40,
+                                  online_cpus=4),
+                             dict(id='b', cpu_use_nanos=7)], use_numpy)
+    assert stats_columns['id'] == ['a', 'b']
+    assert stats_columns['name'] == ['web', '']
+    assert list(stats_columns['mem_used']) == [2 ** 40, 0]
+    assert list(stats_columns['online_cpus']) == [4, 0]
+    assert list(stats_columns['cpu_use_nanos']) == [0, 7]
+
+
+@pytest.mark.parametrize('use_numpy', use_numpy_params())
+def test_stats_columns_empty(use_numpy):
+    stats_columns = columns([], use_numpy)
+    assert stats_columns.count == 0
+    assert len(stats_columns['mem_used']) == 0
+
+
+@pytest.mark.parametrize('use_numpy', use_numpy_params())
+def test_compute_rates(use_numpy):
+    previous = columns([
+        dict(id='a', cpu_use_nanos=100, cpu_system_use=1000, online_cpus=2,
+             blkio_read=0, blkio_write=100),
+        dict(id='gone', cpu_use_nanos=5, cpu_system_use=5),
+    ], use_numpy)
+    current = columns([
+        dict(id='new', mem_used=1, mem_limit=0, cpu_use_nanos=50,
+             cpu_system_use=2000),
+        dict(id='a', name='web', mem_used=25, mem_limit=100,
+             cpu_use_nanos=200, cpu_system_use=2000, online_cpus=2,
+             blkio_read=4096, blkio_write=50),
+    ], use_numpy)
+    rates = stats.compute_rates(previous, current, 2.0)
+    assert list(rates['id']) == ['new', 'a']
+    assert list(rates['name']) == ['', 'web']
+    # (200 - 100) / (2000 - 1000) * 2 CPUs
+    assert list(rates['cpu_percent']) == [0.0, 20.0]
+    assert list(rates['memory_percent']) == [0.0, 25.0]
+    assert list(rates['blkio_read_rate']) == [0.0, 2048.0]
+    # A counter going backwards counts as a restart, not a negative rate.
+    assert list(rates['blkio_write_rate']) == [0.0, 0.0]
+
+
+@pytest.mark.parametrize('use_numpy', use_numpy_params())
+def test_compute_rates_first_poll(use_numpy):
+    current = columns([dict(id='a', cpu_use_nanos=10, cpu_system_use=10,
+                            mem_used=1, mem_limit=4)], use_numpy)
+    rates = stats.compute_rates(None, current, 0.0)
+    assert list(rates['cpu_percent']) == [0.0]
+    assert list(rates['memory_percent']) == [25.0]
+
+
+class _Client(object):
+    def __init__(self, responses):
+        self.responses = iter(responses)
+
+    def stats_containers(self, containers, all_containers, as_columns):
+        response = next(self.responses)
+        if isinstance(response, Exception):
+            raise response
+        return columns(response, False)
+
+
+def test_sampler_poll():
+    sampler = stats.StatsSampler(_Client([
+        [dict(id='a', cpu_use_nanos=0, cpu_system_use=0, online_cpus=1)],
+        [dict(id='a', cpu_use_nanos=10, cpu_system_use=100, online_cpus=1)],
+    ]))
+    assert list(sampler.poll()['cpu_percent']) == [0.0]
+    rates = sampler.poll()
+    assert rates.count == 1
+    assert list(rates['cpu_percent']) == [10.0]
+    assert sampler.latest is rates
+
+
+def test_sampler_failure_is_raised_by_stop():
+    sampler = stats.StatsSampler(_Client([ValueError('boom')]), interval=0)
+    sampler.start()
+    sampler._thread.join(5)
+    assert not sampler.running
+    assert isinstance(sampler.last_error, ValueError)
+    with pytest.raises(ValueError):
+        sampler.stop()
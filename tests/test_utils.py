@@ -0,0 +1,141 @@
+import asyncio
+import threading
+
+from google.protobuf.descriptor import FieldDescriptor
+from google.protobuf.json_format import MessageToDict
+import pytest
+
+from isula import aio_utils
+from isula import utils
+from isula.isulad_grpc import api_pb2
+from isula.isulad_grpc import container_pb2
+
+
+def list_response(count):
+    return container_pb2.ListResponse(containers=[
+        container_pb2.Container(id='%064x' % i, name='c%d' % i,
+                                status=container_pb2.RUNNING)
+        for i in range(count)])
+
+
+def test_convert_response_modes():
+    response = list_response(2)
+    assert utils.convert_response(response) == MessageToDict(response)
+    assert utils.convert_response(response, utils.RESPONSE_RAW) is response
+    view = utils.convert_response(response, utils.RESPONSE_VIEW)
+    assert view.containers[1].id == response.containers[1].id
+    assert len(view.containers) == 2
+    assert view.to_message() is response
+    with pytest.raises(ValueError):
+        utils.convert_response(response, 'json')
+
+
+def test_convert_responses_raw_keeps_the_call():
+    responses = [list_response(1), list_response(2)]
+    assert utils.convert_responses(responses, utils.RESPONSE_RAW) is responses
+    assert list(utils.convert_responses(responses)) == [
+        MessageToDict(response) for response in responses]
+
+
+def test_message_view_is_read_only():
+    view = utils.MessageView(list_response(1))
+    with pytest.raises(AttributeError):
+        view.containers = []
+    assert view == utils.MessageView(list_response(1))
+
+
+def populated(message_class, index=1):
+    message = message_class()
+    for field in message_class.DESCRIPTOR.fields:
+        if (field.label == FieldDescriptor.LABEL_REPEATED
+                or field.type == FieldDescriptor.TYPE_MESSAGE):
+            continue
+        if field.type == FieldDescriptor.TYPE_STRING:
+            value = '%s-%d' % (field.name, index)
+        elif field.type == FieldDescriptor.TYPE_BYTES:
+            value = b'\x00\xff' + field.name.encode()
+        elif field.type == FieldDescriptor.TYPE_ENUM:
+            value = field.enum_type.values[-1].number
+        elif field.type in (FieldDescriptor.TYPE_DOUBLE,
+                            FieldDescriptor.TYPE_FLOAT):
+            value = index + 0.5
+        elif field.type == FieldDescriptor.TYPE_BOOL:
+            value = True
+        else:
+            value = index
+        setattr(message, field.name, value)
+    return message
+
+
+@pytest.mark.parametrize('message_class', [
+    descriptor._concrete_class
+    for descriptor in container_pb2.DESCRIPTOR.message_types_by_name.values()
+])
+def test_message_to_dict_scalars(message_class):
+    for message in (message_class(), populated(message_class)):
+        assert utils.message_to_dict(message) == MessageToDict(message)
+
+
+def test_message_to_dict_nested():
+    event = container_pb2.Event(opt='start', id='c1',
+                                annotations={'image': 'busybox'})
+    event.timestamp.FromSeconds(1622534400)
+    messages = [
+        event,
+        container_pb2.ListResponse(containers=[
+            populated(container_pb2.Container, i) for i in range(3)]),
+        container_pb2.StatsResponse(containers=[
+            populated(container_pb2.Container_info, i) for i in range(3)]),
+        container_pb2.ListRequest(filters={'status': 'running'}, all=True),
+        container_pb2.TopResponse(titles=b'PID', processes=[b'1', b'2']),
+        container_pb2.Container(ram=float('inf'), swap=float('nan')),
+        api_pb2.ListContainersRequest(filter=api_pb2.ContainerFilter(
+            id='c1', label_selector={'app': 'web'})),
+    ]
+    for message in messages:
+        assert utils.message_to_dict(message) == MessageToDict(message)
+
+
+def test_message_view_to_dict():
+    response = container_pb2.ListResponse(containers=[
+        populated(container_pb2.Container, i) for i in range(2)])
+    view = utils.MessageView(response)
+    assert view.to_dict() == MessageToDict(response)
+
+
+def square(item):
+    if item < 0:
+        raise ValueError(item)
+    return item * item
+
+
+def test_run_batch_captures_exceptions():
+    results = utils.run_batch(square, [3, -1, 2])
+    assert list(results) == [3, -1, 2]
+    assert results[3] == 9 and results[2] == 4
+    assert isinstance(results[-1], ValueError)
+    assert utils.run_batch(square, []) == {}
+
+
+def test_run_batch_calls_each_item_once():
+    calls = []
+    lock = threading.Lock()
+
+    def call(item):
+        with lock:
+            calls.append(item)
+        return item
+
+    assert list(utils.run_batch(call, ['b', 'a', 'b', 'c', 'a'])) == [
+        'b', 'a', 'c']
+    assert sorted(calls) == ['a', 'b', 'c']
+
+
+def test_run_batch_async():
+    async def call(item):
+        return square(item)
+
+    results = asyncio.run(aio_utils.run_batch_async(call, [2, -2, 2]))
+    assert list(results) == [2, -2]
+    assert results[2] == 4
+    assert isinstance(results[-2], ValueError)